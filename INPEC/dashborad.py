@@ -2,14 +2,14 @@
 # 🔧 CONFIGURACIÓN Y LIBRERÍAS
 # ===================================
 import streamlit as st
-import pandas as pd
-import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import date
 from pytz import timezone
-from datetime import datetime, timedelta
+from datetime import datetime
 import time, hmac, hashlib
+import os
+import sys
+from functools import partial
+from typing import Callable, NamedTuple
 
 # ===================================
 # SEGURIDAD
@@ -77,6 +77,10 @@ password_gate("🔐 Acceso al tablero")
 # ===================================
 # TABLERO
 # ===================================
+# Las librerías de datos y gráficos se importan después del acceso: la pantalla
+# de contraseña solo necesita Streamlit
+import pandas as pd
+import numpy as np
 
 st.set_page_config(
     page_title="Dashboard INPEC",
@@ -108,6 +112,35 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# ===================================
+# ⚙️ MOTOR DE DATOS
+# ===================================
+# El proyecto y la carga compartida con los tableros VA viven en la raíz del repositorio
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import arboles
+import busqueda
+import composicion
+import consultas
+import figuras
+import proyectos
+import recursos
+import tablas
+
+# plotly.express y graph_objects se cargan con la primera figura (ver figuras.py)
+px = figuras.Perezoso("plotly.express")
+go = figuras.Perezoso("plotly.graph_objects")
+
+PROYECTO = proyectos.PROYECTOS["inpec"]
+leer_config = proyectos.leer_config
+
+# MEDIR_FIGURAS=1: registra en el log el tamaño serializado de cada figura enviada
+if leer_config("MEDIR_FIGURAS", "0") == "1":
+    figuras.registrar_medidor(figuras.log_tamano)
+
+# Motor de filtros y agregaciones (MOTOR_DATOS): ver consultas.py
+if consultas.MOTOR_DATOS != consultas.MOTOR_PEDIDO:
+    st.warning(f"MOTOR_DATOS={consultas.MOTOR_PEDIDO} no está disponible (¿paquete sin instalar?). Se usa pandas.")
+
 COLOR_PALETTE = [
     "#31A354",  # Verde medio
     "#74C476",  # Verde claro
@@ -118,40 +151,30 @@ COLOR_PALETTE = [
 # ===================================
 # 📥 CARGA DE DATOS
 # ===================================
-@st.cache_data(ttl=600)
-def cargar_csv(url: str) -> pd.DataFrame:
-    return pd.read_csv(url, dtype=str).fillna("")
-
-URLS = {
-    "Cronograma": "https://docs.google.com/spreadsheets/d/e/2PACX-1vThSek_BzK-DeNwhsjcmqSWJLz4vNQ_bBQJ8cXV_pEjCLGN8T64WcIqsLEfQIYcO9dVLCPHfdnNdfhC/pub?gid=1775323779&single=true&output=csv",
-    "Entregables": "https://docs.google.com/spreadsheets/d/e/2PACX-1vTXU3Fh-35s_7ZysWWnWQpQhhHxMst_qqFznNeBA1xmvMVYpo7yVODZTaHTqh12ptDViA6CYLLaZWre/pub?gid=1749869584&single=true&output=csv",
-    "VRM": "https://docs.google.com/spreadsheets/d/e/2PACX-1vQ1ZNrmbDDZPZbj0-ovO6HRgW7m2MAp3efItgdv8QjOny04F4D5knQ4E2RvMcmQB-L6OS00F13xiiWQ/pub?gid=1175528082&single=true&output=csv",
-    "Reclamaciones": "https://docs.google.com/spreadsheets/d/e/2PACX-1vQY3MrZCwuoQYNnM5TefaK2Zj7v7DUUY_TSVHuitoa705h6SO0v89Q4JSKNCIiE8QJcO2H_ZWcKCYiN/pub?gid=0&single=true&output=csv"
-}
-
-hoja_metas = "https://docs.google.com/spreadsheets/d/e/2PACX-1vQ1ZNrmbDDZPZbj0-ovO6HRgW7m2MAp3efItgdv8QjOny04F4D5knQ4E2RvMcmQB-L6OS00F13xiiWQ/pub?gid=1567229219&single=true&output=csv"
-archivo_metas = cargar_csv(hoja_metas)
+def cargar_hoja(nombre: str) -> pd.DataFrame:
+    """Hoja del proyecto (ver PROYECTO.fuentes) desde la carga compartida de proyectos.py."""
+    # Copia: las vistas modifican las hojas y la instancia del almacén o del servicio es compartida
+    return proyectos.cargar_fuente(PROYECTO.fuentes[nombre]).copy()
 
-hoja_metas_rec = "https://docs.google.com/spreadsheets/d/e/2PACX-1vQY3MrZCwuoQYNnM5TefaK2Zj7v7DUUY_TSVHuitoa705h6SO0v89Q4JSKNCIiE8QJcO2H_ZWcKCYiN/pub?gid=680702191&single=true&output=csv"
-archivo_metas_rec = cargar_csv(hoja_metas_rec)
-
-@st.cache_data(ttl=600)
 def get_datos_por_modulo(modulo: str) -> pd.DataFrame:
-    url = URLS.get(modulo)
-    return cargar_csv(url) if url else pd.DataFrame()
+    return cargar_hoja(modulo) if modulo in PROYECTO.fuentes else pd.DataFrame()
 
+# --- Limpiar: un paso por hoja ---
 def limpiar_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     df = df.copy()
     for col in df.columns:
         df[col] = df[col].astype(str).str.strip()
     return df
 
+# --- Derivar: columnas calculadas del módulo (sobre una copia superficial) ---
 def procesar_cronograma(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy(deep=False)
     if "Fecha Inicio" in df.columns:
         df["Fecha Inicio"] = pd.to_datetime(df["Fecha Inicio"], errors="coerce")
     return df
 
 def procesar_entregables(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy(deep=False)
     df["ESTADO"] = np.where(
         (df["REALIZADO POR LA FUAA"] == "TRUE") & (df["APROBADO POR LA CNSC"] == "TRUE"), "Aprobado",
         np.where(
@@ -164,105 +187,144 @@ def procesar_entregables(df: pd.DataFrame) -> pd.DataFrame:
     )
     return df
 
-def calcular_resumen_vrm(df: pd.DataFrame, archivo_metas: pd.DataFrame) -> pd.DataFrame:
-    tz = timezone("America/Bogota")
-    hoy = datetime.now(tz).date()
-    fecha_referencia = hoy - timedelta(days=1)
-
-    archivo_metas["FECHA"] = pd.to_datetime(archivo_metas["FECHA"], dayfirst=True, errors="coerce").dt.date
-    archivo_metas["META EQUIPO A LA FECHA"] = (
-        pd.to_numeric(
-            archivo_metas["META EQUIPO A LA FECHA"]
-            .astype(str)
-            .str.replace("-", "0")
-            .str.replace(".", ""),
-            errors="coerce"
-        ).fillna(0).astype(int)
-    )
-
-    metas_dia = archivo_metas[archivo_metas["FECHA"] == fecha_referencia]
-
-    metas_usuario = (
-        metas_dia.groupby("ROL")["META EQUIPO A LA FECHA"]
-        .sum()
-        .reset_index()
-        .rename(columns={"META EQUIPO A LA FECHA": "Meta Proyectada a la Fecha"})
-    )
-
-    df["estado_carpeta"] = df["estado_carpeta"].astype(str).str.lower()
-
-    condiciones = {
-        "Análisis": ["calificada", "aprobada", "auditada"],
-        "Supervisión": ["aprobada", "auditada"],
-        "Auditoria": ["auditada"]
-    }
-
-    resultados = []
-    for rol, estados in condiciones.items():
-        revisadas = df[df["estado_carpeta"].isin(estados)].shape[0]
-        resultados.append({"ROL": rol, "Carpetas Revisadas": revisadas})
-
-    df_revisadas = pd.DataFrame(resultados)
-
-    resumen = pd.merge(metas_usuario, df_revisadas, on="ROL", how="outer").fillna(0)
-
-    resumen["Meta Proyectada a la Fecha"] = pd.to_numeric(resumen["Meta Proyectada a la Fecha"], errors="coerce").fillna(0)
-    resumen["Carpetas Revisadas"] = pd.to_numeric(resumen["Carpetas Revisadas"], errors="coerce").fillna(0)
-
-    resumen["% Avance"] = np.where(
-        resumen["Meta Proyectada a la Fecha"] == 0,
-        0,
-        (resumen["Carpetas Revisadas"] / resumen["Meta Proyectada a la Fecha"] * 100).round(2)
-    )
-
-    return resumen
-
-def limpiar_datos_por_modulo(
-    modulo: str,
-    df: pd.DataFrame,
-    archivo_metas: pd.DataFrame = None,
-    archivo_metas_rec: pd.DataFrame = None
-) -> pd.DataFrame:
-    df = limpiar_dataframe(df)
-
-    if modulo == "Cronograma":
-        df = procesar_cronograma(df)
+def procesar_carpetas(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy(deep=False)
+    df["estado_carpeta"] = df["estado_carpeta"].str.lower()
+    return df
 
-    elif modulo == "Entregables":
-        df = procesar_entregables(df)
+# ===================================
+# 🏗️ PIPELINE POR MÓDULO
+# ===================================
+# Cargar → limpiar (por hoja) → derivar → resumir. Cada paso devuelve un
+# DataFrame nuevo y su resultado queda en caché por versión de las hojas, así
+# que un rerun solo filtra y dibuja. Los resultados son compartidos entre
+# sesiones: no se modifican, se filtran o se copian.
+class PipelineModulo(NamedTuple):
+    hojas: list[str]   # La primera es la del módulo; las demás, sus metas
+    derivar: Callable[[pd.DataFrame], pd.DataFrame] | None = None
+    resumir: Callable[[pd.DataFrame, date], pd.DataFrame] | None = None  # Sobre las metas
+    niveles: list[str] = []  # Columnas del árbol de conteos (filtros, anillo, avance por rol)
+    matriz: list[str] = []   # [OPEC, nivel, estado] de la matriz de carpetas; vacía si no tiene
+
+class ModuloPreparado(NamedTuple):
+    datos: pd.DataFrame
+    metas_rol: pd.DataFrame | None
+    arbol: pd.Series | None
+    indices: dict  # Columna del árbol → busqueda.Indice de sus valores
+    matriz: pd.DataFrame | None
+    version: str   # Huellas de contenido de sus hojas (attrs["version"]), para las cachés que parten de él
 
-    elif modulo == "VRM" and archivo_metas is not None:
-        resumen = calcular_resumen_vrm(df, archivo_metas)
-        st.session_state["df_resumen_vrm"] = resumen
+COLUMNAS_FILTRO = {
+    "Cronograma": ["Etapa", "Actividad", "Estado", "Responsable_contractual"],
+    "Entregables": ["NO. DE PAGO", "NO. DE ENTREGABLE", "ENTREGABLE", "ESTADO"],
+    "VRM": ["estado_carpeta", "numero_opec", "nivel_x", "estado_rm"],
+    "Reclamaciones": ["nro_opec", "denominacion", "nivel", "estado_real"]
+}
 
-    elif modulo == "Reclamaciones" and archivo_metas_rec is not None:
-        resumen = calcular_resumen_vrm(df, archivo_metas_rec)
-        st.session_state["df_resumen_reclamaciones"] = resumen
+PIPELINES = {
+    "Cronograma": PipelineModulo(["Cronograma"], procesar_cronograma,
+                                 niveles=COLUMNAS_FILTRO["Cronograma"]),
+    "Entregables": PipelineModulo(["Entregables"], procesar_entregables,
+                                  niveles=COLUMNAS_FILTRO["Entregables"]),
+    "VRM": PipelineModulo(["VRM", "metas"], procesar_carpetas, proyectos.metas_rol_inpec,
+                          niveles=COLUMNAS_FILTRO["VRM"],
+                          matriz=["numero_opec", "nivel_x", "estado_carpeta"]),
+    "Reclamaciones": PipelineModulo(["Reclamaciones", "metas_rec"], procesar_carpetas, proyectos.metas_rol_inpec,
+                                    niveles=COLUMNAS_FILTRO["Reclamaciones"] + ["estado_carpeta"],
+                                    matriz=["nro_opec", "nivel", "estado_carpeta"]),
+}
 
-    return df
+LIMPIEZA_HOJA = {"metas": proyectos.preparar_metas_inpec, "metas_rec": proyectos.preparar_metas_inpec}
+
+# Sin almacén ni servicio las hojas no traen versión (""): las entradas vencen
+# al mismo ritmo que la descarga directa de proyectos.descargar
+CADUCIDAD_PIPELINE = 600
+
+def version_hoja(nombre: str) -> str:
+    return proyectos.version_fuente(PROYECTO.fuentes[nombre]) if nombre in PROYECTO.fuentes else ""
+
+@st.cache_resource(max_entries=16, ttl=CADUCIDAD_PIPELINE, show_spinner=False)
+def hoja_limpia(nombre: str, version: str) -> pd.DataFrame:
+    return LIMPIEZA_HOJA.get(nombre, limpiar_dataframe)(get_datos_por_modulo(nombre))
+
+@st.cache_resource(max_entries=8, ttl=CADUCIDAD_PIPELINE, show_spinner=False)
+def modulo_preparado(modulo: str, versiones: tuple, hoy: date, _hojas: dict) -> ModuloPreparado:
+    pipeline = PIPELINES[modulo]
+    datos = _hojas[pipeline.hojas[0]]
+    if pipeline.derivar and not datos.empty:
+        datos = pipeline.derivar(datos)
+    metas_rol = arbol = matriz = None
+    if pipeline.resumir and not datos.empty:
+        metas_rol = pipeline.resumir(_hojas[pipeline.hojas[1]], hoy)
+    niveles = [col for col in pipeline.niveles if col in datos.columns]
+    if niveles:
+        arbol = arboles.construir_arbol(datos, niveles)
+    indices = {col: busqueda.Indice(arbol.index.unique(level=col)) for col in niveles}
+    if pipeline.matriz and set(pipeline.matriz) <= set(niveles):
+        matriz = arboles.construir_matriz(arbol, pipeline.matriz[-1])
+    version = "/".join(_hojas[hoja].attrs.get("version", "") for hoja in pipeline.hojas)
+    return ModuloPreparado(datos, metas_rol, arbol, indices, matriz, version)
+
+def precargar_modulo(modulo: str, hoy: date):
+    """El pipeline completo de `modulo`, en serie, para dejarlo en caché (ver composicion.precargar)."""
+    pipeline = PIPELINES[modulo]
+    versiones = tuple(version_hoja(hoja) for hoja in pipeline.hojas)
+    hojas = {hoja: hoja_limpia(hoja, version) for hoja, version in zip(pipeline.hojas, versiones)}
+    modulo_preparado(modulo, versiones, hoy, hojas)
 
 # ===================================
 # 🧰 FUNCIONES UTILITARIAS
 # ===================================
 def aplicar_filtros_dinamicos(df: pd.DataFrame, filtros: dict) -> pd.DataFrame:
     """Aplica los filtros seleccionados a un DataFrame."""
-    for col, val in filtros.items():
-        if val != "Todos" and col in df.columns:
-            df = df[df[col] == val]
-    return df
-
-
-def generar_filtros_sidebar(df: pd.DataFrame, claves: list[str], clave_prefix: str) -> dict:
-    """Genera filtros en la barra lateral con manejo correcto del estado."""
+    activos = {col: val for col, val in filtros.items() if val != "Todos" and col in df.columns}
+    if consultas.MOTOR_DATOS == "duckdb" and activos:
+        condiciones = " AND ".join(f'"{col}" = ?' for col in activos)
+        return consultas.consulta_duckdb(f"SELECT * FROM datos WHERE {condiciones}", list(activos.values()), datos=df)
+
+    # Una sola máscara para todos los filtros: una copia del resultado, no una por filtro
+    if not activos:
+        return df
+    visibles = np.ones(len(df), dtype=bool)
+    for col, val in activos.items():
+        visibles &= (df[col] == val).to_numpy()
+    return df[visibles]
+
+# Por huella de contenido del módulo, como avance_por_rol: sin caducidad propia
+@st.cache_data(max_entries=64, show_spinner=False)
+def cortar_matriz(modulo: str, version: str, filtros_matriz: tuple, columnas: tuple,
+                  _matriz: pd.DataFrame) -> pd.DataFrame:
+    """La matriz del pipeline cortada por los filtros (ver arboles.cortar_matriz), por firma de filtros."""
+    return arboles.cortar_matriz(_matriz, dict(filtros_matriz), columnas)
+
+def generar_filtros_sidebar(arbol: pd.Series, indices: dict, claves: list[str], clave_prefix: str) -> dict:
+    """Filtros en cascada: cada lista muestra solo las opciones con filas, con su conteo entre paréntesis.
+
+    Las columnas con muchos valores (OPEC, denominación) se buscan en su índice
+    y solo se envían las coincidencias (ver busqueda.py).
+    """
     filtros = {}
     st.sidebar.markdown("### 🔍 Filtros")
 
+    claves = [col for col in claves if arbol is not None and col in arbol.index.names]
+    # Los valores elegidos se leen antes de dibujar: cada lista depende de las demás
+    elegidos = {col: st.session_state.get(f"filtro_{clave_prefix}_{col}", "Todos") for col in claves}
+    conteos = arboles.facetas(arbol, elegidos)
+
     for col in claves:
-        if col not in df.columns:
-            continue
-        opciones = ["Todos"] + sorted(df[col].dropna().unique())
+        conteo = conteos[col]
+        opciones = sorted(conteo.index)
+        if elegidos[col] != "Todos" and elegidos[col] not in conteo.index:
+            opciones = sorted(opciones + [elegidos[col]])  # Se conserva la elección aunque quede vacía
+        total = int(conteo.sum())
+
+        def etiqueta(v, conteo=conteo, total=total):
+            n = total if v == "Todos" else int(conteo.get(v, 0))
+            return f"{v} ({n:,})".replace(",", ".")
+
         key = f"filtro_{clave_prefix}_{col}"  # clave única
-        valor_sel = st.sidebar.selectbox(f"Filtrar por {col}", opciones, key=key)
+        valor_sel = busqueda.selector(f"Filtrar por {col}", ["Todos"] + opciones, indices[col], key=key,
+                                      format_func=etiqueta, donde=st.sidebar)
         filtros[col] = valor_sel
 
     return filtros
@@ -274,78 +336,171 @@ def tabla_resaltada(
     df: pd.DataFrame,
     columnas: list[str],
     col_estado: str = None,
-    colores_estado: dict = None
+    colores_estado: dict = None,
+    firma: str | None = None
 ):
+    # Paginada en el servidor; el estado se colorea como etiqueta, sin Styler celda por celda
     columnas = [c for c in columnas if not c.lower().startswith("unnamed")]
-    df_out = df[columnas].copy()
-
-    if col_estado and colores_estado and col_estado in df_out.columns:
-        def color_columna(val):
-            estado = str(val).strip().upper()
-            color = colores_estado.get(estado)
-            return f"background-color: {color}" if color else ""
+    colores = {col_estado: colores_estado} if col_estado and colores_estado else None
+    tablas.tabla_paginada(df[columnas], f"tabla_{mod_actual}", firma=firma, colores=colores)
+
+# `firma`: vista de la caché de figuras compartida (ver figuras.py); None = construir siempre
+# `max_categorias`: se dibujan las mayores y el resto va en "Otros", con su detalle bajo demanda
+
+def grafico_barras(df: pd.DataFrame, columna: str, titulo: str, firma: str | None = None,
+                   max_categorias: int = figuras.MAX_CATEGORIAS):
+    def construir():
+        conteo, plegadas = figuras.plegar(consultas.contar_valores(df, columna), columna, max_categorias)
+        conteo["porcentaje"] = (conteo["cantidad"] / conteo["cantidad"].sum() * 100).round(1)
+        conteo["texto"] = conteo["cantidad"].astype(str) + " (" + conteo["porcentaje"].astype(str) + "%)"
+
+        fig = px.bar(
+            conteo,
+            x=columna,
+            y="cantidad",
+            text="texto",
+            color=columna,
+            color_discrete_sequence=COLOR_PALETTE,
+            title=f"<b>{titulo}</b>"
+        )
+        fig.update_traces(textposition="outside")
+        fig.update_layout(showlegend=False, plot_bgcolor="white", margin=dict(t=50), meta={"plegadas": plegadas})
+        return fig
 
-        styled = df_out.style.applymap(color_columna, subset=[col_estado])
-        st.dataframe(styled, use_container_width=True, hide_index=True)
-    else:
-        st.dataframe(df_out, use_container_width=True, hide_index=True)
-
-def grafico_barras(df: pd.DataFrame, columna: str, titulo: str):
-    conteo = df[columna].value_counts().reset_index()
-    conteo.columns = [columna, "cantidad"]
-    conteo["porcentaje"] = (conteo["cantidad"] / conteo["cantidad"].sum() * 100).round(1)
-    conteo["texto"] = conteo["cantidad"].astype(str) + " (" + conteo["porcentaje"].astype(str) + "%)"
-
-    fig = px.bar(
-        conteo,
-        x=columna,
-        y="cantidad",
-        text="texto",
-        color=columna,
-        color_discrete_sequence=COLOR_PALETTE,
-        title=f"<b>{titulo}</b>"
-    )
-    fig.update_traces(textposition="outside")
-    fig.update_layout(showlegend=False, plot_bgcolor="white", margin=dict(t=50))
+    nombre = f"barras/{columna}/{titulo}/{max_categorias}"
+    fig = figuras.figura(nombre, firma, construir)
     st.plotly_chart(fig, use_container_width=True)
-
-def grafico_embudo(df: pd.DataFrame, columna: str, titulo: str):
-    conteo = df[columna].value_counts().reset_index()
-    conteo.columns = ["etapa", "cantidad"]
-    total = conteo["cantidad"].sum()
-    conteo["porcentaje"] = (conteo["cantidad"] / total * 100).round(1)
-    conteo["texto"] = conteo["cantidad"].astype(str) + " (" + conteo["porcentaje"].astype(str) + "%)"
-
-    fig = go.Figure(go.Funnel(
-        y=conteo["etapa"],
-        x=conteo["cantidad"],
-        text=conteo["texto"],
-        textposition="outside",
-        marker={"color": COLOR_PALETTE[2]}
-    ))
-
-    fig.update_layout(title=f"<b>{titulo}</b>", margin=dict(t=50))
+    figuras.detalle_otros(fig, f"otros_{nombre}", lambda: figuras.resto(consultas.contar_valores(df, columna), max_categorias))
+
+def grafico_embudo(df: pd.DataFrame, columna: str, titulo: str, firma: str | None = None,
+                   max_categorias: int = figuras.MAX_CATEGORIAS):
+    def construir():
+        conteo, plegadas = figuras.plegar(consultas.contar_valores(df, columna), columna, max_categorias)
+        conteo.columns = ["etapa", "cantidad"]
+        total = conteo["cantidad"].sum()
+        conteo["porcentaje"] = (conteo["cantidad"] / total * 100).round(1)
+        conteo["texto"] = conteo["cantidad"].astype(str) + " (" + conteo["porcentaje"].astype(str) + "%)"
+
+        fig = go.Figure(go.Funnel(
+            y=conteo["etapa"],
+            x=conteo["cantidad"],
+            text=conteo["texto"],
+            textposition="outside",
+            marker={"color": COLOR_PALETTE[2]}
+        ))
+
+        fig.update_layout(title=f"<b>{titulo}</b>", margin=dict(t=50), meta={"plegadas": plegadas})
+        return fig
+
+    nombre = f"embudo/{columna}/{titulo}/{max_categorias}"
+    fig = figuras.figura(nombre, firma, construir)
     st.plotly_chart(fig, use_container_width=True)
+    figuras.detalle_otros(fig, f"otros_{nombre}", lambda: figuras.resto(consultas.contar_valores(df, columna), max_categorias))
 
-def grafico_anillo(df: pd.DataFrame, columnas: list[str], titulo: str):
+# Anillo con exploración: muestra solo el nivel visible del árbol; un clic en una
+# porción baja al siguiente nivel del camino. Es un fragmento: bajar o subir no repite la página.
+@st.fragment
+def grafico_anillo(arbol: pd.Series, columnas: list[str], titulo: str, filtros: dict,
+                   firma: str | None = None):
     if not columnas or len(columnas) == 0:
         st.warning("Debes especificar al menos una columna.")
         return
 
-    # Preparar datos de agregación
-    conteo = df.groupby(columnas).size().reset_index(name="cantidad")
+    clave = f"anillo_{mod_actual}_{'/'.join(columnas)}"
+    ruta = st.session_state.get(clave, [])
+    podado = arboles.podar_arbol(arbol, filtros, columnas, ruta)
+    if ruta and podado.sum() == 0:
+        # Los filtros dejaron vacía la rama elegida: se vuelve a la raíz
+        ruta = st.session_state[clave] = []
+        podado = arboles.podar_arbol(arbol, filtros)
+
+    profundidad = len(ruta)
+    columna = columnas[profundidad]
+    explorable = profundidad < len(columnas) - 1
+
+    def construir():
+        conteo = arboles.nivel_arbol(podado, columna)
+        if conteo.empty:
+            return None
+        etiquetas = conteo[columna].astype(str)
+        fig = go.Figure(go.Pie(
+            labels=etiquetas,
+            values=conteo["cantidad"],
+            customdata=etiquetas,
+            hole=0.45,
+            sort=False,
+            textinfo="label+percent",
+            insidetextorientation="radial",
+            marker={"colors": [COLOR_PALETTE[k % len(COLOR_PALETTE)] for k in range(len(conteo))]},
+        ))
+        subtitulo = " › ".join(ruta)
+        fig.update_layout(
+            title=f"<b>{titulo}</b>" + (f"<br><sup>{subtitulo}</sup>" if subtitulo else ""),
+            margin=dict(t=60, l=0, r=0, b=0),
+        )
+        return fig
 
-    fig = px.sunburst(
-        data_frame=conteo,
-        path=columnas,
-        values="cantidad",
-        title=f"<b>{titulo}</b>",
-        color_discrete_sequence=COLOR_PALETTE
-    )
+    fig = figuras.figura(f"anillo/{'/'.join(columnas)}/{titulo}/{'/'.join(ruta)}", firma, construir)
+    if fig is None:
+        st.info("No hay datos para graficar.")
+        return
 
-    fig.update_traces(textinfo="label+percent entry", insidetextorientation="radial")
-    fig.update_layout(margin=dict(t=60, l=0, r=0, b=0))
-    st.plotly_chart(fig, use_container_width=True)
+    if explorable:
+        st.plotly_chart(fig, use_container_width=True, on_select=partial(bajar_anillo, clave, ruta, profundidad),
+                        selection_mode="points", key=f"{clave}_{profundidad}")
+        st.caption(f"Clic en una porción para ver su detalle por {columnas[profundidad + 1]}.")
+    else:
+        st.plotly_chart(fig, use_container_width=True)
+
+    if ruta:
+        st.button("⬆️ Subir un nivel", key=f"{clave}_subir", on_click=partial(subir_anillo, clave, ruta))
+
+# Callbacks del anillo: cambian la ruta antes del rerun del fragmento
+def bajar_anillo(clave: str, ruta: list[str], profundidad: int):
+    puntos = st.session_state[f"{clave}_{profundidad}"].selection.points
+    if puntos:
+        valor = puntos[0].get("customdata", puntos[0].get("label"))
+        st.session_state[clave] = ruta + [valor[0] if isinstance(valor, list) else valor]
+
+def subir_anillo(clave: str, ruta: list[str]):
+    st.session_state[clave] = ruta[:-1]
+
+# Matriz OPEC × nivel × estado: un mapa de calor con las OPEC más atrasadas y la
+# matriz completa paginada en el servidor (miles de filas, una página por envío)
+FILAS_MAPA = 25
+
+def matriz_carpetas(matriz: pd.DataFrame, columnas: list[str], titulo: str, firma: str | None = None):
+    if matriz.empty:
+        st.info("No hay carpetas para la matriz.")
+        return
+    opec, nivel, _ = columnas
+    estados = [c for c in matriz.columns if c not in (opec, nivel, "total", "pendientes")]
+
+    def construir():
+        mapa = matriz.head(FILAS_MAPA)
+        fig = go.Figure(go.Heatmap(
+            z=mapa[estados].to_numpy(),
+            x=[str(e) for e in estados],
+            y=mapa[opec].astype(str) + " · " + mapa[nivel].astype(str),
+            colorscale=[[0, "#ffffff"], [1, COLOR_PALETTE[0]]],
+            texttemplate="%{z}",
+            hovertemplate="%{y}<br>%{x}: %{z}<extra></extra>",
+        ))
+        fig.update_layout(
+            title=f"<b>{titulo}</b><br><sup>Las {len(mapa)} OPEC y niveles con más carpetas pendientes</sup>",
+            yaxis={"autorange": "reversed", "type": "category"},
+            height=max(300, 28 * len(mapa) + 120),
+            margin=dict(t=70),
+        )
+        return fig
+
+    st.plotly_chart(figuras.figura(f"matriz/{'/'.join(columnas)}/{titulo}", firma, construir),
+                    use_container_width=True)
+    maximo = int(matriz["pendientes"].max())
+    tablas.tabla_paginada(matriz, f"matriz_{mod_actual}", firma=firma, config={
+        "pendientes": st.column_config.ProgressColumn("pendientes", format="%d", min_value=0,
+                                                      max_value=max(maximo, 1)),
+    })
 
 # ===================================
 # 🚦 NAVEGACIÓN Y RENDER
@@ -354,7 +509,7 @@ st.markdown(
     "<h1 style='text-align:center; font-weight:700; color:#1F9924'>Proceso de Selección INPEC Cuerpo de Custodia y Vigilancia 11</h1>",
     unsafe_allow_html=True
 )
-st.sidebar.image("assets/Andina_Blanco.png", width=400)
+recursos.imagen("assets/Andina_Blanco.png", 300, donde=st.sidebar)
 
 modulos_con_iconos = {
     "Cronograma": "🗓️ Cronograma",
@@ -375,50 +530,61 @@ mod_actual = next(
 
 if st.sidebar.button("🔄 Refrescar datos"):
     st.cache_data.clear()
+    hoja_limpia.clear()
+    modulo_preparado.clear()
     st.rerun()
 
-df_base = get_datos_por_modulo(mod_actual)
-df_base = limpiar_datos_por_modulo(
-    mod_actual,
-    df_base,
-    archivo_metas=archivo_metas,
-    archivo_metas_rec=archivo_metas_rec
-)
+st.title(f"{mod_actual}")
+
+# El encabezado y la navegación ya están en pantalla; el módulo espera sus hojas
+hoy = datetime.now(timezone("America/Bogota")).date()
+pipeline = PIPELINES[mod_actual]
+versiones = tuple(version_hoja(hoja) for hoja in pipeline.hojas)
+marcador_modulo = composicion.marcador(f"Cargando {mod_actual}…")
+hojas = composicion.cargar_datos({
+    hoja: partial(hoja_limpia, hoja, version) for hoja, version in zip(pipeline.hojas, versiones)
+})
+modulo = modulo_preparado(mod_actual, versiones, hoy, hojas)
+marcador_modulo.empty()
+
+df_base = modulo.datos
 
 if df_base.empty:
     st.warning("No hay datos disponibles.")
     st.stop()
 
-COLUMNAS_FILTRO = {
-    "Cronograma": ["Etapa", "Actividad", "Estado", "Responsable_contractual"],
-    "Entregables": ["NO. DE PAGO", "NO. DE ENTREGABLE", "ENTREGABLE", "ESTADO"],
-    "VRM": ["estado_carpeta", "numero_opec", "nivel_x", "estado_rm"],
-    "Reclamaciones": ["nro_opec", "denominacion", "nivel", "estado_real"]
-}
-
 cols_filtro = COLUMNAS_FILTRO.get(mod_actual, [])
 
 if st.sidebar.button("🧹 Borrar filtros"):
     for col in cols_filtro:
         key = f"filtro_{mod_actual}_{col}"
         st.session_state[key] = "Todos"
+        st.session_state[f"{key}_buscar"] = ""
     st.rerun()
 
-filtros = generar_filtros_sidebar(df_base, cols_filtro, mod_actual)
+filtros = generar_filtros_sidebar(modulo.arbol, modulo.indices, cols_filtro, mod_actual)
 df_filtrado = aplicar_filtros_dinamicos(df_base, filtros)
 
-filtros_metr = {k: v for k, v in filtros.items() if k not in ["estado_carpeta", "estado_rm", "estado_real"]}
-df_metr = aplicar_filtros_dinamicos(df_base, filtros_metr)
+# Firma de la vista para la caché de figuras compartida (ver figuras.py); el corte es
+# el día de Bogotá, el mismo de las metas del avance por rol
+vista_figuras = figuras.vista(f"{mod_actual}/{df_base.attrs.get('version', '')}", filtros, hoy)
 
-st.title(f"{mod_actual}")
+# Avance por rol: los filtros de estado no cuentan (la meta se mide sobre todas las carpetas)
+FILTROS_ESTADO = ["estado_carpeta", "estado_rm", "estado_real"]
 
+# Por huella de contenido del módulo: no necesita caducar, un cambio en las hojas cambia la clave
+@st.cache_data(max_entries=64, show_spinner=False)
+def avance_por_rol(modulo: str, version: str, hoy: date, filtros_rol: tuple,
+                   _arbol: pd.Series, _metas_rol: pd.DataFrame) -> tuple[pd.Series, pd.DataFrame]:
+    """Conteos por estado_carpeta y resumen por rol de una firma de filtros, desde el árbol de conteos."""
+    por_estado = arboles.podar_arbol(_arbol, dict(filtros_rol)).groupby(level="estado_carpeta").sum()
+    return por_estado, proyectos.resumen_por_rol(por_estado, _metas_rol)
 
-# ✅ NUEVA FUNCIÓN para VRM y Reclamaciones
-def mostrar_avance_por_rol(modulo: str, df_base: pd.DataFrame, df_metr: pd.DataFrame, filtros: dict):
+def mostrar_avance_por_rol(por_estado: pd.Series, resumen: pd.DataFrame):
     c1, c2, c3, c4 = st.columns(4)
 
-    total = len(df_metr)
-    ejecutadas = len(df_metr[df_metr["estado_carpeta"] == "auditada"])
+    total = int(por_estado.sum())
+    ejecutadas = int(por_estado.get("auditada", 0))
     diferencia = total - ejecutadas
     porcentaje = (ejecutadas / total * 100) if total else 0
 
@@ -429,50 +595,26 @@ def mostrar_avance_por_rol(modulo: str, df_base: pd.DataFrame, df_metr: pd.DataF
 
     st.subheader("📈 Avance por Rol")
 
-    # Campos a excluir en filtros, según módulo
-    filtros_excluir = {
-        "VRM": ["estado_carpeta", "estado_rm"],
-        "Reclamaciones": ["estado_carpeta", "estado_real"]
-    }.get(modulo, ["estado_carpeta"])
-
-    filtros_sin_estados = {
-        k: v for k, v in filtros.items() if k not in filtros_excluir
-    }
-
-    # Recalcular el resumen sin esos filtros
-    df_sin_estados = aplicar_filtros_dinamicos(df_base, filtros_sin_estados)
-    limpiar_datos_por_modulo(modulo, df_sin_estados)
-
-    # Acceder a la clave de sesión según el módulo
-    resumen_key = {
-        "VRM": "df_resumen_vrm",
-        "Reclamaciones": "df_resumen_reclamaciones"
-    }.get(modulo)
-
-    resumen = st.session_state.get(resumen_key)
-
-    if resumen is not None and not resumen.empty:
-        cols_numericas = ["Meta Proyectada a la Fecha", "Carpetas Revisadas"]
-        for col in cols_numericas:
-            if col in resumen.columns:
-                resumen[col] = resumen[col]#.apply(lambda x: f"{int(x):,}".replace(",", "."))
-
-        if "% Avance" in resumen.columns:
-            resumen["% Avance"] = resumen["% Avance"]#.apply(lambda x: f"{x:.1f}%".replace(".", ","))
-
+    if not resumen.empty:
         st.dataframe(resumen, use_container_width=True, hide_index=True)
     else:
         st.info("No hay datos disponibles para el avance por rol.")
 
-if mod_actual in ["VRM", "Reclamaciones"]:
-    mostrar_avance_por_rol(mod_actual, df_base, df_metr, filtros)
+if mod_actual in ["VRM", "Reclamaciones"] and modulo.metas_rol is not None:
+    # La firma son los filtros activos que no son de estado
+    filtros_rol = tuple(sorted(
+        (col, val) for col, val in filtros.items() if val != "Todos" and col not in FILTROS_ESTADO
+    ))
+    mostrar_avance_por_rol(*avance_por_rol(
+        mod_actual, modulo.version, hoy, filtros_rol, modulo.arbol, modulo.metas_rol
+    ))
 
 # Visualizaciones por módulo (fijas)
 vis_default = {
     "Cronograma": ["Tabla", "Barras", "Barras"],
     "Entregables": ["Tabla", "Barras", "Anillo"],
-    "VRM": ["Tabla", "Embudo", "Anillo"],
-    "Reclamaciones": ["Tabla", "Embudo", "Anillo"],
+    "VRM": ["Tabla", "Embudo", "Anillo", "Matriz"],
+    "Reclamaciones": ["Tabla", "Embudo", "Anillo", "Matriz"],
 }.get(mod_actual, ["Tabla"])
 vis_seleccionadas = vis_default
 
@@ -507,17 +649,19 @@ if "Tabla" in vis_seleccionadas:
         df_filtrado,
         columnas=cols_vis,
         col_estado="Estado",
-        colores_estado=colores_cronograma
+        colores_estado=colores_cronograma,
+        firma=vista_figuras
     )
 
 # === Visualización: BARRAS ===
 if "Barras" in vis_seleccionadas and "barras" in cols_graficos:
     for col in cols_graficos["barras"]:
-        grafico_barras(df_filtrado, columna=col, titulo=f"Distribución por {col}")
+        grafico_barras(df_filtrado, columna=col, titulo=f"Distribución por {col}", firma=vista_figuras)
 
 # === Visualización: EMBUDO ===
 if "Embudo" in vis_seleccionadas and "embudo" in cols_graficos:
-    grafico_embudo(df_filtrado, columna=cols_graficos["embudo"], titulo=f"Embudo por {cols_graficos['embudo']}")
+    grafico_embudo(df_filtrado, columna=cols_graficos["embudo"], titulo=f"Embudo por {cols_graficos['embudo']}",
+                   firma=vista_figuras)
 
 # === Visualización: ANILLO ===
 #if "Anillo" in vis_seleccionadas and "anillo" in cols_graficos:
@@ -527,5 +671,17 @@ if "Anillo" in vis_seleccionadas and "anillo" in cols_graficos:
     columnas = cols_graficos["anillo"]
     if isinstance(columnas, str):
         columnas = [columnas]
-    grafico_anillo(df=df_filtrado, columnas=columnas, titulo=f"Distribución por {' y '.join(columnas)}")
+    grafico_anillo(arbol=modulo.arbol, columnas=columnas, titulo=f"Distribución por {' y '.join(columnas)}",
+                   filtros=filtros, firma=vista_figuras)
+
+# === Visualización: MATRIZ ===
+if "Matriz" in vis_seleccionadas and modulo.matriz is not None:
+    st.subheader("🧮 Carpetas por OPEC, nivel y estado")
+    filtros_matriz = tuple(sorted((col, val) for col, val in filtros.items() if val != "Todos"))
+    matriz_carpetas(
+        cortar_matriz(mod_actual, modulo.version, filtros_matriz, tuple(pipeline.matriz), modulo.matriz),
+        columnas=pipeline.matriz, titulo="Carpetas por estado", firma=vista_figuras,
+    )
 
+# Con el módulo ya dibujado, los demás se preparan en segundo plano
+composicion.precargar("inpec", mod_actual, {m: partial(precargar_modulo, m, hoy) for m in PIPELINES})
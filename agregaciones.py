@@ -0,0 +1,281 @@
+"""Agregaciones pesadas en un pool de procesos.
+
+Streamlit ejecuta cada sesión en un hilo del mismo proceso, así que los groupby
+de pandas de varios usuarios compiten por el GIL. Este módulo publica el
+dataset una sola vez en memoria compartida (Arrow IPC) y resuelve los conteos
+en procesos aparte: cada proceso lee el dataset sin copiarlo y solo viajan
+entre procesos los parámetros de la consulta y la tabla agregada resultante.
+
+El pool es de tamaño fijo y vive en un proceso anfitrión propio (ver
+`agregador`), que se lanza una vez y se comparte entre sesiones.
+"""
+import atexit
+import multiprocessing as mp
+import os
+import secrets
+import subprocess
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+from multiprocessing.managers import BaseManager
+from typing import NamedTuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+
+class RefDataset(NamedTuple):
+    nombre: str    # Segmento de memoria compartida
+    tamano: int    # Bytes útiles del stream Arrow
+    version: str
+    ruta: str = ""  # O bien un archivo Arrow del almacén (ver almacen.py), mapeado en memoria
+
+
+class ColumnasAusentes(KeyError):
+    """La tabla no tiene columnas que la consulta filtra o agrupa (p. ej. los conteos
+    precalculados solo traen almacen.DIMENSIONES_CONTEOS): hay que contar en local."""
+
+
+def referencia_archivo(ruta: str, version: str) -> RefDataset:
+    """Referencia a un archivo Arrow ya publicado; no hace falta copiarlo a memoria compartida."""
+    return RefDataset("", 0, version, ruta)
+
+
+# ============ PROCESO PRINCIPAL ============
+
+_lock = threading.Lock()
+_publicados: dict[str, tuple[RefDataset, shared_memory.SharedMemory]] = {}
+_anfitrion: subprocess.Popen | None = None
+_agregador = None  # Proxy del Agregador del anfitrión; cada hilo abre su propia conexión
+
+
+class _Cliente(BaseManager):
+    pass
+
+
+_Cliente.register("Agregador")
+
+
+def publicar(clave: str, version: str, df: pd.DataFrame) -> RefDataset:
+    """Copia `df` a memoria compartida (una vez por versión) y devuelve su referencia."""
+    with _lock:
+        actual = _publicados.get(clave)
+        if actual and actual[0].version == version:
+            return actual[0]
+
+        tabla = pa.Table.from_pandas(df, preserve_index=False)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, tabla.schema) as writer:
+            writer.write_table(tabla)
+        datos = sink.getvalue()
+
+        shm = shared_memory.SharedMemory(create=True, size=max(datos.size, 1))
+        shm.buf[:datos.size] = memoryview(datos).cast("B")
+        ref = RefDataset(shm.name, datos.size, version)
+        _publicados[clave] = (ref, shm)
+
+        # La versión anterior deja de ser visible; los procesos que ya la tenían
+        # abierta conservan su mapeo hasta soltarla.
+        if actual:
+            _liberar(actual[1])
+        return ref
+
+
+def _liberar(shm: shared_memory.SharedMemory):
+    shm.close()
+    try:
+        shm.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def agregador(procesos: int):
+    """Proxy del pool compartido por todas las sesiones.
+
+    El pool vive en un proceso anfitrión (`python -m agregaciones`) que se lanza
+    una sola vez con `procesos` procesos; las llamadas siguientes lo reutilizan
+    tal cual. Streamlit instala el script como __main__ y con spawn cada proceso
+    del pool lo volvería a ejecutar completo; bajo el anfitrión __main__ es este
+    módulo, así que los procesos solo lo importan. Si el anfitrión muere se
+    relanza en la siguiente llamada.
+    """
+    global _anfitrion, _agregador
+    with _lock:
+        if _anfitrion is None or _anfitrion.poll() is not None:
+            clave = secrets.token_bytes(32)
+            _anfitrion = subprocess.Popen(
+                [sys.executable, "-m", "agregaciones", str(procesos)],
+                cwd=os.path.dirname(os.path.abspath(__file__)),
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True,
+            )
+            _anfitrion.stdin.write(clave.hex() + "\n")
+            _anfitrion.stdin.flush()
+            host, puerto = _anfitrion.stdout.readline().split()
+            cliente = _Cliente(address=(host, int(puerto)), authkey=clave)
+            cliente.connect()
+            _agregador = cliente.Agregador()
+        return _agregador
+
+
+def conteo(ref: RefDataset, filtros: dict, claves: list[str], categoria: tuple | None = None,
+           procesos: int = 2) -> pd.DataFrame:
+    """Cantidad de filas por `claves` tras aplicar `filtros`, calculada en el pool.
+
+    - filtros: {columna: valor}; "Todos" no filtra. `estado_carpeta` se compara
+      en minúsculas y sin espacios, y así se devuelve cuando es clave.
+    - categoria: (categoria_sel, {columna_sujeto: {sujeto: categoria}}). La
+      categoría de la fila es la primera no nula en el orden del diccionario.
+    """
+    return agregador(procesos).conteo(ref, filtros, claves, categoria)
+
+
+@atexit.register
+def _cerrar():
+    if _anfitrion is not None and _anfitrion.poll() is None:
+        _anfitrion.stdin.close()  # El anfitrión termina al ver cerrada su entrada
+    for _, shm in _publicados.values():
+        _liberar(shm)
+    _publicados.clear()
+    # En los procesos del pool: soltar primero las tablas Arrow que apuntan al segmento
+    adjuntos = [shm for shm, _ in _tablas.values() if shm is not None]
+    _tablas.clear()
+    for shm in adjuntos:
+        try:
+            shm.close()
+        except BufferError:
+            pass
+
+
+# ============ PROCESO ANFITRIÓN ============
+
+class _Agregador:
+    def __init__(self, pool: ProcessPoolExecutor):
+        self._pool = pool
+
+    def conteo(self, ref: RefDataset, filtros: dict, claves: list[str], categoria: tuple | None) -> pd.DataFrame:
+        return self._pool.submit(_tarea_conteo, ref, filtros, claves, categoria).result()
+
+
+def servir(procesos: int):
+    """Atiende a los tableros con un pool fijo de `procesos` procesos hasta que se cierre stdin."""
+    clave = bytes.fromhex(sys.stdin.readline())
+    # spawn: hacer fork de un servidor con hilos puede dejar locks tomados
+    pool = ProcessPoolExecutor(max_workers=procesos, mp_context=mp.get_context("spawn"))
+    agregador_ = _Agregador(pool)
+
+    class _Servidor(BaseManager):
+        pass
+
+    _Servidor.register("Agregador", callable=lambda: agregador_)
+    servidor = _Servidor(address=("127.0.0.1", 0), authkey=clave).get_server()
+    print(*servidor.address, flush=True)
+
+    def vigilar():
+        sys.stdin.read()  # EOF: el proceso principal terminó
+        pool.shutdown(wait=True, cancel_futures=True)
+        os._exit(0)
+
+    threading.Thread(target=vigilar, daemon=True).start()
+    servidor.serve_forever()
+
+
+# ============ PROCESOS DEL POOL ============
+
+_tablas: "OrderedDict[str, tuple[shared_memory.SharedMemory | None, pa.Table]]" = OrderedDict()
+_MAX_TABLAS = 2
+
+
+def _tabla(ref: RefDataset) -> pa.Table:
+    clave = ref.ruta or ref.nombre
+    if clave in _tablas:
+        _tablas.move_to_end(clave)
+        return _tablas[clave][1]
+
+    if ref.ruta:
+        shm = None
+        tabla = pa.ipc.open_file(pa.memory_map(ref.ruta, "r")).read_all()
+    else:
+        shm = shared_memory.SharedMemory(name=ref.nombre)
+        # El segmento es del proceso principal; que el rastreador del anfitrión no lo borre
+        resource_tracker.unregister(shm._name, "shared_memory")
+        tabla = pa.ipc.open_stream(pa.py_buffer(shm.buf[:ref.tamano])).read_all()
+    _tablas[clave] = (shm, tabla)
+
+    while len(_tablas) > _MAX_TABLAS:
+        _, (viejo, _) = _tablas.popitem(last=False)
+        try:
+            if viejo is not None:
+                viejo.close()
+        except BufferError:
+            pass  # Aún hay vistas Arrow vivas; se libera al terminar el proceso
+    return tabla
+
+
+def _estado_normalizado(columna: pa.ChunkedArray) -> pa.ChunkedArray:
+    return pc.utf8_lower(pc.utf8_trim_whitespace(pc.fill_null(columna, "")))
+
+
+def _tarea_conteo(ref: RefDataset, filtros: dict, claves: list[str], categoria: tuple | None) -> pd.DataFrame:
+    return contar(_tabla(ref), filtros, claves, categoria).to_pandas()
+
+
+def contar(tabla: pa.Table, filtros: dict, claves: list[str], categoria: tuple | None = None) -> pa.Table:
+    """Núcleo de `conteo` sobre una tabla Arrow (filas o conteos con columna `cantidad`).
+
+    Lo usan los procesos del pool y el servicio local de datos (servicio.py).
+    """
+    columnas = set(tabla.column_names)
+    # Un filtro sobre una columna ausente no se puede ignorar: devolvería conteos sin filtrar
+    activos = {col for col, valor in filtros.items() if valor not in (None, "Todos")}
+    ausentes = sorted((activos | set(claves)) - columnas)
+    if ausentes:
+        raise ColumnasAusentes(ausentes)
+
+    if "estado_carpeta" in columnas:
+        idx = tabla.column_names.index("estado_carpeta")
+        tabla = tabla.set_column(idx, "estado_carpeta", _estado_normalizado(tabla["estado_carpeta"]))
+
+    mascara = None
+    for col, valor in filtros.items():
+        if valor in (None, "Todos"):
+            continue
+        objetivo = str(valor).strip().lower() if col == "estado_carpeta" else valor
+        cond = pc.equal(tabla[col], objetivo)
+        mascara = cond if mascara is None else pc.and_(mascara, cond)
+
+    if categoria:
+        categoria_sel, mapas = categoria
+        cat_global = None
+        for col, mapa in mapas.items():
+            if col not in columnas or not mapa:
+                continue
+            sujetos = pa.array([str(k).strip() for k in mapa.keys()], pa.string())
+            categorias = pa.array([None if v is None else str(v) for v in mapa.values()], pa.string())
+            posicion = pc.index_in(pc.utf8_trim_whitespace(tabla[col].cast(pa.string())), value_set=sujetos)
+            cat = pc.take(categorias, posicion)
+            cat_global = cat if cat_global is None else pc.coalesce(cat_global, cat)
+        if cat_global is None:
+            tabla = tabla.slice(0, 0)  # Sin categorías calculadas ninguna fila califica
+        else:
+            cond = pc.equal(cat_global, categoria_sel)
+            mascara = cond if mascara is None else pc.and_(mascara, cond)
+
+    if mascara is not None:
+        tabla = tabla.filter(pc.fill_null(mascara, False))
+
+    # Sobre conteos precalculados se suma `cantidad`; sobre filas se cuentan
+    if "cantidad" in columnas:
+        res = tabla.select(claves + ["cantidad"]).group_by(claves).aggregate([("cantidad", "sum")])
+    else:
+        res = tabla.select(claves).group_by(claves).aggregate([(claves[0], "count", pc.CountOptions(mode="all"))])
+    res = res.rename_columns([c if c in claves else "cantidad" for c in res.column_names])
+    return res.select(claves + ["cantidad"])
+
+
+if __name__ == "__main__":
+    # Las funciones del pool se envían desde el módulo importado, no desde __main__
+    import agregaciones
+    agregaciones.servir(int(sys.argv[1]))
@@ -0,0 +1,262 @@
+"""Almacén de datos versionado en archivos Arrow, compartido por las réplicas de un host.
+
+Un solo cargador por host descarga las hojas, las normaliza igual que los
+tableros y escribe cada versión (más sus agregados precalculados) como archivo
+Arrow inmutable. Luego apunta `<nombre>.version` a ella con un reemplazo
+atómico. Cada réplica mapea en memoria la versión vigente en solo lectura, así
+que el sistema operativo comparte las páginas entre procesos y Google Sheets
+recibe una descarga por host y no una por réplica.
+
+Uso del cargador:
+
+    python almacen.py /ruta/datos              # bucle, cada 600 s
+    python almacen.py /ruta/datos --intervalo 0  # una sola vez
+
+Los tableros lo usan si se define DIR_DATOS con la misma ruta.
+"""
+import argparse
+import hashlib
+import os
+import time
+from typing import Callable, NamedTuple
+
+import pandas as pd
+import pyarrow as pa
+
+CONSERVAR_VERSIONES = 3  # Las réplicas pueden seguir leyendo una versión anterior un rato
+
+
+# ============ NORMALIZACIÓN (la misma en tableros y cargador) ============
+
+def convertir_numero(s):
+
+    if pd.isna(s):
+        return 0.0
+    s = str(s).strip()
+
+    if s in ["-", "", "nan", "None"]:
+        return 0.0
+
+    if "," in s:
+        s = s.replace(".", "")
+    else:
+        s = s.replace(".", "")
+
+    try:
+        return float(s)
+    except:
+        return 0.0
+
+def huella(df: pd.DataFrame) -> str:
+    """Versión de un DataFrame: cambia solo si cambia su contenido."""
+    return hashlib.sha1(pd.util.hash_pandas_object(df, index=False).values.tobytes()).hexdigest()[:12]
+
+def normalizar_carpetas(df: pd.DataFrame) -> pd.DataFrame:
+    for c in ["analista", "supervisor", "auditor", "estado_carpeta", "profesional", "nivel", "EQUIPO"]:
+        if c in df.columns:
+            df[c] = df[c].fillna("").str.strip()
+    df.attrs["version"] = huella(df)
+    return df
+
+def normalizar_metas(df: pd.DataFrame) -> pd.DataFrame:
+    df.columns = df.columns.str.strip()
+
+    # Convertir columnas numéricas correctamente
+    columnas_numericas = ["META EQUIPO A LA FECHA", "META DIARIA", "META DIARIA A LA FECHA", "META DIARIA EQUIPO"]
+
+    for col in columnas_numericas:
+        if col in df.columns:
+            df[col] = df[col].astype(str).apply(convertir_numero)
+
+    # Fecha como datetime.date
+    if "FECHA" in df.columns:
+        df["FECHA"] = pd.to_datetime(df["FECHA"], errors="coerce").dt.date
+
+    df.attrs["version"] = huella(df)
+    return df
+
+def normalizar_texto(df: pd.DataFrame) -> pd.DataFrame:
+    # Hojas del tablero INPEC: todo como texto, sin nulos
+    df = df.fillna("")
+    df.attrs["version"] = huella(df)
+    return df
+
+
+# ============ AGREGADOS PRECALCULADOS ============
+
+DIMENSIONES_CONTEOS = ["auditor", "supervisor", "analista", "EQUIPO", "nivel", "estado_carpeta"]
+
+def conteos_carpetas(df: pd.DataFrame) -> pd.DataFrame:
+    """Carpetas por cada combinación de filtros del sidebar y estado (en minúsculas).
+
+    Alcanza para las agregaciones del pool de procesos y para los resúmenes de
+    resumenes.py, que suman `cantidad` en lugar de contar filas.
+    """
+    dims = [c for c in DIMENSIONES_CONTEOS if c in df.columns]
+    return (
+        df[dims]
+        .assign(estado_carpeta=df["estado_carpeta"].fillna("").str.strip().str.lower())
+        .groupby(dims, dropna=False)
+        .size()
+        .reset_index(name="cantidad")
+    )
+
+
+class Fuente(NamedTuple):
+    url: str
+    normalizar: Callable[[pd.DataFrame], pd.DataFrame]
+    agregados: dict[str, Callable[[pd.DataFrame], pd.DataFrame]] = {}
+
+
+FUENTES = {
+    "carpetas": Fuente(
+        "https://docs.google.com/spreadsheets/d/e/2PACX-1vQVxG-bO1D5mkgUFCU35drRV4tyXT9aRaW6q4zzWGa9nFAqkLVdZxaIjwD1cEMJIAXuI4xTBlhHS1og/pub?gid=991630809&single=true&output=csv",
+        normalizar_carpetas,
+        {"conteos": conteos_carpetas},
+    ),
+    "metas": Fuente(
+        "https://docs.google.com/spreadsheets/d/e/2PACX-1vQVxG-bO1D5mkgUFCU35drRV4tyXT9aRaW6q4zzWGa9nFAqkLVdZxaIjwD1cEMJIAXuI4xTBlhHS1og/pub?gid=1199329439&single=true&output=csv",
+        normalizar_metas,
+    ),
+    "inpec_cronograma": Fuente(
+        "https://docs.google.com/spreadsheets/d/e/2PACX-1vThSek_BzK-DeNwhsjcmqSWJLz4vNQ_bBQJ8cXV_pEjCLGN8T64WcIqsLEfQIYcO9dVLCPHfdnNdfhC/pub?gid=1775323779&single=true&output=csv",
+        normalizar_texto,
+    ),
+    "inpec_entregables": Fuente(
+        "https://docs.google.com/spreadsheets/d/e/2PACX-1vTXU3Fh-35s_7ZysWWnWQpQhhHxMst_qqFznNeBA1xmvMVYpo7yVODZTaHTqh12ptDViA6CYLLaZWre/pub?gid=1749869584&single=true&output=csv",
+        normalizar_texto,
+    ),
+    "inpec_vrm": Fuente(
+        "https://docs.google.com/spreadsheets/d/e/2PACX-1vQ1ZNrmbDDZPZbj0-ovO6HRgW7m2MAp3efItgdv8QjOny04F4D5knQ4E2RvMcmQB-L6OS00F13xiiWQ/pub?gid=1175528082&single=true&output=csv",
+        normalizar_texto,
+        {"conteos": conteos_carpetas},
+    ),
+    "inpec_reclamaciones": Fuente(
+        "https://docs.google.com/spreadsheets/d/e/2PACX-1vQY3MrZCwuoQYNnM5TefaK2Zj7v7DUUY_TSVHuitoa705h6SO0v89Q4JSKNCIiE8QJcO2H_ZWcKCYiN/pub?gid=0&single=true&output=csv",
+        normalizar_texto,
+        {"conteos": conteos_carpetas},
+    ),
+    "inpec_metas": Fuente(
+        "https://docs.google.com/spreadsheets/d/e/2PACX-1vQ1ZNrmbDDZPZbj0-ovO6HRgW7m2MAp3efItgdv8QjOny04F4D5knQ4E2RvMcmQB-L6OS00F13xiiWQ/pub?gid=1567229219&single=true&output=csv",
+        normalizar_texto,
+    ),
+    "inpec_metas_rec": Fuente(
+        "https://docs.google.com/spreadsheets/d/e/2PACX-1vQY3MrZCwuoQYNnM5TefaK2Zj7v7DUUY_TSVHuitoa705h6SO0v89Q4JSKNCIiE8QJcO2H_ZWcKCYiN/pub?gid=680702191&single=true&output=csv",
+        normalizar_texto,
+    ),
+}
+
+def descargar(nombre: str) -> pd.DataFrame:
+    fuente = FUENTES[nombre]
+    return fuente.normalizar(pd.read_csv(fuente.url, dtype=str))
+
+
+# ============ ARCHIVOS VERSIONADOS ============
+
+def ruta(directorio: str, nombre: str, version: str) -> str:
+    return os.path.join(directorio, f"{nombre}-{version}.arrow")
+
+def version_actual(directorio: str, nombre: str) -> str | None:
+    """Versión vigente según el puntero del cargador (None si aún no hay)."""
+    try:
+        with open(os.path.join(directorio, f"{nombre}.version"), encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+def _reemplazo_atomico(destino: str, escribir: Callable[[str], None]):
+    tmp = os.path.join(os.path.dirname(destino), f".{os.path.basename(destino)}.{os.getpid()}.tmp")
+    try:
+        escribir(tmp)
+        os.replace(tmp, destino)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+def _escribir_arrow(destino: str, df: pd.DataFrame):
+    tabla = pa.Table.from_pandas(df, preserve_index=False)
+
+    def escribir(tmp: str):
+        # Sin compresión: así el archivo se puede mapear sin copiar
+        with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, tabla.schema) as writer:
+            writer.write_table(tabla)
+
+    _reemplazo_atomico(destino, escribir)
+
+def _escribir_texto(destino: str, texto: str):
+    def escribir(tmp: str):
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(texto)
+
+    _reemplazo_atomico(destino, escribir)
+
+def _podar(directorio: str, nombre: str):
+    versiones = sorted(
+        (e for e in os.scandir(directorio)
+         if e.name.startswith(f"{nombre}-") and e.name.endswith(".arrow")),
+        key=lambda e: e.stat().st_mtime,
+        reverse=True,
+    )
+    # Borrar un archivo mapeado es seguro: quien lo tenga abierto lo conserva hasta soltarlo
+    for e in versiones[CONSERVAR_VERSIONES:]:
+        os.remove(e.path)
+
+def publicar_fuente(directorio: str, nombre: str) -> str:
+    """Descarga, normaliza y publica una fuente con sus agregados. Devuelve la versión."""
+    df = descargar(nombre)
+    version = df.attrs["version"]
+    if version == version_actual(directorio, nombre):
+        return version
+
+    # Primero los datos y sus agregados; el puntero al final, para que ninguna
+    # réplica vea una versión a medio escribir
+    for agregado, calcular in FUENTES[nombre].agregados.items():
+        _escribir_arrow(ruta(directorio, f"{nombre}.{agregado}", version), calcular(df))
+    _escribir_arrow(ruta(directorio, nombre, version), df)
+    _escribir_texto(os.path.join(directorio, f"{nombre}.version"), version)
+
+    for agregado in FUENTES[nombre].agregados:
+        _podar(directorio, f"{nombre}.{agregado}")
+    _podar(directorio, nombre)
+    return version
+
+
+# ============ LECTURA DESDE LAS RÉPLICAS ============
+
+def mapeo_texto():
+    # Con pandas 3 (ver requirements.txt) el texto ya vive en Arrow: se envuelve el
+    # buffer mapeado tal cual en vez de copiarlo a objetos de Python
+    tipo = pd.Series([], dtype=str).dtype
+    return {pa.string(): tipo, pa.large_string(): tipo}.get
+
+def abrir(directorio: str, nombre: str, version: str) -> pd.DataFrame:
+    """DataFrame de una versión publicada, mapeado en memoria en solo lectura."""
+    tabla = pa.ipc.open_file(pa.memory_map(ruta(directorio, nombre, version), "r")).read_all()
+    df = tabla.to_pandas(types_mapper=mapeo_texto())
+    df.attrs["version"] = version
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cargador de datos compartido por las réplicas del host.")
+    parser.add_argument("directorio", help="Carpeta donde se escriben las versiones (la misma de DIR_DATOS)")
+    parser.add_argument("--intervalo", type=int, default=600, help="Segundos entre descargas (0 = una sola vez)")
+    parser.add_argument("--fuentes", nargs="*", default=list(FUENTES), choices=list(FUENTES))
+    args = parser.parse_args()
+
+    os.makedirs(args.directorio, exist_ok=True)
+    while True:
+        for nombre in args.fuentes:
+            try:
+                version = publicar_fuente(args.directorio, nombre)
+                print(f"{time.strftime('%Y-%m-%d %H:%M:%S')} {nombre}: versión {version}", flush=True)
+            except Exception as e:
+                # Una hoja caída no detiene las demás; las réplicas siguen con la versión anterior
+                print(f"{time.strftime('%Y-%m-%d %H:%M:%S')} {nombre}: error {e}", flush=True)
+        if args.intervalo <= 0:
+            break
+        time.sleep(args.intervalo)
+
+
+if __name__ == "__main__":
+    main()
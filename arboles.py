@@ -0,0 +1,85 @@
+"""Árbol de conteos de un módulo: una fila por combinación observada de sus niveles.
+
+Se arma una sola vez por versión de datos (en el pipeline de cada módulo de
+INPEC/dashborad.py). Los filtros en cascada, el anillo, el avance por rol y
+la matriz OPEC × nivel × estado se responden podando sus ramas y sumando por
+nivel, sin volver a agrupar las filas del módulo.
+"""
+import numpy as np
+import pandas as pd
+
+
+def construir_arbol(df: pd.DataFrame, niveles: list[str]) -> pd.Series:
+    return df.groupby(niveles, dropna=False).size().sort_index()
+
+def podar_arbol(arbol: pd.Series, filtros: dict, camino: list[str] = (), ruta: list[str] = ()) -> pd.Series:
+    """Las hojas del árbol que cumplen los filtros y cuelgan del nodo `ruta` del camino."""
+    condiciones = {col: val for col, val in filtros.items() if val != "Todos" and col in arbol.index.names}
+    condiciones.update(zip(camino, ruta))
+    visibles = np.ones(len(arbol), dtype=bool)
+    for col, val in condiciones.items():
+        visibles &= arbol.index.get_level_values(col) == val
+    return arbol[visibles]
+
+def nivel_arbol(podado: pd.Series, columna: str) -> pd.DataFrame:
+    """Conteos de un nivel del árbol podado: [columna, "cantidad"] de mayor a menor."""
+    conteo = podado.groupby(level=columna).sum()
+    conteo = conteo[conteo > 0].sort_values(ascending=False, kind="stable")
+    return conteo.rename("cantidad").rename_axis(columna).reset_index()
+
+def facetas(arbol: pd.Series, filtros: dict) -> dict[str, pd.Series]:
+    """Para cada filtro, las filas que deja cada opción con los demás filtros activos.
+
+    Se resuelve sobre el árbol de conteos: una máscara por filtro activo y una
+    suma por nivel, sin recorrer las filas del módulo.
+    """
+    mascaras = {
+        col: arbol.index.get_level_values(col) == val for col, val in filtros.items() if val != "Todos"
+    }
+    conteos = {}
+    for col in filtros:
+        visibles = np.ones(len(arbol), dtype=bool)
+        for otra, mascara in mascaras.items():
+            if otra != col:
+                visibles &= mascara
+        conteo = arbol[visibles].groupby(level=col).sum()
+        conteos[col] = conteo[conteo > 0]
+    return conteos
+
+
+# ============ MATRIZ ============
+# El mismo árbol con los estados como columnas. Tiene una fila por combinación
+# observada de los demás niveles (no el producto de todos los valores), así que
+# los filtros la cortan por filas o columnas y solo se suman esas filas por
+# OPEC y nivel.
+
+def construir_matriz(arbol: pd.Series, estado: str) -> pd.DataFrame:
+    matriz = arbol.unstack(estado, fill_value=0)
+    if matriz.columns.hasnans:
+        # Un estado nulo es una carpeta por asignar, como ""; además pandas no agrupa
+        # por niveles una tabla con una columna sin nombre (ver cortar_matriz)
+        matriz = matriz.T.groupby(matriz.columns.fillna("")).sum().T
+    return matriz[matriz.sum().sort_values(ascending=False, kind="stable").index]
+
+def cortar_matriz(matriz: pd.DataFrame, filtros: dict, columnas: tuple) -> pd.DataFrame:
+    """Carpetas por OPEC y nivel, una columna por estado, de más a menos pendientes.
+
+    `columnas` es (OPEC, nivel, estado). Pendientes son las que aún no están
+    auditadas (la meta ejecutada del avance por rol).
+    """
+    opec, nivel, estado = columnas
+    visibles = np.ones(len(matriz), dtype=bool)
+    for col, val in filtros.items():
+        if col in matriz.index.names:
+            visibles &= matriz.index.get_level_values(col) == val
+    cortada = matriz[visibles]
+    if estado in filtros:
+        cortada = cortada[[c for c in cortada.columns if c == filtros[estado]]]
+
+    conteo = cortada.groupby(level=[opec, nivel], dropna=False).sum()
+    conteo = conteo.loc[:, conteo.sum() > 0]
+    conteo.columns.name = None
+    conteo["total"] = conteo.sum(axis=1)
+    conteo["pendientes"] = conteo["total"] - conteo.get("auditada", 0)
+    conteo = conteo[conteo["total"] > 0]
+    return conteo.sort_values(["pendientes", "total"], ascending=False, kind="stable").reset_index()
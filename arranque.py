@@ -0,0 +1,101 @@
+"""Arranque en frío de los tableros: importaciones y primer render de la portada.
+
+    python arranque.py                          # los tres tableros
+    python arranque.py INPEC/dashborad.py --repeticiones 5 --top 15
+
+Cada medición corre en un proceso nuevo, como una réplica recién levantada:
+primero importa lo que ya trae cargado el servidor de Streamlit y después
+ejecuta el tablero con streamlit.testing en su portada (Inicio, o la pantalla
+de contraseña en INPEC). Informa cuánto tardó en salir el primer elemento de
+la página, cuánto la portada (hasta el primer aviso de carga de
+composicion.marcador, o la corrida completa si no hay datos que esperar) y qué
+módulos importó el tablero por su cuenta, de mayor a menor tiempo acumulado
+(python -X importtime).
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+TABLEROS = ["app.py", "DIAN_VA/app.py", "INPEC/dashborad.py"]
+MARCA = "--- tablero ---"
+
+# Se ejecuta en el proceso hijo; las importaciones del tablero se registran
+# en stderr después de MARCA
+_MEDIR = """
+import json, sys, time
+import streamlit.web.bootstrap
+from streamlit.runtime.scriptrunner_utils.script_run_context import ScriptRunContext
+from streamlit.testing.v1 import AppTest
+
+elementos, avisos = [], []
+_enqueue = ScriptRunContext.enqueue
+def enqueue(self, msg):
+    if msg.WhichOneof("type") == "delta" and msg.delta.WhichOneof("type") == "new_element":
+        elementos.append(time.perf_counter())
+        if msg.delta.new_element.markdown.body.startswith("⏳"):
+            avisos.append(elementos[-1])
+    return _enqueue(self, msg)
+ScriptRunContext.enqueue = enqueue
+
+at = AppTest.from_file({script!r}, default_timeout=300)
+at.query_params["pagina"] = "Inicio"
+print({marca!r}, file=sys.stderr, flush=True)
+inicio = time.perf_counter()
+at.run()
+fin = time.perf_counter()
+print(json.dumps({{
+    "primer_elemento": (elementos[0] - inicio) if elementos else None,
+    "portada": (avisos[0] if avisos else fin) - inicio,
+    "errores": [str(e.value) for e in at.exception],
+}}))
+"""
+
+
+def medir(script: str) -> tuple[dict, list[tuple[int, str]]]:
+    codigo = _MEDIR.format(script=os.path.join(RAIZ, script), marca=MARCA)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        cwd=RAIZ, capture_output=True, text=True, check=True,
+    )
+    resultado = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    # Solo los módulos de primer nivel que importó el tablero (sin sangría en el árbol)
+    importados, despues = [], False
+    for linea in proc.stderr.splitlines():
+        if linea == MARCA:
+            despues = True
+        elif despues and linea.startswith("import time:") and "|" in linea:
+            _, acumulado, nombre = linea.split("|", 2)
+            if acumulado.strip().isdigit() and not nombre[1:].startswith(" "):
+                importados.append((int(acumulado), nombre.strip()))
+    return resultado, sorted(importados, reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mide el arranque en frío de los tableros.")
+    parser.add_argument("tableros", nargs="*", default=TABLEROS, help="Scripts a medir (relativos a la raíz)")
+    parser.add_argument("--repeticiones", type=int, default=3, help="Procesos nuevos por tablero")
+    parser.add_argument("--top", type=int, default=10, help="Módulos más lentos a listar")
+    args = parser.parse_args()
+
+    for script in args.tableros:
+        corridas = [medir(script) for _ in range(max(args.repeticiones, 1))]
+        primeros = [r["primer_elemento"] for r, _ in corridas if r["primer_elemento"] is not None]
+        portadas = [r["portada"] for r, _ in corridas]
+        # Si ninguna corrida llegó a dibujar, los errores de abajo dicen por qué
+        primero = f"{statistics.median(primeros) * 1000:.0f} ms" if primeros else "n/a"
+        print(f"{script}: primer elemento {primero}, "
+              f"portada {statistics.median(portadas) * 1000:.0f} ms "
+              f"(mediana de {len(corridas)} procesos)")
+        for error in corridas[-1][0]["errores"]:
+            print(f"    error: {error[:200]}")
+        for acumulado, nombre in corridas[-1][1][:args.top]:
+            print(f"    {acumulado / 1000:8.1f} ms  {nombre}")
+
+
+if __name__ == "__main__":
+    main()
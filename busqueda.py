@@ -0,0 +1,90 @@
+"""Selectores con búsqueda en el servidor para columnas con muchos valores.
+
+Un st.selectbox manda al navegador todas sus opciones en cada rerun: con miles
+de OPEC o de analistas el widget pesa más que la página. `selector` envía solo
+las primeras coincidencias de lo que se escribe en su cuadro de búsqueda.
+
+`Indice` ordena una vez los valores (y cada palabra de cada valor) sin tildes
+ni mayúsculas, así que buscar por prefijo es una búsqueda binaria más las
+coincidencias que se devuelven, sin recorrer la lista. Quien llama lo construye
+una vez por versión de datos (en una caché o en composicion.memo).
+"""
+import unicodedata
+from bisect import bisect_left
+from typing import Any, Callable, Container
+
+import streamlit as st
+
+LIMITE = 20  # Opciones que se envían además de "Todos" y la elegida
+
+
+def normalizar(texto: Any) -> str:
+    """Minúsculas y sin tildes: "Técnico" y "tecnico" son la misma clave."""
+    descompuesto = unicodedata.normalize("NFKD", str(texto).casefold())
+    return "".join(c for c in descompuesto if not unicodedata.combining(c)).strip()
+
+
+class Indice:
+    """Valores ordenados por su forma normalizada, buscables por prefijo de cualquier palabra."""
+
+    def __init__(self, valores):
+        self.valores = sorted(dict.fromkeys(valores), key=normalizar)
+        entradas = []
+        for posicion, valor in enumerate(self.valores):
+            clave = normalizar(valor)
+            entradas.append((clave, posicion))
+            entradas.extend((palabra, posicion) for palabra in clave.split()[1:])
+        entradas.sort()
+        self._claves = [clave for clave, _ in entradas]
+        self._posiciones = [posicion for _, posicion in entradas]
+
+    def __len__(self) -> int:
+        return len(self.valores)
+
+    def buscar(self, consulta: str, limite: int = LIMITE, admitidos: Container | None = None) -> list:
+        """Hasta `limite` valores con una palabra que empieza por `consulta`, en orden alfabético.
+
+        Con `admitidos` solo cuentan esos valores (p. ej. las opciones que dejan
+        los demás filtros). Sin consulta, los primeros valores de la lista.
+        """
+        prefijo = normalizar(consulta)
+        candidatos = self._coincidencias(prefijo) if prefijo else range(len(self.valores))
+
+        vistos, encontrados = set(), []
+        for posicion in candidatos:
+            valor = self.valores[posicion]
+            if posicion in vistos or (admitidos is not None and valor not in admitidos):
+                continue
+            vistos.add(posicion)
+            encontrados.append(valor)
+            if len(encontrados) >= limite:
+                break
+        return sorted(encontrados, key=normalizar)
+
+    def _coincidencias(self, prefijo: str):
+        # Las claves que empiezan por el prefijo son contiguas: la primera que no, corta el recorrido
+        for i in range(bisect_left(self._claves, prefijo), len(self._claves)):
+            if not self._claves[i].startswith(prefijo):
+                break
+            yield self._posiciones[i]
+
+
+def selector(etiqueta: str, opciones: list, indice: Indice, key: str,
+             format_func: Callable[[Any], str] = str, limite: int = LIMITE, donde=st):
+    """selectbox de `opciones` ("Todos" primero) que envía solo las coincidencias de la búsqueda.
+
+    Con pocas opciones es un selectbox común. La opción elegida se sigue
+    mostrando aunque no coincida con lo buscado.
+    """
+    if len(opciones) <= limite + 1:
+        return donde.selectbox(etiqueta, opciones, key=key, format_func=format_func)
+
+    admitidos = set(opciones[1:])
+    consulta = donde.text_input(etiqueta, key=f"{key}_buscar",
+                                placeholder=f"Buscar entre {len(admitidos):,}…".replace(",", "."))
+    visibles = indice.buscar(consulta, limite, admitidos)
+    elegido = st.session_state.get(key)
+    if elegido in admitidos and elegido not in visibles:
+        visibles = [elegido] + visibles
+    return donde.selectbox(etiqueta, [opciones[0]] + visibles, key=key, format_func=format_func,
+                           label_visibility="collapsed")
@@ -0,0 +1,112 @@
+"""Comparativo entre proyectos: avance por rol, carpetas por estado y categorías.
+
+Se abre como página de tableros.py o por separado (streamlit run comparativo.py).
+Solo lee los agregados en caché de resumenes.py, nunca las filas de carpetas.
+"""
+import time
+from datetime import datetime
+
+import pandas as pd
+import plotly.colors
+import streamlit as st
+from pytz import timezone
+
+import figuras
+import resumenes
+
+# ============ CONFIG VISUAL ============
+# plotly.express y la plantilla se cargan con la primera figura (ver figuras.py)
+px = figuras.Perezoso("plotly.express")
+figuras.plantilla("seaborn")
+COLOR_PALETTE = plotly.colors.sequential.Greens
+ORDEN_ESTADOS = ["", "asignada", "devuelta", "calificada", "aprobada", "auditada"]
+
+st.set_page_config(page_title="Comparativo de proyectos", page_icon="🌱", layout="wide")
+
+st.markdown("<h1 style='text-align:center; color:#1F9924'>Comparativo de proyectos</h1>", unsafe_allow_html=True)
+
+# ============ AGREGADOS ============
+inicio = time.perf_counter()
+hoy = datetime.now(timezone("America/Bogota")).date()
+
+roles, estados, categorias, versiones = [], [], [], []
+for seccion in resumenes.secciones():
+    version = resumenes.version_seccion(seccion)
+    try:
+        ag = resumenes.agregados(seccion, version, hoy)
+    except Exception as e:
+        # Una hoja caída no impide comparar las demás
+        st.warning(f"No se pudieron cargar los datos de {seccion.etiqueta}: {e}")
+        continue
+    roles.append(ag.roles.assign(Proyecto=seccion.etiqueta))
+    estados.append(ag.estados.assign(Proyecto=seccion.etiqueta))
+    categorias.append(ag.categorias.assign(Proyecto=seccion.etiqueta))
+    # Sin versión en alguna hoja (ni almacén ni servicio) vale el contenido de los agregados
+    versiones.append(f"{seccion.etiqueta}:{version if all(version.split('/')) else resumenes.huella(ag)}")
+
+if not roles:
+    st.stop()
+
+df_roles = pd.concat(roles, ignore_index=True)
+df_estados = pd.concat(estados, ignore_index=True)
+df_categorias = pd.concat(categorias, ignore_index=True)
+# Las figuras se reconstruyen solo si cambia alguna sección (o el día de corte)
+firma = figuras.vista("|".join(versiones), None, hoy)
+
+st.caption(f"Fecha de corte: {hoy} · Agregados listos en {(time.perf_counter() - inicio) * 1000:.0f} ms")
+
+# ============ AVANCE POR ROL ============
+st.subheader("Avance por rol")
+
+def grafico_avance():
+    fig = px.bar(
+        df_roles, x="ROL", y="% Avance", color="Proyecto", barmode="group",
+        text="% Avance", color_discrete_sequence=COLOR_PALETTE[2:],
+        hover_data={"Meta Proyectada a la Fecha": ":,.0f", "Carpetas Revisadas": ":,.0f"},
+    )
+    fig.add_hline(y=100, line_dash="dash", line_color="#1F9924")
+    fig.update_traces(texttemplate="%{text:.1f}%", textposition="outside")
+    fig.update_layout(height=420, yaxis_title="% de la meta a la fecha", xaxis_title="",
+                      plot_bgcolor="white", margin=dict(t=30, b=30, l=30, r=30))
+    return fig
+
+st.plotly_chart(figuras.figura("Comparativo/avance", firma, grafico_avance), use_container_width=True)
+
+st.dataframe(
+    df_roles.pivot_table(index="Proyecto", columns="ROL", values="% Avance", aggfunc="first", sort=False),
+    use_container_width=True,
+)
+
+# ============ CARPETAS POR ESTADO ============
+st.subheader("Carpetas por estado")
+df_estados["Estado"] = df_estados["estado_carpeta"].replace("", "por asignar")
+orden = [e or "por asignar" for e in ORDEN_ESTADOS]
+orden += sorted(set(df_estados["Estado"]) - set(orden))
+
+def grafico_estados():
+    fig = px.bar(
+        df_estados, y="Proyecto", x="cantidad", color="Estado", orientation="h",
+        category_orders={"Estado": orden}, color_discrete_sequence=COLOR_PALETTE[1:],
+    )
+    fig.update_layout(barmode="stack", height=360, xaxis_title="Carpetas", yaxis_title="",
+                      plot_bgcolor="white", margin=dict(t=30, b=30, l=30, r=30))
+    return fig
+
+st.plotly_chart(figuras.figura("Comparativo/estados", firma, grafico_estados), use_container_width=True)
+
+# ============ CATEGORÍAS ============
+if not df_categorias.empty:
+    st.subheader("Sujetos por categoría de atraso")
+    df_categorias["Sección"] = df_categorias["Proyecto"] + " · " + df_categorias["ROL"]
+
+    def grafico_categorias():
+        fig = px.bar(
+            df_categorias, y="Sección", x="sujetos", color="Categoria", orientation="h",
+            category_orders={"Categoria": resumenes.CATEGORIAS},
+            color_discrete_map=dict(zip(resumenes.CATEGORIAS, ["#1F9924", "#A1D99B", "#FDAE6B", "#E6550D"])),
+        )
+        fig.update_layout(barmode="stack", barnorm="percent", height=420, xaxis_title="% de sujetos",
+                          yaxis_title="", plot_bgcolor="white", margin=dict(t=30, b=30, l=30, r=30))
+        return fig
+
+    st.plotly_chart(figuras.figura("Comparativo/categorias", firma, grafico_categorias), use_container_width=True)
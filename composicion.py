@@ -0,0 +1,201 @@
+"""Composición de páginas: las piezas independientes se construyen a la vez.
+
+Una página registra sus figuras y tablas con `agregar` apenas tiene sus
+entradas; cada pieza se construye en un hilo del pool compartido del proceso y
+la página la recoge con `pagina[nombre]` en el orden del layout, de modo que lo
+que se emite en pantalla no cambia y la página tarda lo que su pieza más lenta,
+no la suma de todas. Lo que se solapa es lo que suelta el GIL: consultas de
+DuckDB, agregaciones de pandas/numpy y las esperas al pool o al servicio de
+datos; el armado de figuras en Python puro sigue siendo de a una.
+
+Los constructores no deben dibujar nada (sin st.*): solo devuelven la figura o
+el DataFrame. Si algo merece un aviso, lo devuelven junto al resultado en
+`ConAvisos` y la página lo muestra al recoger la pieza. Al final, `registrar()` deja los tiempos de cada pieza en el log
+y en st.session_state["tiempos_pagina"].
+
+Los datos también se piden por página: cada tablero declara qué hojas necesita
+cada página y las carga con `cargar_datos` después de dibujar lo que no depende
+de ellas (navegación, portada), con `marcador` en el lugar de lo que espera.
+
+Con `precargar`, una vez dibujada la página actual, las demás se preparan en
+un hilo de fondo (las más visitadas del proceso primero), así que el primer
+cambio de página encuentra sus datos ya en caché.
+
+Entre reruns, `memo` guarda en la sesión lo que el script calcula antes de la
+página (opciones de la barra lateral, categorías por sujeto) junto con sus
+dependencias declaradas, y solo lo recalcula cuando alguna cambia.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, NamedTuple
+
+import streamlit as st
+from streamlit.logger import get_logger
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+import proyectos
+
+_logger = get_logger(__name__)
+
+
+def hilos_pagina() -> int:
+    # HILOS_PAGINA=1 (o 0): construir en el hilo del script, una pieza tras otra.
+    # Por defecto un hilo por núcleo (hasta 4): con uno solo el pool no ganaría nada.
+    defecto = str(min(4, os.cpu_count() or 1))
+    return max(int(proyectos.leer_config("HILOS_PAGINA", defecto) or 0), 0)
+
+@st.cache_resource(show_spinner=False)
+def ejecutor(hilos: int) -> ThreadPoolExecutor:
+    # Un pool por proceso, compartido por todas las sesiones
+    return ThreadPoolExecutor(max_workers=hilos, thread_name_prefix="pagina")
+
+
+class ConAvisos(NamedTuple):
+    """Resultado de una pieza con los avisos que se muestran (st.warning) al recogerla."""
+    valor: Any
+    avisos: list[str] = []
+
+
+class Composicion:
+    """Piezas de una página: se construyen en el pool y se leen en el orden del layout."""
+
+    def __init__(self, pagina: str):
+        self.pagina = pagina
+        self.inicio = time.perf_counter()
+        self.tiempos: dict[str, float] = {}
+        self._piezas: dict[str, Future] = {}
+        hilos = hilos_pagina()
+        self._pool = ejecutor(hilos) if hilos > 1 else None
+        self._ctx = get_script_run_ctx()
+
+    def agregar(self, nombre: str, construir: Callable[[], Any]):
+        def tarea():
+            # El contexto de la sesión deja usar las cachés de Streamlit desde el hilo
+            if self._ctx is not None:
+                add_script_run_ctx(ctx=self._ctx)
+            t = time.perf_counter()
+            try:
+                return construir()
+            finally:
+                self.tiempos[nombre] = time.perf_counter() - t
+
+        if self._pool is None:
+            futuro = Future()
+            try:
+                futuro.set_result(tarea())
+            except Exception as e:
+                futuro.set_exception(e)
+        else:
+            futuro = self._pool.submit(tarea)
+        self._piezas[nombre] = futuro
+
+    def __getitem__(self, nombre: str) -> Any:
+        # Los errores y avisos de la pieza se levantan aquí, en el hilo del script
+        resultado = self._piezas[nombre].result()
+        if isinstance(resultado, ConAvisos):
+            for aviso in resultado.avisos:
+                st.warning(aviso)
+            return resultado.valor
+        return resultado
+
+    def registrar(self):
+        total = time.perf_counter() - self.inicio
+        st.session_state["tiempos_pagina"] = {"pagina": self.pagina, "total": total, **self.tiempos}
+        _logger.debug(
+            "Página %s: %.0f ms (suma de piezas %.0f ms) — %s",
+            self.pagina, total * 1000, sum(self.tiempos.values()) * 1000,
+            ", ".join(f"{n} {s * 1000:.0f} ms" for n, s in self.tiempos.items()),
+        )
+
+
+# ============ DEPENDENCIAS ENTRE RERUNS ============
+
+def memo(nombre: str, dependencias: list, calcular: Callable[[], Any]) -> Any:
+    """`calcular()` para esta sesión; se repite solo si cambian sus `dependencias`.
+
+    Las dependencias son valores pequeños y serializables (versiones de datos,
+    filtros, fechas), no DataFrames: compararlas no cuesta nada.
+    """
+    firma = hashlib.sha1(json.dumps(dependencias, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    memos = st.session_state.setdefault("_memos", {})
+    previo = memos.get(nombre)
+    if previo is not None and previo[0] == firma:
+        return previo[1]
+    valor = calcular()
+    memos[nombre] = (firma, valor)
+    return valor
+
+
+# ============ DATOS POR PÁGINA ============
+
+def marcador(texto: str):
+    """Aviso en el lugar de una sección que espera sus datos; `.empty()` lo retira."""
+    lugar = st.empty()
+    lugar.caption(f"⏳ {texto}")
+    return lugar
+
+def cargar_datos(fuentes: dict[str, Callable[[], Any]]) -> dict[str, Any]:
+    """Las fuentes que declara una página, cargadas a la vez en el pool de páginas."""
+    carga = Composicion("datos")
+    for nombre, cargar in fuentes.items():
+        carga.agregar(nombre, cargar)
+    return {nombre: carga[nombre] for nombre in fuentes}
+
+
+# ============ PRECARGA EN SEGUNDO PLANO ============
+
+class _Precargas:
+    """Visitas por página y precarga en curso de un tablero, compartidas por el proceso."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.visitas: Counter = Counter()
+        self.en_curso: Future | None = None
+
+@st.cache_resource(show_spinner=False)
+def _precargas(tablero: str) -> _Precargas:
+    return _Precargas()
+
+@st.cache_resource(show_spinner=False)
+def _hilo_precarga() -> ThreadPoolExecutor:
+    # Un solo hilo: la precarga no compite por el pool de las páginas que se están dibujando
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="precarga")
+
+def precargar(tablero: str, actual: str, cargas: dict[str, Callable[[], Any]]):
+    """Cuenta la visita a `actual` y carga las demás páginas de `cargas` en segundo plano.
+
+    Se llama al final del script, con la página ya dibujada. Cada carga debe
+    dejar su resultado en las cachés de Streamlit (sin st.* que dibuje). El hilo
+    no lleva el contexto de la sesión: esa ejecución ya terminó, así que un st.*
+    que se cuele no llega a ninguna página. Solo se lanza cuando la sesión
+    cambia de página y no hay otra precarga en curso.
+    """
+    estado = _precargas(tablero)
+    clave = f"_precarga_{tablero}"
+    if st.session_state.get(clave) == actual:
+        return
+    st.session_state[clave] = actual
+
+    with estado.lock:
+        estado.visitas[actual] += 1
+        if estado.en_curso is not None and not estado.en_curso.done():
+            return
+        # Las más visitadas primero; a igual número, en el orden declarado
+        orden = sorted((p for p in cargas if p != actual), key=lambda p: -estado.visitas[p])
+
+        def tarea():
+            for pagina in orden:
+                t = time.perf_counter()
+                try:
+                    cargas[pagina]()
+                except Exception:
+                    _logger.warning("Precarga de %s/%s fallida", tablero, pagina, exc_info=True)
+                else:
+                    _logger.debug("Precarga de %s/%s: %.0f ms", tablero, pagina, (time.perf_counter() - t) * 1000)
+
+        estado.en_curso = _hilo_precarga().submit(tarea)
@@ -0,0 +1,369 @@
+"""Filtros, conteos y pivotes de carpetas con el motor de datos elegido.
+
+MOTOR_DATOS (variable de entorno o st.secrets) elige "pandas" (por defecto),
+"duckdb" o "polars" para todos los tableros del proceso; solo se importa el
+motor elegido. Las reglas de cada proyecto (columnas de sujeto, estados que
+cuentan, etiquetas de estado) llegan con su `Proyecto` (ver proyectos.py), así
+que un arreglo aquí vale para VA, DIAN e INPEC.
+
+Los conteos de la vista se pueden resolver fuera del proceso, en el servicio
+de datos (SERVICIO_DATOS) o en el pool de procesos (PROCESOS_AGREGACION), si
+quien llama pasa la `Base` de la vista y los filtros que la produjeron.
+"""
+import os
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import agregaciones
+import almacen
+import proyectos
+import servicio
+
+MOTORES = ["pandas", "duckdb", "polars"]
+ESTADOS_ORDEN = ["asignada", "devuelta", "calificada", "aprobada", "auditada"]
+
+# ============ CONFIGURACIÓN ============
+
+duckdb = pl = None
+
+def usar_motor(nombre: str) -> str:
+    """Activa el motor `nombre` (importándolo si hace falta) y devuelve el activo: pandas si no está instalado."""
+    global MOTOR_DATOS, duckdb, pl
+    MOTOR_DATOS = "pandas"
+    try:
+        if nombre == "duckdb":
+            import duckdb
+            MOTOR_DATOS = nombre
+        elif nombre == "polars":
+            import polars as pl
+            MOTOR_DATOS = nombre
+    except ImportError:
+        pass
+    return MOTOR_DATOS
+
+# Los tableros avisan si el pedido no quedó activo (¿paquete sin instalar?)
+MOTOR_PEDIDO = proyectos.leer_config("MOTOR_DATOS", "pandas").lower()
+MOTOR_DATOS = usar_motor(MOTOR_PEDIDO)
+
+# Procesos para agregaciones pesadas fuera del proceso de Streamlit (0 = desactivado)
+try:
+    PROCESOS_AGREGACION = max(int(proyectos.leer_config("PROCESOS_AGREGACION", "0") or 0), 0)
+except ValueError:
+    PROCESOS_AGREGACION = 0
+
+
+# ============ DUCKDB ============
+
+@st.cache_resource
+def conexion_duckdb():
+    # Base en memoria compartida por todas las sesiones del proceso
+    return duckdb.connect(database=":memory:")
+
+def consulta_duckdb(sql: str, params: list | None = None, **tablas: pd.DataFrame) -> pd.DataFrame:
+    # Un cursor por llamada: las tablas registradas son locales y seguras entre hilos
+    cur = conexion_duckdb().cursor()
+    try:
+        for nombre, tabla in tablas.items():
+            cur.register(nombre, tabla)
+        return cur.execute(sql, params or []).df()
+    finally:
+        cur.close()
+
+
+# ============ CONTEOS FUERA DEL PROCESO ============
+
+class Base(NamedTuple):
+    """Carpetas sin filtrar de una vista y su hoja en almacen.FUENTES."""
+    fuente: str
+    df: pd.DataFrame
+
+@st.cache_resource(ttl=600, show_spinner=False)
+def dataset_compartido(fuente: str, version: str, _df: pd.DataFrame) -> agregaciones.RefDataset:
+    # Con almacén compartido el pool lee los conteos precalculados de esa versión
+    directorio = proyectos.dir_datos()
+    if directorio and os.path.exists(almacen.ruta(directorio, f"{fuente}.conteos", version)):
+        return agregaciones.referencia_archivo(almacen.ruta(directorio, f"{fuente}.conteos", version), version)
+    # Si no, una publicación por fuente y versión de datos; al publicar otra se libera la anterior
+    return agregaciones.publicar(fuente, version, _df)
+
+def conteo_externo(base: Base | None, filtros: dict | None, claves: list[str]) -> pd.DataFrame | None:
+    """Conteos por `claves` de la base filtrada, resueltos fuera de este proceso:
+    en el servicio de datos (SERVICIO_DATOS) o en el pool de procesos (PROCESOS_AGREGACION).
+
+    Devuelve None si ninguno está activo, si no se conocen la base o los
+    filtros que produjeron el DataFrame de la vista, o si la tabla de fuera no
+    tiene alguna columna de la consulta (hay que calcular en local).
+    """
+    if base is None or filtros is None or not set(claves).issubset(base.df.columns):
+        return None
+    # Como filtrar_carpetas: los filtros de columnas que la base no tiene no aplican
+    filtros = {c: v for c, v in filtros.items() if c == "categoria" or c in base.df.columns}
+    categoria = filtros.pop("categoria", None)
+
+    url = proyectos.servicio_datos()
+    if url:
+        try:
+            return servicio.conteo(url, base.fuente, filtros, claves, categoria)
+        except OSError:
+            pass  # Servicio caído o sin las columnas de la consulta: se sigue con el pool o en local
+
+    if PROCESOS_AGREGACION <= 0:
+        return None
+    ref = dataset_compartido(base.fuente, proyectos.version_datos(base.df), base.df)
+    try:
+        return agregaciones.conteo(ref, filtros, claves, categoria, procesos=PROCESOS_AGREGACION)
+    except agregaciones.ColumnasAusentes:
+        return None
+
+def conteos_equipo_externo(base: Base | None, filtros: dict | None, col: str) -> pd.DataFrame | None:
+    """Conteos por EQUIPO_NUM, `col` y estado con el mismo recorte que la base de la vista Equipos."""
+    conteos = conteo_externo(base, filtros, ["EQUIPO", col, "estado_carpeta"])
+    if conteos is None:
+        return None
+    conteos = conteos[~conteos["estado_carpeta"].isin(["", "por asignar"])].copy()
+    conteos["EQUIPO_NUM"] = pd.to_numeric(conteos["EQUIPO"], errors="coerce")
+    return conteos.dropna(subset=["EQUIPO_NUM"]).astype({"EQUIPO_NUM": int})
+
+
+# ============ FILTROS Y CONTEOS ============
+
+def filtrar_carpetas(df_in: pd.DataFrame, filtros: dict) -> pd.DataFrame:
+    """Aplica filtros {columna: valor}; "Todos" no filtra y el estado se compara sin mayúsculas."""
+    activos = {c: v for c, v in filtros.items() if v != "Todos" and c in df_in.columns}
+    if not activos:
+        return df_in
+
+    if MOTOR_DATOS == "duckdb":
+        condiciones = [
+            f'lower("{c}") = lower(?)' if c == "estado_carpeta" else f'"{c}" = ?'
+            for c in activos
+        ]
+        sql = f"SELECT * FROM carpetas WHERE {' AND '.join(condiciones)}"
+        return consulta_duckdb(sql, list(activos.values()), carpetas=df_in)
+
+    out = df_in
+    for c, v in activos.items():
+        if c == "estado_carpeta":
+            out = out[out[c].str.lower() == v.lower()]
+        else:
+            out = out[out[c] == v]
+    return out
+
+def conteo_estados(df_mod: pd.DataFrame) -> pd.Series:
+    """Cantidad de carpetas por estado (en minúsculas, vacío incluido), de mayor a menor.
+
+    Como en contar_valores, los empates quedan en orden de aparición.
+    """
+    if "estado_carpeta" not in df_mod.columns:
+        return pd.Series(dtype="int64", name="cantidad").rename_axis("estado_carpeta")
+
+    if MOTOR_DATOS == "duckdb":
+        res = consulta_duckdb(
+            "SELECT lower(coalesce(estado_carpeta, '')) AS estado_carpeta, count(*) AS cantidad "
+            "FROM carpetas GROUP BY 1 ORDER BY 2 DESC, min(_fila)",
+            carpetas=df_mod[["estado_carpeta"]].assign(_fila=np.arange(len(df_mod))),
+        )
+        return res.set_index("estado_carpeta")["cantidad"]
+
+    if MOTOR_DATOS == "polars":
+        res = (
+            pl.from_pandas(df_mod[["estado_carpeta"]]).lazy()
+            .select(pl.col("estado_carpeta").fill_null("").str.to_lowercase())
+            .group_by("estado_carpeta", maintain_order=True)
+            .agg(pl.len().cast(pl.Int64).alias("cantidad"))
+            .sort("cantidad", descending=True, maintain_order=True)
+            .collect()
+        )
+        return pd.Series(res["cantidad"].to_list(), index=pd.Index(res["estado_carpeta"].to_list(), name="estado_carpeta"),
+                         dtype="int64", name="cantidad")
+
+    return df_mod["estado_carpeta"].fillna("").str.lower().value_counts().rename("cantidad")
+
+def pivot_estados(df_mod: pd.DataFrame, col: str, filtros: dict | None = None,
+                  base: Base | None = None) -> pd.DataFrame:
+    """Carpetas por sujeto y estado: columnas [col] + ESTADOS_ORDEN."""
+    conteos = conteo_externo(base, filtros, [col, "estado_carpeta"])
+    if conteos is not None:
+        pivot = (
+            conteos.pivot_table(index=col, columns="estado_carpeta", values="cantidad", aggfunc="sum", fill_value=0)
+            .reindex(columns=ESTADOS_ORDEN, fill_value=0)
+            .reset_index()
+        )
+        pivot.columns.name = "estado_carpeta"
+        return pivot
+
+    if MOTOR_DATOS == "duckdb":
+        conteos = ", ".join(
+            f"count(*) FILTER (WHERE lower(trim(estado_carpeta)) = '{e}') AS \"{e}\""
+            for e in ESTADOS_ORDEN
+        )
+        sql = (
+            f'SELECT "{col}", {conteos} FROM carpetas '
+            f'WHERE "{col}" IS NOT NULL AND estado_carpeta IS NOT NULL '
+            f"GROUP BY 1 ORDER BY 1"
+        )
+        pivot = consulta_duckdb(sql, carpetas=df_mod[[col, "estado_carpeta"]])
+        # Sin filas DuckDB no conoce el tipo del sujeto: se conserva el de la tabla
+        pivot = pivot.astype({col: df_mod[col].dtype})
+        pivot.columns.name = "estado_carpeta"
+        return pivot
+
+    if MOTOR_DATOS == "polars":
+        estado = pl.col("estado_carpeta").str.strip_chars().str.to_lowercase()
+        pivot = (
+            pl.from_pandas(df_mod[[col, "estado_carpeta"]]).lazy()
+            .filter(pl.col(col).is_not_null() & pl.col("estado_carpeta").is_not_null())
+            .group_by(col)
+            .agg([(estado == e).sum().cast(pl.Int64).alias(e) for e in ESTADOS_ORDEN])
+            .sort(col)
+            .collect()
+            .to_pandas()
+        )
+        pivot.columns.name = "estado_carpeta"
+        return pivot
+
+    df_mod = df_mod.dropna(subset=["estado_carpeta", col])
+    pivot = (
+        df_mod
+        .assign(estado_carpeta=df_mod["estado_carpeta"].str.strip().str.lower())
+        .groupby([col, "estado_carpeta"])
+        .size()
+        .unstack(fill_value=0)
+        .reset_index()
+    )
+
+    for estado in ESTADOS_ORDEN:
+        if estado not in pivot.columns:
+            pivot[estado] = 0
+
+    return pivot[[col] + ESTADOS_ORDEN]
+
+def conteo_estado_analistas(proyecto: proyectos.Proyecto, df: pd.DataFrame, filtros: dict | None = None,
+                            base: Base | None = None) -> pd.DataFrame:
+    """Carpetas por EQUIPO_NUM, analista (A1, A2... dentro del equipo) y estado con las etiquetas del proyecto."""
+    indice = ["EQUIPO_NUM", "analista", "equipo_rol"]
+    etiquetas_estado = proyecto.etiquetas_estado
+
+    conteos = conteos_equipo_externo(base, filtros, "analista")
+    if conteos is not None:
+        df = conteos
+
+    elif MOTOR_DATOS == "polars":
+        base_pl = pl.from_pandas(df[["EQUIPO_NUM", "analista", "estado_carpeta"]]).lazy()
+        roles = (
+            base_pl.select("EQUIPO_NUM", "analista")
+            .drop_nulls()
+            .unique()
+            .sort(["EQUIPO_NUM", "analista"])
+            .with_columns(
+                pl.concat_str([
+                    pl.col("EQUIPO_NUM").cast(pl.Utf8),
+                    pl.lit(" A"),
+                    (pl.int_range(pl.len()).over("EQUIPO_NUM") + 1).cast(pl.Utf8),
+                ]).alias("equipo_rol")
+            )
+        )
+        # Se agrupa antes de unir los roles: el join opera sobre conteos, no sobre filas
+        estado_homol = (
+            pl.col("estado_carpeta").str.to_lowercase()
+            .replace_strict(etiquetas_estado, default="Otro", return_dtype=pl.Utf8)
+            .fill_null("Otro")
+        )
+        etiquetas = sorted(set(etiquetas_estado.values()) | {"Otro"})
+        pivot = (
+            base_pl.with_columns(estado_homol.alias("estado_homol"))
+            .group_by(["EQUIPO_NUM", "analista", "estado_homol"])
+            .agg(pl.len().alias("cantidad"))
+            .join(roles, on=["EQUIPO_NUM", "analista"], how="inner")
+            .group_by(indice)
+            .agg([
+                pl.col("cantidad").filter(pl.col("estado_homol") == e).sum().cast(pl.Int64).alias(e)
+                for e in etiquetas
+            ])
+            .sort(indice)
+            .collect()
+            .to_pandas()
+        )
+        # Igual que pivot_table: solo los estados presentes
+        pivot = pivot[indice + [e for e in etiquetas if pivot[e].sum() > 0]]
+        pivot.columns.name = "estado_homol"
+        return pivot
+
+    # Asignar rol por analista en equipo
+    analistas_unicos = (
+        df[["EQUIPO_NUM", "analista"]]
+        .dropna()
+        .drop_duplicates()
+        .sort_values(["EQUIPO_NUM", "analista"])
+    )
+    analistas_unicos["rol"] = analistas_unicos.groupby("EQUIPO_NUM").cumcount() + 1
+    analistas_unicos["rol"] = "A" + analistas_unicos["rol"].astype(str)
+
+    # Merge para agregar rol
+    df = df.merge(analistas_unicos, on=["EQUIPO_NUM", "analista"], how="left")
+    df["equipo_rol"] = df["EQUIPO_NUM"].astype(str) + " " + df["rol"]
+
+    # Homologar estados
+    df["estado_homol"] = df["estado_carpeta"].str.lower().map(etiquetas_estado).fillna("Otro")
+
+    # Agrupar (sumando si ya vienen conteos del pool)
+    agrupado = df.groupby(["EQUIPO_NUM", "analista", "equipo_rol", "estado_homol"])
+    grouped = (
+        agrupado["cantidad"].sum() if "cantidad" in df.columns else agrupado.size()
+    ).reset_index(name="cantidad")
+
+    # Pivotar para formato de gráfico
+    return grouped.pivot_table(
+        index=indice,
+        columns="estado_homol",
+        values="cantidad",
+        aggfunc="sum",
+        fill_value=0
+    ).reset_index()
+
+def desarrolladas_por_sujeto(proyecto: proyectos.Proyecto, df_mod: pd.DataFrame, modulo: str) -> pd.DataFrame:
+    """Carpetas en un estado que cuenta para el módulo, por sujeto: [col, "desarrolladas"]."""
+    col = proyectos.sujetos_col(proyecto, modulo)
+    validos = proyectos.estados_validos(proyecto, modulo)
+
+    if MOTOR_DATOS == "polars":
+        return (
+            pl.from_pandas(df_mod[[col, "estado_carpeta"]]).lazy()
+            .filter(pl.col("estado_carpeta").str.to_lowercase().is_in(validos))
+            .group_by(col)
+            .agg(pl.len().cast(pl.Int64).alias("desarrolladas"))
+            .sort(col, nulls_last=True)
+            .collect()
+            .to_pandas()
+        )
+
+    df_ok = df_mod[df_mod["estado_carpeta"].str.lower().isin(validos)]
+    g = df_ok.groupby(col, dropna=False).size().reset_index(name="desarrolladas")
+    return g
+
+def contar_valores(df: pd.DataFrame, columna: str) -> pd.DataFrame:
+    """Equivalente a value_counts(): [columna, "cantidad"] de mayor a menor; los empates, en orden de aparición."""
+    if MOTOR_DATOS == "polars":
+        return (
+            pl.from_pandas(df[[columna]]).lazy()
+            .drop_nulls(columna)
+            .group_by(columna, maintain_order=True)
+            .agg(pl.len().cast(pl.Int64).alias("cantidad"))
+            .sort("cantidad", descending=True, maintain_order=True)
+            .collect()
+            .to_pandas()
+        )
+
+    if MOTOR_DATOS == "duckdb":
+        return consulta_duckdb(
+            f'SELECT "{columna}", count(*) AS cantidad FROM datos '
+            f'WHERE "{columna}" IS NOT NULL GROUP BY 1 ORDER BY 2 DESC, min(_fila)',
+            datos=df[[columna]].assign(_fila=np.arange(len(df))),
+        )
+
+    conteo = df[columna].value_counts().reset_index()
+    conteo.columns = [columna, "cantidad"]
+    return conteo
@@ -0,0 +1,189 @@
+"""Caché de figuras Plotly compartida por todas las sesiones del proceso.
+
+Cada figura se guarda ya serializada (JSON listo para enviar) bajo su nombre y
+la firma de la vista: versión de datos, filtros normalizados y fecha de corte.
+Si otra sesión, o la misma tras cambiar de página, pide la misma vista, la
+figura se rearma desde el JSON sin validarla de nuevo y no se repiten ni las
+agregaciones de pandas ni la construcción con Plotly. La caché tiene tope de
+figuras y de tamaño total; al pasarse se descartan las usadas hace más tiempo.
+
+También reúne lo que comparten las figuras de los tableros: medir su tamaño
+serializado, acotar los ejes con muchas categorías (top-N más "Otros") y
+cargar plotly.express y la plantilla recién al construir la primera figura.
+"""
+import hashlib
+import importlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Callable
+
+import pandas as pd
+import streamlit as st
+from streamlit.logger import get_logger
+
+MAX_FIGURAS = 256
+MAX_BYTES_FIGURAS = 64 * 1024 * 1024
+
+
+class CacheFiguras:
+    """LRU de especificaciones JSON con tope de entradas y de bytes."""
+
+    def __init__(self, maximo: int = MAX_FIGURAS, max_bytes: int = MAX_BYTES_FIGURAS):
+        self.maximo = maximo
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._specs: "OrderedDict[tuple[str, str], str]" = OrderedDict()
+        self._bytes = 0
+
+    def obtener(self, clave: tuple[str, str]) -> str | None:
+        with self._lock:
+            spec = self._specs.get(clave)
+            if spec is not None:
+                self._specs.move_to_end(clave)
+            return spec
+
+    def guardar(self, clave: tuple[str, str], spec: str):
+        with self._lock:
+            anterior = self._specs.pop(clave, None)
+            if anterior is not None:
+                self._bytes -= len(anterior)
+            self._specs[clave] = spec
+            self._bytes += len(spec)
+            while self._specs and (len(self._specs) > self.maximo or self._bytes > self.max_bytes):
+                _, viejo = self._specs.popitem(last=False)
+                self._bytes -= len(viejo)
+
+    def limpiar(self):
+        with self._lock:
+            self._specs.clear()
+            self._bytes = 0
+
+
+@st.cache_resource(show_spinner=False)
+def cache() -> CacheFiguras:
+    return CacheFiguras()
+
+
+# ============ CARGA PEREZOSA ============
+# plotly (express, graph_objects, io y las plantillas) tarda en cargarse y la portada o el acceso
+# no dibujan gráficos: se cargan con la primera figura que se construye
+
+_plantilla: str | None = None
+
+class Perezoso:
+    """Un módulo que se importa la primera vez que se usa uno de sus atributos."""
+
+    def __init__(self, nombre: str):
+        self._nombre = nombre
+
+    def __getattr__(self, atributo: str):
+        return getattr(importlib.import_module(self._nombre), atributo)
+
+go = Perezoso("plotly.graph_objects")
+pio = Perezoso("plotly.io")
+
+def plantilla(nombre: str):
+    """Plantilla por defecto de las figuras; se aplica antes de construir la primera."""
+    global _plantilla
+    _plantilla = nombre
+
+def _aplicar_plantilla():
+    if _plantilla and pio.templates.default != _plantilla:
+        pio.templates.default = _plantilla
+
+
+# ============ MEDICIÓN ============
+# Cada medidor recibe (nombre, bytes del JSON) de cada figura servida con `figura`
+
+_medidores: list[Callable[[str, int], None]] = []
+_logger = get_logger(__name__)
+
+def registrar_medidor(medidor: Callable[[str, int], None]):
+    if medidor not in _medidores:
+        _medidores.append(medidor)
+
+def log_tamano(nombre: str, tamano: int):
+    _logger.info("Figura %s: %.1f KB serializada", nombre, tamano / 1024)
+
+def _medir(nombre: str, spec: str):
+    for medidor in _medidores:
+        medidor(nombre, len(spec))
+
+
+# ============ TOP-N ============
+# Ejes con muchas categorías: se dibujan las `n` mayores y el resto va en una
+# sola marca "Otros (k)"; las k agrupadas se consultan aparte (detalle_otros)
+
+MAX_CATEGORIAS = 12
+
+def plegar(conteo: pd.DataFrame, columna: str, n: int = MAX_CATEGORIAS,
+           valores: str = "cantidad") -> tuple[pd.DataFrame, int]:
+    """Las `n` filas con más `valores` y una fila "Otros (k)" con la suma de las k restantes."""
+    conteo = conteo.sort_values(valores, ascending=False, kind="stable")
+    if len(conteo) <= n + 1:
+        return conteo.reset_index(drop=True), 0
+    resto = conteo.iloc[n:]
+    otros = pd.DataFrame({columna: [f"Otros ({len(resto)})"], valores: [resto[valores].sum()]})
+    return pd.concat([conteo.iloc[:n], otros], ignore_index=True), len(resto)
+
+def resto(conteo: pd.DataFrame, n: int = MAX_CATEGORIAS, valores: str = "cantidad") -> pd.DataFrame:
+    """Las filas que `plegar` agrupa en "Otros", de mayor a menor."""
+    return conteo.sort_values(valores, ascending=False, kind="stable").iloc[n:].reset_index(drop=True)
+
+def plegadas(fig: "go.Figure | None") -> int:
+    """Categorías que `fig` agrupó en "Otros" (las figuras las anotan en layout.meta)."""
+    meta = fig.layout.meta if fig is not None else None
+    return int(meta.get("plegadas", 0)) if isinstance(meta, dict) else 0
+
+@st.fragment
+def detalle_otros(fig: "go.Figure | None", clave: str, cargar: Callable[[], pd.DataFrame]):
+    """Si `fig` agrupó categorías, un interruptor que trae esas categorías solo al activarlo.
+
+    Es un fragmento: el interruptor vuelve a ejecutar solo este bloque, no la página.
+    """
+    k = plegadas(fig)
+    if k and st.toggle(f"Ver las {k} categorías agrupadas en «Otros»", key=clave):
+        st.dataframe(cargar(), use_container_width=True, hide_index=True)
+
+
+def vista(version: str, filtros: dict | None, corte) -> str | None:
+    """Firma de una vista: versión de datos, filtros activos y fecha de corte.
+
+    Los filtros en "Todos" o None no cuentan, así que dos formas de pedir la
+    misma vista comparten figura ("" sí cuenta: es el estado por asignar). Sin versión de datos devuelve None (no se cachea).
+    """
+    if not version:
+        return None
+    activos = {k: v for k, v in (filtros or {}).items() if v is not None and v != "Todos"}
+    texto = json.dumps([version, activos, str(corte)], sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha1(texto.encode("utf-8")).hexdigest()
+
+
+def figura(nombre: str, firma: str | None, construir: Callable[[], "go.Figure | None"]) -> "go.Figure | None":
+    """La figura `nombre` de la vista `firma`, desde la caché o recién construida con `construir()`.
+
+    Solo se guardan figuras: si `construir()` devuelve None (sin datos para
+    graficar) o una pieza con avisos (composicion.ConAvisos), se devuelve tal cual.
+    """
+    if firma is None:
+        _aplicar_plantilla()
+        fig = construir()
+        if isinstance(fig, go.Figure) and _medidores:
+            _medir(nombre, pio.to_json(fig, validate=False))
+        return fig
+
+    clave = (nombre, firma)
+    spec = cache().obtener(clave)
+    if spec is not None:
+        _medir(nombre, spec)
+        # Ya se validó al construirla la primera vez
+        return go.Figure(json.loads(spec), _validate=False)
+
+    _aplicar_plantilla()
+    fig = construir()
+    if isinstance(fig, go.Figure):
+        spec = pio.to_json(fig, validate=False)
+        cache().guardar(clave, spec)
+        _medir(nombre, spec)
+    return fig
@@ -0,0 +1,455 @@
+"""Proyectos que sirve el motor de tableros y la carga de datos que comparten.
+
+Cada proyecto declara aquí sus hojas, columnas de sujeto por módulo, estados
+que cuentan como desarrollados, umbrales de categoría y fórmula de meta. Los
+tableros leen esta configuración en lugar de repetir constantes. Como las
+funciones de carga viven en este módulo, sus cachés son las mismas para todas
+las páginas del proceso (`streamlit run tableros.py`). Los proyectos con varias
+convocatorias las cargan aparte, cada una en su propia partición.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, timedelta
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from streamlit.logger import get_logger
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+import almacen
+import servicio
+
+_logger = get_logger(__name__)
+
+
+class Convocatoria(NamedTuple):
+    clave: str
+    titulo: str
+    fuentes: dict[str, str]              # Hoja -> nombre en almacen.FUENTES
+    inicio: date                         # Inicio del conteo de días hábiles de la meta
+
+
+class Proyecto(NamedTuple):
+    clave: str
+    titulo: str
+    script: str                          # Página de Streamlit que lo dibuja (ruta desde la raíz)
+    fuentes: dict[str, str]              # Hoja del proyecto -> nombre en almacen.FUENTES
+    sujetos: dict[str, str] = {}         # Módulo -> columna de sujeto
+    estados_validos: dict[str, list[str]] = {}
+    umbrales: dict[str, tuple[int, int]] = {}  # Módulo -> (máx. atraso normal, máx. atraso medio)
+    etiquetas_estado: dict[str, str] = {}  # estado_carpeta en minúsculas -> etiqueta en gráficos y tablas
+    meta: dict = {}                      # {"tipo": "hoja_metas"} o {"tipo": "dias_habiles", ...}
+    convocatorias: dict[str, Convocatoria] = {}  # Si las hay, cada una trae sus hojas (ver cargar_convocatoria)
+    portada: str = ""                    # Título de la portada, si no es el del proyecto o su convocatoria
+
+
+SUJETOS_VA = {"Analistas": "analista", "Supervisores": "supervisor", "Equipos": "auditor"}
+ESTADOS_VALIDOS_VA = {
+    "Analistas": ["auditada", "aprobada", "calificada"],
+    "Supervisores": ["auditada", "aprobada"],
+    "Equipos": ["auditada"],
+}
+# Supervisores: <0 Al día; 0-68 normal; 69-101 medio; >101 alto
+# Analistas y Equipos: <0 Al día; 0-10 normal; 11-34 medio; >34 alto
+UMBRALES_VA = {"Analistas": (10, 34), "Supervisores": (68, 101), "Equipos": (10, 34)}
+ETIQUETAS_ESTADO_VA = {
+    "asignada": "Asignada",
+    "devuelta": "Devuelta",
+    "calificada": "Calificada",
+    "aprobada": "Aprobada",
+    "auditada": "Auditada"
+}
+# DIAN numera los estados para que las leyendas queden en el orden del proceso
+ETIQUETAS_ESTADO_DIAN = {
+    "": "Por asignar",
+    "asignada": "0. asignada",
+    "devuelta": "1. devuelta",
+    "calificada": "2. calificada",
+    "aprobada": "3. aprobada",
+    "auditada": "4. auditada"
+}
+
+PROYECTOS = {
+    "va": Proyecto(
+        clave="va",
+        titulo="VA",
+        script="app.py",
+        fuentes={"carpetas": "carpetas", "metas": "metas"},
+        sujetos=SUJETOS_VA,
+        estados_validos=ESTADOS_VALIDOS_VA,
+        umbrales=UMBRALES_VA,
+        etiquetas_estado=ETIQUETAS_ESTADO_VA,
+        meta={"tipo": "hoja_metas"},
+        portada="VA DIAN 2667",
+    ),
+    "dian": Proyecto(
+        clave="dian",
+        titulo="VA DIAN 2667",
+        script="DIAN_VA/app.py",
+        fuentes={},
+        sujetos=SUJETOS_VA,
+        estados_validos=ESTADOS_VALIDOS_VA,
+        umbrales=UMBRALES_VA,
+        etiquetas_estado=ETIQUETAS_ESTADO_DIAN,
+        meta={
+            "tipo": "dias_habiles",
+            # Carpetas por día hábil: meta de cada sujeto (tablas y categorías)...
+            "diaria_sujeto": {"Analistas": 17, "Supervisores": 34, "Equipos": 17},
+            # ...y la que se multiplica por los sujetos presentes en la meta del módulo
+            "diaria_modulo": {"Analistas": 17, "Supervisores": 34, "Equipos": 34},
+        },
+        # Una convocatoria nueva solo necesita su fuente en almacen.FUENTES y una entrada aquí
+        convocatorias={
+            "2667": Convocatoria("2667", "VA DIAN 2667", {"carpetas": "carpetas"}, date(2025, 9, 16)),
+        },
+    ),
+    "inpec": Proyecto(
+        clave="inpec",
+        titulo="INPEC",
+        script="INPEC/dashborad.py",
+        fuentes={
+            "Cronograma": "inpec_cronograma",
+            "Entregables": "inpec_entregables",
+            "VRM": "inpec_vrm",
+            "Reclamaciones": "inpec_reclamaciones",
+            "metas": "inpec_metas",
+            "metas_rec": "inpec_metas_rec",
+        },
+        meta={"tipo": "hoja_metas"},
+    ),
+}
+
+
+# ============ REGLAS POR PROYECTO ============
+
+def sujetos_col(proyecto: Proyecto, modulo: str) -> str:
+    return proyecto.sujetos[modulo]
+
+def estados_validos(proyecto: Proyecto, modulo: str) -> list[str]:
+    return proyecto.estados_validos.get(modulo, ["auditada"])
+
+def clasifica_categoria(proyecto: Proyecto, atraso: int, modulo: str) -> str:
+    normal, medio = proyecto.umbrales[modulo]
+    if atraso < 0:
+        return "Al día"
+    elif atraso <= normal:
+        return "Atraso normal"
+    elif atraso <= medio:
+        return "Atraso medio"
+    else:
+        return "Atraso alto"
+
+
+# ============ METAS Y AVANCE POR ROL ============
+# Reglas que comparten los tableros y los agregados de resumenes.py
+
+# Estados de carpeta que cuentan como revisadas para cada rol
+CONDICIONES_ROL = {
+    "Análisis": ["calificada", "aprobada", "auditada"],
+    "Supervisión": ["aprobada", "auditada"],
+    "Auditoria": ["auditada"]
+}
+MODULO_POR_ROL = {"Análisis": "Analistas", "Supervisión": "Supervisores", "Auditoria": "Equipos"}
+ROL_POR_MODULO = {modulo: rol for rol, modulo in MODULO_POR_ROL.items()}
+
+def dias_habiles(inicio: date, fin: date) -> int:
+    """Días hábiles (L-V) entre inicio y fin (inclusive)."""
+    if fin < inicio:
+        return 0
+    return len(pd.bdate_range(inicio, fin))
+
+def resumen_por_rol(por_estado: pd.Series, metas_rol: pd.DataFrame) -> pd.DataFrame:
+    """Avance por rol a partir de los conteos por estado_carpeta y las metas del día.
+
+    `metas_rol` trae las columnas ROL y "Meta Proyectada a la Fecha".
+    """
+    resultados = []
+    for rol, estados in CONDICIONES_ROL.items():
+        revisadas = int(por_estado.reindex(estados, fill_value=0).sum())
+        resultados.append({"ROL": rol, "Carpetas Revisadas": revisadas})
+
+    df_revisadas = pd.DataFrame(resultados)
+
+    resumen = pd.merge(metas_rol, df_revisadas, on="ROL", how="outer").fillna(0)
+
+    resumen["Meta Proyectada a la Fecha"] = pd.to_numeric(resumen["Meta Proyectada a la Fecha"], errors="coerce").fillna(0)
+    resumen["Carpetas Revisadas"] = pd.to_numeric(resumen["Carpetas Revisadas"], errors="coerce").fillna(0)
+
+    resumen["% Avance"] = np.where(
+        resumen["Meta Proyectada a la Fecha"] == 0,
+        0,
+        (resumen["Carpetas Revisadas"] / resumen["Meta Proyectada a la Fecha"] * 100).round(2)
+    )
+
+    return resumen
+
+# --- VA: hoja de metas con fecha de corte (la última que no sea futura) ---
+def fecha_corte_metas(archivo_metas: pd.DataFrame, hoy: date) -> date | None:
+    fechas = pd.to_datetime(archivo_metas["FECHA"], errors="coerce").dt.date
+    validas = fechas[fechas <= hoy]
+    if validas.empty:
+        return None  # No hay datos válidos
+    return validas.max()  # La última disponible
+
+def metas_dia_va(archivo_metas: pd.DataFrame, hoy: date) -> pd.DataFrame:
+    """Filas de la hoja de metas en su fecha de corte, con FECHA como date."""
+    archivo_metas = archivo_metas.copy()
+    archivo_metas["FECHA"] = pd.to_datetime(archivo_metas["FECHA"], errors="coerce").dt.date
+    return archivo_metas[archivo_metas["FECHA"] == fecha_corte_metas(archivo_metas, hoy)]
+
+def metas_rol_va(metas_dia: pd.DataFrame) -> pd.DataFrame:
+    return (
+        metas_dia.groupby("CLAS")["META EQUIPO A LA FECHA"]
+        .sum()
+        .reset_index()
+        .rename(columns={"CLAS": "ROL", "META EQUIPO A LA FECHA": "Meta Proyectada a la Fecha"})
+    )
+
+def meta_sujeto_va(metas_dia: pd.DataFrame, modulo: str) -> float | None:
+    """Meta a la fecha de cada sujeto del módulo (fila con USUARIO = rol); None si la hoja no la trae."""
+    if metas_dia.empty or "META DIARIA A LA FECHA" not in metas_dia.columns:
+        return None
+    rol = ROL_POR_MODULO[modulo].lower()
+    filas = metas_dia[metas_dia["USUARIO"].astype(str).str.strip().str.lower() == rol]
+    if filas.empty:
+        return None
+    return filas["META DIARIA A LA FECHA"].sum()
+
+# --- DIAN: meta por días hábiles desde el inicio de la convocatoria ---
+def meta_acumulada_dian(proyecto: Proyecto, inicio: date, modulo: str, df_mod: pd.DataFrame,
+                        hoy: date) -> tuple[int, int]:
+    """(meta del módulo hasta ayer, sujetos que la comparten). La de Equipos se cuenta por supervisor."""
+    dias = dias_habiles(inicio, hoy - timedelta(days=1))
+    if dias <= 0:
+        return 0, 0
+
+    col = sujetos_col(proyecto, "Supervisores" if modulo == "Equipos" else modulo)
+    if col not in df_mod.columns:
+        return 0, 0
+
+    sujetos_unicos = (
+        df_mod[col]
+        .astype(str)
+        .str.strip()
+        .str.lower()
+        .replace("", pd.NA)
+        .dropna()
+        .unique()
+    )
+
+    n_sujetos = len(sujetos_unicos)
+    if n_sujetos == 0:
+        return 0, 0
+
+    return dias * proyecto.meta["diaria_modulo"][modulo] * n_sujetos, n_sujetos
+
+# --- INPEC: metas del día anterior, fecha día/mes ---
+def preparar_metas_inpec(archivo_metas: pd.DataFrame) -> pd.DataFrame:
+    archivo_metas = archivo_metas.copy()
+    archivo_metas["FECHA"] = pd.to_datetime(archivo_metas["FECHA"], dayfirst=True, errors="coerce").dt.date
+    archivo_metas["META EQUIPO A LA FECHA"] = (
+        pd.to_numeric(
+            archivo_metas["META EQUIPO A LA FECHA"]
+            .astype(str)
+            .str.replace("-", "0")
+            .str.replace(".", ""),
+            errors="coerce"
+        ).fillna(0).astype(int)
+    )
+    return archivo_metas
+
+def metas_rol_inpec(archivo_metas: pd.DataFrame, hoy: date) -> pd.DataFrame:
+    """Metas por ROL del día anterior, sobre la hoja ya pasada por preparar_metas_inpec."""
+    metas_dia = archivo_metas[archivo_metas["FECHA"] == hoy - timedelta(days=1)]
+
+    return (
+        metas_dia.groupby("ROL")["META EQUIPO A LA FECHA"]
+        .sum()
+        .reset_index()
+        .rename(columns={"META EQUIPO A LA FECHA": "Meta Proyectada a la Fecha"})
+    )
+
+
+# ============ CONFIGURACIÓN ============
+
+def leer_config(clave: str, defecto: str = "") -> str:
+    """Lee una opción desde variables de entorno o, si no existe, desde st.secrets."""
+    valor = os.environ.get(clave)
+    if valor is None:
+        try:
+            valor = st.secrets.get(clave, defecto)
+        except Exception:
+            valor = defecto  # Sin secrets.toml configurado
+    return str(valor).strip()
+
+def dir_datos() -> str:
+    # Carpeta con las versiones Arrow que escribe el cargador del host (python almacen.py DIR).
+    # Vacía: cada réplica descarga las hojas por su cuenta.
+    return leer_config("DIR_DATOS", "")
+
+def servicio_datos() -> str:
+    # URL del servicio local de datos (python servicio.py), p. ej. http://127.0.0.1:8765
+    return leer_config("SERVICIO_DATOS", "")
+
+
+# ============ CARGA COMPARTIDA ============
+
+def avisar(texto: str):
+    # Fuera de una ejecución del script (p. ej. la precarga en segundo plano) no hay
+    # página donde dibujar: el aviso va al log
+    if get_script_run_ctx(suppress_warning=True) is None:
+        _logger.warning(texto)
+    else:
+        st.warning(texto)
+
+@st.cache_data(ttl=600, show_spinner=False)
+def descargar(nombre: str) -> pd.DataFrame:
+    return almacen.descargar(nombre)
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def tabla_mapeada(directorio: str, nombre: str, version: str) -> pd.DataFrame:
+    # Una sola instancia por versión para todas las sesiones, respaldada por el archivo mapeado
+    return almacen.abrir(directorio, nombre, version)
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def tabla_servicio(url: str, nombre: str, version: str) -> pd.DataFrame:
+    return servicio.tabla(url, nombre)
+
+def version_datos(df_in: pd.DataFrame) -> str:
+    return df_in.attrs.get("version", "")
+
+def cargar_fuente(nombre: str) -> pd.DataFrame:
+    """Versión vigente de una hoja de almacen.FUENTES.
+
+    Se toma del almacén compartido (DIR_DATOS) o del servicio de datos
+    (SERVICIO_DATOS); si no hay ninguno, se descarga en este proceso.
+    """
+    # Copia superficial: cada rerun puede añadir columnas sin tocar la instancia compartida
+    directorio = dir_datos()
+    version = almacen.version_actual(directorio, nombre) if directorio else None
+    if version:
+        return tabla_mapeada(directorio, nombre, version).copy(deep=False)
+
+    url = servicio_datos()
+    if url:
+        try:
+            return tabla_servicio(url, nombre, servicio.version(url, nombre)).copy(deep=False)
+        except OSError:
+            avisar("El servicio de datos no responde; se descargan las hojas directamente.")
+    return descargar(nombre)
+
+def version_fuente(nombre: str) -> str:
+    """Versión vigente de una hoja sin cargarla ("" si solo se descarga en este proceso)."""
+    directorio = dir_datos()
+    version = almacen.version_actual(directorio, nombre) if directorio else None
+    if version:
+        return version
+
+    url = servicio_datos()
+    if url:
+        try:
+            return servicio.version(url, nombre)
+        except OSError:
+            pass
+    return ""
+
+def conteos_publicados(nombre: str) -> pd.DataFrame | None:
+    """Los conteos precalculados (almacen.conteos_carpetas) de la versión vigente
+    de la hoja, si el almacén los tiene; None si no (hay que contar sobre las filas)."""
+    directorio = dir_datos()
+    version = almacen.version_actual(directorio, nombre) if directorio else None
+    if not version or not os.path.exists(almacen.ruta(directorio, f"{nombre}.conteos", version)):
+        return None
+    return tabla_mapeada(directorio, f"{nombre}.conteos", version)
+
+def leer_fuente(nombre: str) -> pd.DataFrame:
+    """Como cargar_fuente, pero sin pasar por las cachés de Streamlit (quien llama la conserva)."""
+    directorio = dir_datos()
+    version = almacen.version_actual(directorio, nombre) if directorio else None
+    if version:
+        return almacen.abrir(directorio, nombre, version)
+
+    url = servicio_datos()
+    if url:
+        try:
+            return servicio.tabla(url, nombre)
+        except OSError:
+            avisar("El servicio de datos no responde; se descargan las hojas directamente.")
+    return almacen.descargar(nombre)
+
+
+# ============ CONVOCATORIAS (carga perezosa por partición) ============
+
+MAX_PARTICIONES = 3          # Convocatorias en memoria a la vez
+INACTIVIDAD_PARTICION = 1800  # Segundos sin consultas antes de descartar una convocatoria
+
+
+class Particiones:
+    """Hojas de cada partición (p. ej. una convocatoria), cargadas al primer acceso.
+
+    Cada partición se guarda aparte y se recarga pasados `ttl` segundos. Se
+    conservan como mucho `maximo`: al abrir otra se descarta la usada hace más
+    tiempo, y en cada acceso se descartan las que llevan `inactividad` segundos
+    sin consultarse. Abrir una partición nunca carga las demás.
+    """
+
+    def __init__(self, maximo: int = MAX_PARTICIONES, ttl: int = 600, inactividad: int = INACTIVIDAD_PARTICION):
+        self.maximo = maximo
+        self.ttl = ttl
+        self.inactividad = inactividad
+        self._lock = threading.Lock()
+        self._locks: dict[str, threading.Lock] = {}
+        # clave -> (cargada, último uso, hojas); el orden es el de uso (LRU)
+        self._datos: "OrderedDict[str, tuple[float, float, dict[str, pd.DataFrame]]]" = OrderedDict()
+
+    def obtener(self, clave: str, cargar) -> dict[str, pd.DataFrame]:
+        with self._lock:
+            lock = self._locks.setdefault(clave, threading.Lock())
+        # Un lock por partición: varias sesiones que abren la misma convocatoria
+        # esperan una sola carga, y las demás convocatorias no se bloquean
+        with lock:
+            with self._lock:
+                actual = self._datos.get(clave)
+            ahora = time.time()
+            if actual is None or ahora - actual[0] > self.ttl:
+                actual = (ahora, ahora, cargar())
+            with self._lock:
+                self._datos[clave] = (actual[0], ahora, actual[2])
+                self._datos.move_to_end(clave)
+                self._podar(ahora)
+        return actual[2]
+
+    def descartar(self, clave: str):
+        with self._lock:
+            self._datos.pop(clave, None)
+
+    def claves(self) -> list[str]:
+        with self._lock:
+            return list(self._datos)
+
+    def _podar(self, ahora: float):
+        for clave in [c for c, (_, usada, _) in self._datos.items() if ahora - usada > self.inactividad]:
+            del self._datos[clave]
+        while len(self._datos) > self.maximo:
+            self._datos.popitem(last=False)
+
+
+@st.cache_resource(show_spinner=False)
+def particiones() -> Particiones:
+    # Una sola instancia por proceso, compartida por todas las sesiones
+    return Particiones()
+
+def cargar_convocatoria(proyecto: Proyecto, clave: str) -> dict[str, pd.DataFrame]:
+    """Hojas de una convocatoria del proyecto, en su propia partición de caché."""
+    conv = proyecto.convocatorias[clave]
+    return particiones().obtener(
+        f"{proyecto.clave}/{clave}",
+        lambda: {hoja: leer_fuente(fuente) for hoja, fuente in conv.fuentes.items()},
+    )
+
+def descartar_convocatoria(proyecto: Proyecto, clave: str):
+    particiones().descartar(f"{proyecto.clave}/{clave}")
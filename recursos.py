@@ -0,0 +1,64 @@
+"""Imágenes fijas de los tableros (logos y fondos) al tamaño en que se muestran.
+
+Con una ruta, st.image abre el original en cada rerun, lo reescala si pasa del
+ancho máximo y lo vuelve a codificar en PNG o JPEG, y el navegador recibe
+imágenes de hasta 1460 px para mostrarlas a 200-400. Aquí cada imagen se
+reescala una sola vez por proceso al doble del ancho con que se dibuja (para
+pantallas de alta densidad), se codifica en WebP, o en PNG de 256 colores si
+pesa menos, y los bytes quedan en memoria para todas las sesiones. st.image la
+recibe como data URI, que Streamlit pasa tal cual: el elemento es idéntico
+entre reruns y, si pesa más de 10 KB, viaja como referencia a la caché de
+mensajes que ya tiene el navegador.
+"""
+import base64
+import io
+import os
+
+import streamlit as st
+
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+DENSIDAD = 2      # Píxeles reales por píxel CSS
+CALIDAD_WEBP = 82
+
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def variante(ruta: str, ancho: int, modificado: float) -> str:
+    """Data URI de `ruta` reescalada a `ancho` px CSS; `modificado` (mtime) la renueva si cambia el archivo."""
+    from PIL import Image, features
+
+    with Image.open(ruta) as original:
+        imagen = original.convert("RGBA" if original.mode in ("RGBA", "LA", "P") else "RGB")
+    destino = min(imagen.width, ancho * DENSIDAD)
+    if destino < imagen.width:
+        imagen = imagen.resize((destino, round(imagen.height * destino / imagen.width)), Image.LANCZOS)
+
+    # Se queda la codificación más liviana: WebP, o para los logos con
+    # transparencia (pocos colores) un PNG de 256 colores, que a veces pesa menos
+    candidatas = []
+    if features.check("webp"):
+        candidatas.append(("image/webp", imagen, {"format": "WEBP", "quality": CALIDAD_WEBP}))
+    if imagen.mode == "RGBA":
+        candidatas.append(("image/png", imagen.quantize(256), {"format": "PNG", "optimize": True}))
+    elif not candidatas:
+        candidatas.append(("image/jpeg", imagen, {"format": "JPEG", "quality": CALIDAD_WEBP, "optimize": True}))
+
+    codificadas = []
+    for tipo, img, opciones in candidatas:
+        buffer = io.BytesIO()
+        img.save(buffer, **opciones)
+        codificadas.append((len(buffer.getvalue()), tipo, buffer.getvalue()))
+    _, tipo, datos = min(codificadas)
+    return f"data:{tipo};base64,{base64.b64encode(datos).decode('ascii')}"
+
+def imagen(ruta: str, ancho: int, ajustar: bool = False, donde=st):
+    """st.image de un recurso de assets/ con su variante de `ancho` px.
+
+    Con `ajustar` ocupa el ancho de su columna y `ancho` es el tamaño típico de
+    esa columna; si no, se dibuja a `ancho` px.
+    """
+    ruta = os.path.join(RAIZ, ruta)
+    uri = variante(ruta, ancho, os.path.getmtime(ruta))
+    if ajustar:
+        donde.image(uri, use_container_width=True)
+    else:
+        donde.image(uri, width=ancho)
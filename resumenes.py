@@ -0,0 +1,157 @@
+"""Agregados por rol de cada proyecto, para compararlos sin tocar las filas.
+
+Cada sección (VA, cada convocatoria DIAN, VRM y Reclamaciones de INPEC) se
+resume en tres tablas pequeñas: avance por rol frente a la meta a la fecha
+(proyectos.resumen_por_rol, con las metas de cada proyecto según sus reglas),
+carpetas por estado y sujetos por categoría de atraso. Se calculan una vez por
+versión de datos y día, y se guardan en caché para todas las sesiones; la
+página comparativa (comparativo.py) solo lee estos agregados.
+
+Los resúmenes de los tableros viven en sus scripts y dependen de los filtros
+de cada sesión, así que aquí no se pueden leer. Lo que se comparte es lo que
+hay debajo: todo se calcula sobre los conteos por sujeto y estado de cada
+hoja (almacen.conteos_carpetas). Con almacén (DIR_DATOS) son los que el
+cargador ya dejó junto a cada versión y las filas no se leen; sin él se
+cuentan sobre la misma instancia de la hoja que tienen en caché los tableros
+(proyectos.cargar_fuente / cargar_convocatoria), sin descargarla otra vez.
+"""
+from datetime import date, timedelta
+from typing import Callable, NamedTuple
+
+import pandas as pd
+import streamlit as st
+
+import almacen
+import proyectos
+
+CATEGORIAS = ["Al día", "Atraso normal", "Atraso medio", "Atraso alto"]
+
+
+class Seccion(NamedTuple):
+    etiqueta: str
+    proyecto: str
+    parte: str  # Convocatoria (DIAN) u hoja (INPEC); vacía si el proyecto tiene una sola
+
+
+class Agregados(NamedTuple):
+    roles: pd.DataFrame       # ROL, Meta Proyectada a la Fecha, Carpetas Revisadas, % Avance
+    estados: pd.DataFrame     # estado_carpeta, cantidad
+    categorias: pd.DataFrame  # ROL, Categoria, sujetos (vacía si la sección no clasifica sujetos)
+
+
+def secciones() -> list[Seccion]:
+    dian = proyectos.PROYECTOS["dian"]
+    return (
+        [Seccion("VA", "va", "")]
+        + [Seccion(c.titulo, "dian", c.clave) for c in dian.convocatorias.values()]
+        + [Seccion(f"INPEC {hoja}", "inpec", hoja) for hoja in ["VRM", "Reclamaciones"]]
+    )
+
+
+# ============ PIEZAS COMUNES ============
+
+def conteos_hoja(fuente: str, filas: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+    """Carpetas por sujeto y estado de la hoja: precalculadas en el almacén o contadas sobre `filas()`."""
+    conteos = proyectos.conteos_publicados(fuente)
+    return conteos if conteos is not None else almacen.conteos_carpetas(filas())
+
+def por_estado(conteos: pd.DataFrame) -> pd.Series:
+    return conteos.groupby("estado_carpeta")["cantidad"].sum().sort_values(ascending=False, kind="stable")
+
+def conteo_por_estado(conteos: pd.DataFrame) -> pd.DataFrame:
+    return por_estado(conteos).rename_axis("estado_carpeta").reset_index(name="cantidad")
+
+def categorias_roles(conteos: pd.DataFrame, proyecto: proyectos.Proyecto,
+                     meta_individual: dict[str, float]) -> pd.DataFrame:
+    """Sujetos por categoría en cada rol, con la misma meta individual para todos los sujetos del rol."""
+    filas = []
+    for rol, modulo in proyectos.MODULO_POR_ROL.items():
+        col = proyectos.sujetos_col(proyecto, modulo)
+        if col not in conteos.columns:
+            continue
+        sujetos = conteos[col].astype(str).str.strip()
+        validos = conteos["estado_carpeta"].isin(proyectos.estados_validos(proyecto, modulo))
+        analizadas = conteos["cantidad"].where(validos, 0).groupby(sujetos).sum()
+        analizadas = analizadas[analizadas.index != ""]
+        faltantes = meta_individual.get(modulo, 0) - analizadas
+        categorias = faltantes.apply(lambda x: proyectos.clasifica_categoria(proyecto, int(x), modulo))
+        for categoria, n in categorias.value_counts().items():
+            filas.append({"ROL": rol, "Categoria": categoria, "sujetos": int(n)})
+    return pd.DataFrame(filas, columns=["ROL", "Categoria", "sujetos"])
+
+def huella(ag: Agregados) -> str:
+    """Versión de los agregados por su contenido (para secciones cuyas hojas no traen versión)."""
+    return "".join(almacen.huella(tabla) for tabla in ag)
+
+
+# ============ POR PROYECTO ============
+
+def _agregados_va(hoy: date) -> Agregados:
+    proyecto = proyectos.PROYECTOS["va"]
+    fuente = proyecto.fuentes["carpetas"]
+    conteos = conteos_hoja(fuente, lambda: proyectos.cargar_fuente(fuente))
+    metas_dia = proyectos.metas_dia_va(proyectos.cargar_fuente(proyecto.fuentes["metas"]), hoy)
+
+    meta_individual = {
+        modulo: proyectos.meta_sujeto_va(metas_dia, modulo) or 0
+        for modulo in proyectos.MODULO_POR_ROL.values()
+    }
+    return Agregados(
+        proyectos.resumen_por_rol(por_estado(conteos), proyectos.metas_rol_va(metas_dia)),
+        conteo_por_estado(conteos),
+        categorias_roles(conteos, proyecto, meta_individual),
+    )
+
+def _agregados_dian(convocatoria: str, hoy: date) -> Agregados:
+    proyecto = proyectos.PROYECTOS["dian"]
+    conv = proyecto.convocatorias[convocatoria]
+    conteos = conteos_hoja(conv.fuentes["carpetas"],
+                           lambda: proyectos.cargar_convocatoria(proyecto, convocatoria)["carpetas"])
+
+    # Los sujetos presentes son los mismos en los conteos que en las filas
+    metas_rol = pd.DataFrame([
+        {"ROL": rol, "Meta Proyectada a la Fecha": proyectos.meta_acumulada_dian(proyecto, conv.inicio, modulo, conteos, hoy)[0]}
+        for rol, modulo in proyectos.MODULO_POR_ROL.items()
+    ])
+
+    dias = proyectos.dias_habiles(conv.inicio, hoy - timedelta(days=1))
+    meta_individual = {modulo: dias * por_dia for modulo, por_dia in proyecto.meta["diaria_sujeto"].items()}
+    return Agregados(
+        proyectos.resumen_por_rol(por_estado(conteos), metas_rol),
+        conteo_por_estado(conteos),
+        categorias_roles(conteos, proyecto, meta_individual),
+    )
+
+def _agregados_inpec(hoja: str, hoy: date) -> Agregados:
+    proyecto = proyectos.PROYECTOS["inpec"]
+    fuente = proyecto.fuentes[hoja]
+    conteos = conteos_hoja(fuente, lambda: proyectos.cargar_fuente(fuente))
+    metas = proyectos.cargar_fuente(proyecto.fuentes["metas_rec" if hoja == "Reclamaciones" else "metas"])
+
+    metas_rol = proyectos.metas_rol_inpec(proyectos.preparar_metas_inpec(metas), hoy)
+    return Agregados(
+        proyectos.resumen_por_rol(por_estado(conteos), metas_rol),
+        conteo_por_estado(conteos),
+        pd.DataFrame(columns=["ROL", "Categoria", "sujetos"]),
+    )
+
+
+def version_seccion(seccion: Seccion) -> str:
+    """Versiones vigentes de las hojas de la sección, si el almacén o el servicio las conocen."""
+    proyecto = proyectos.PROYECTOS[seccion.proyecto]
+    if seccion.proyecto == "dian":
+        fuentes = proyecto.convocatorias[seccion.parte].fuentes.values()
+    elif seccion.proyecto == "inpec":
+        fuentes = [proyecto.fuentes[seccion.parte], proyecto.fuentes["metas_rec" if seccion.parte == "Reclamaciones" else "metas"]]
+    else:
+        fuentes = proyecto.fuentes.values()
+    return "/".join(proyectos.version_fuente(f) for f in fuentes)
+
+@st.cache_data(ttl=600, show_spinner=False)
+def agregados(seccion: Seccion, version: str, hoy: date) -> Agregados:
+    """Agregados de una sección; la caché se parte por versión de datos y por día."""
+    if seccion.proyecto == "va":
+        return _agregados_va(hoy)
+    if seccion.proyecto == "dian":
+        return _agregados_dian(seccion.parte, hoy)
+    return _agregados_inpec(seccion.parte, hoy)
@@ -0,0 +1,192 @@
+"""Servicio local de datos para los tableros (VA, DIAN e INPEC).
+
+Un proceso por host se encarga de descargar, normalizar y mantener en caché
+las hojas (o de leer las versiones del almacén, ver almacen.py) y responde por
+HTTP en localhost. Los tableros piden lo que necesitan y el trabajo se comparte
+entre todas las sesiones y aplicaciones. Las respuestas tabulares van en
+formato Arrow IPC (stream), así que otras herramientas internas pueden leerlas
+con pyarrow, polars o duckdb sin pasar por la interfaz.
+
+    python servicio.py                          # descarga las hojas cada 600 s
+    python servicio.py --dir /ruta/datos        # usa las versiones del cargador
+    python servicio.py --puerto 8765
+
+Rutas:
+    GET  /version?fuente=carpetas       -> {"fuente": ..., "version": ...}
+    GET  /tabla?fuente=carpetas         -> filas normalizadas (Arrow)
+    POST /conteo  {"fuente", "filtros", "claves", "categoria"}
+                                        -> conteos por `claves` (Arrow), ver agregaciones.contar
+
+Los tableros lo usan si se define SERVICIO_DATOS (p. ej. http://127.0.0.1:8765).
+"""
+import argparse
+import json
+import threading
+import time
+import urllib.parse
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import pyarrow as pa
+
+import agregaciones
+import almacen
+
+TIPO_ARROW = "application/vnd.apache.arrow.stream"
+
+
+# ============ SERVIDOR ============
+
+class Datos:
+    """Versión vigente de cada fuente, con sus agregados, compartida por todas las peticiones."""
+
+    def __init__(self, directorio: str = "", ttl: int = 600):
+        self.directorio = directorio
+        self.ttl = ttl
+        self._locks = {nombre: threading.Lock() for nombre in almacen.FUENTES}
+        self._cache: dict[str, tuple[str, float, pa.Table, dict[str, pa.Table]]] = {}
+
+    def obtener(self, nombre: str) -> tuple[str, pa.Table, dict[str, pa.Table]]:
+        if nombre not in almacen.FUENTES:
+            raise KeyError(nombre)
+
+        # Un lock por fuente: una descarga lenta no bloquea a las demás
+        with self._locks[nombre]:
+            actual = self._cache.get(nombre)
+            if self.directorio:
+                version = almacen.version_actual(self.directorio, nombre)
+                if version is None:
+                    raise LookupError(f"El almacén aún no tiene versión de '{nombre}'")
+                if actual is None or actual[0] != version:
+                    actual = (version, time.time(), self._leer(nombre, version), {
+                        agregado: self._leer(f"{nombre}.{agregado}", version)
+                        for agregado in almacen.FUENTES[nombre].agregados
+                    })
+            elif actual is None or time.time() - actual[1] > self.ttl:
+                df = almacen.descargar(nombre)
+                actual = (df.attrs["version"], time.time(), pa.Table.from_pandas(df, preserve_index=False), {
+                    agregado: pa.Table.from_pandas(calcular(df), preserve_index=False)
+                    for agregado, calcular in almacen.FUENTES[nombre].agregados.items()
+                })
+            self._cache[nombre] = actual
+        return actual[0], actual[2], actual[3]
+
+    def _leer(self, nombre: str, version: str) -> pa.Table:
+        return pa.ipc.open_file(pa.memory_map(almacen.ruta(self.directorio, nombre, version), "r")).read_all()
+
+
+class Manejador(BaseHTTPRequestHandler):
+    datos: Datos  # Se asigna al crear el servidor
+
+    def do_GET(self):
+        url = urllib.parse.urlparse(self.path)
+        fuente = urllib.parse.parse_qs(url.query).get("fuente", [""])[0]
+        try:
+            version, tabla, _ = self.datos.obtener(fuente)
+        except KeyError:
+            return self._error(404, f"Fuente desconocida: {fuente}")
+        except Exception as e:
+            return self._error(503, str(e))
+
+        if url.path == "/version":
+            self._json({"fuente": fuente, "version": version})
+        elif url.path == "/tabla":
+            self._arrow(tabla, version)
+        else:
+            self._error(404, f"Ruta desconocida: {url.path}")
+
+    def do_POST(self):
+        if urllib.parse.urlparse(self.path).path != "/conteo":
+            return self._error(404, f"Ruta desconocida: {self.path}")
+        try:
+            consulta = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            fuente, claves = consulta["fuente"], consulta["claves"]
+        except (ValueError, KeyError) as e:
+            return self._error(400, f"Consulta inválida: {e}")
+        try:
+            version, tabla, agregados = self.datos.obtener(fuente)
+        except KeyError:
+            return self._error(404, f"Fuente desconocida: {fuente}")
+        except Exception as e:
+            return self._error(503, str(e))
+
+        # Si hay conteos precalculados de la fuente se agrega sobre ellos, no sobre las filas
+        base = agregados.get("conteos", tabla)
+        try:
+            res = agregaciones.contar(base, consulta.get("filtros") or {}, claves, consulta.get("categoria"))
+        except (KeyError, pa.ArrowException) as e:
+            return self._error(400, f"Consulta inválida: {e}")
+        self._arrow(res, version)
+
+    def _arrow(self, tabla: pa.Table, version: str):
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, tabla.schema) as writer:
+            writer.write_table(tabla)
+        cuerpo = sink.getvalue()
+        self.send_response(200)
+        self.send_header("Content-Type", TIPO_ARROW)
+        self.send_header("Content-Length", str(cuerpo.size))
+        self.send_header("X-Version", version)
+        self.end_headers()
+        self.wfile.write(memoryview(cuerpo))
+
+    def _json(self, cuerpo: dict, estado: int = 200):
+        datos = json.dumps(cuerpo, ensure_ascii=False).encode("utf-8")
+        self.send_response(estado)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(datos)))
+        self.end_headers()
+        self.wfile.write(datos)
+
+    def _error(self, estado: int, mensaje: str):
+        self._json({"error": mensaje}, estado)
+
+    def log_message(self, formato, *args):
+        pass  # Sin una línea por petición; los errores se devuelven al cliente
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servicio local de datos para los tableros.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8765)
+    parser.add_argument("--dir", default="", help="Carpeta del almacén (python almacen.py DIR); vacío = descargar")
+    parser.add_argument("--ttl", type=int, default=600, help="Segundos antes de volver a descargar una hoja")
+    args = parser.parse_args()
+
+    Manejador.datos = Datos(args.dir, args.ttl)
+    servidor = ThreadingHTTPServer((args.host, args.puerto), Manejador)
+    print(f"Servicio de datos en http://{args.host}:{args.puerto}", flush=True)
+    servidor.serve_forever()
+
+
+# ============ CLIENTE ============
+
+def _leer_arrow(respuesta) -> pa.Table:
+    return pa.ipc.open_stream(respuesta.read()).read_all()
+
+def version(url: str, fuente: str, timeout: float = 5) -> str:
+    consulta = urllib.parse.urlencode({"fuente": fuente})
+    with urllib.request.urlopen(f"{url.rstrip('/')}/version?{consulta}", timeout=timeout) as r:
+        return json.load(r)["version"]
+
+def tabla(url: str, fuente: str, timeout: float = 60) -> pd.DataFrame:
+    """Filas normalizadas de la fuente, con su versión en attrs como las devuelve almacen."""
+    consulta = urllib.parse.urlencode({"fuente": fuente})
+    with urllib.request.urlopen(f"{url.rstrip('/')}/tabla?{consulta}", timeout=timeout) as r:
+        df = _leer_arrow(r).to_pandas(types_mapper=almacen.mapeo_texto())
+        df.attrs["version"] = r.headers.get("X-Version", "")
+    return df
+
+def conteo(url: str, fuente: str, filtros: dict, claves: list[str], categoria: tuple | None = None,
+           timeout: float = 30) -> pd.DataFrame:
+    """Igual que agregaciones.conteo, pero resuelto por el servicio."""
+    cuerpo = json.dumps({"fuente": fuente, "filtros": filtros, "claves": claves, "categoria": categoria}).encode("utf-8")
+    peticion = urllib.request.Request(f"{url.rstrip('/')}/conteo", data=cuerpo,
+                                      headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(peticion, timeout=timeout) as r:
+        return _leer_arrow(r).to_pandas()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Tablas grandes por páginas: se buscan y ordenan en el servidor y se envía una página.
+
+st.dataframe con el DataFrame entero manda todas las filas en cada rerun (y un
+Styler las recorre celda por celda en Python). `tabla_paginada` guarda en la
+sesión el orden de las filas para la búsqueda y el orden elegidos, calculado
+una vez por vista de datos, y en cada rerun solo corta y envía las filas de la
+página: cambiar de página cuesta lo mismo con cien filas que con cien mil.
+
+Los colores por estado no usan Styler: la columna se normaliza de una vez con
+pandas y se dibuja como etiqueta de color con la configuración de columnas.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import composicion
+
+FILAS_POR_PAGINA = 50
+SIN_ORDEN = "(orden original)"
+SIN_COLOR = "#f1f3f4"
+
+
+def _texto(df: pd.DataFrame) -> pd.Series:
+    """Todas las columnas de cada fila en minúsculas, para buscar sin recorrer columna por columna."""
+    texto = pd.Series("", index=df.index)
+    for col in df.columns:
+        # Con pandas 3 las columnas de texto conservan los nulos tras astype(str): sin
+        # fillna un solo nulo deja sin texto a toda la fila y nunca aparece en la búsqueda
+        texto = texto + "\x1f" + df[col].astype(str).fillna("").str.lower()
+    return texto
+
+
+def _posiciones(df: pd.DataFrame, texto, buscar: str, columna: str, descendente: bool) -> np.ndarray:
+    """Posiciones de las filas que contienen `buscar`, ordenadas por `columna`."""
+    posiciones = np.arange(len(df))
+    if buscar:
+        posiciones = posiciones[texto().str.contains(buscar.lower(), regex=False).to_numpy()]
+    if columna in df.columns:
+        orden = df[columna].iloc[posiciones].reset_index(drop=True).sort_values(
+            ascending=not descendente, kind="stable", na_position="last")
+        posiciones = posiciones[orden.index.to_numpy()]
+    return posiciones
+
+
+def _etiquetas(pagina: pd.DataFrame, colores: dict[str, dict[str, str]]) -> tuple[pd.DataFrame, dict]:
+    """Columnas con colores por valor como etiquetas (MultiselectColumn de solo lectura)."""
+    config = {}
+    for col, por_valor in colores.items():
+        if col not in pagina.columns:
+            continue
+        valores = pagina[col].fillna("").astype(str).str.strip().str.upper()
+        otros = [v for v in valores.unique() if v and v not in por_valor]
+        pagina[col] = [[v] if v else [] for v in valores]
+        config[col] = st.column_config.MultiselectColumn(
+            col,
+            options=list(por_valor) + otros,
+            color=list(por_valor.values()) + [SIN_COLOR] * len(otros),
+        )
+    return pagina, config
+
+
+def _primera_pagina(clave: str):
+    st.session_state[f"{clave}_pagina"] = 1
+
+
+@st.fragment
+def tabla_paginada(df: pd.DataFrame, clave: str, firma: str | None = None,
+                   colores: dict[str, dict[str, str]] | None = None, filas: int = FILAS_POR_PAGINA,
+                   config: dict | None = None):
+    """Tabla con búsqueda, orden y paginación en el servidor.
+
+    `clave` distingue los controles de cada tabla; `firma` es la vista de
+    datos (ver figuras.vista): con la misma firma el orden calculado se reusa.
+    `colores` da, por columna, el color de cada valor (en mayúsculas);
+    `config`, configuración de columnas adicional (st.column_config).
+    Es un fragmento: buscar, ordenar o cambiar de página no repite la página.
+    """
+    if len(df) > filas:
+        c1, c2, c3 = st.columns([2, 2, 1])
+        # Una búsqueda u orden nuevos vuelven a la primera página
+        cambio = {"on_change": _primera_pagina, "args": (clave,)}
+        buscar = c1.text_input("🔍 Buscar", key=f"{clave}_buscar", **cambio).strip()
+        columna = c2.selectbox("Ordenar por", [SIN_ORDEN] + [str(c) for c in df.columns],
+                               key=f"{clave}_orden", **cambio)
+        descendente = c3.toggle("Descendente", key=f"{clave}_desc", **cambio)
+
+        # El texto de búsqueda se arma una vez por vista; las posiciones, por búsqueda y orden
+        if firma is None:
+            posiciones = _posiciones(df, lambda: _texto(df), buscar, columna, descendente)
+        else:
+            texto = lambda: composicion.memo(f"tabla/{clave}/texto", [firma], lambda: _texto(df))
+            posiciones = composicion.memo(f"tabla/{clave}", [firma, buscar, columna, descendente],
+                                          lambda: _posiciones(df, texto, buscar, columna, descendente))
+
+        paginas = max(math.ceil(len(posiciones) / filas), 1)
+        if st.session_state.get(f"{clave}_pagina", 1) > paginas:
+            st.session_state[f"{clave}_pagina"] = 1
+        numero = st.number_input(f"Página (de {paginas})", 1, paginas, key=f"{clave}_pagina")
+        inicio = (numero - 1) * filas
+        pagina = df.iloc[posiciones[inicio:inicio + filas]]
+        st.caption(f"Filas {min(inicio + 1, len(posiciones))}–{min(inicio + filas, len(posiciones))} "
+                   f"de {len(posiciones):,}".replace(",", "."))
+    else:
+        pagina = df
+
+    config = dict(config or {})
+    if colores:
+        pagina, etiquetas = _etiquetas(pagina.copy(), colores)
+        config.update(etiquetas)
+    st.dataframe(pagina, use_container_width=True, hide_index=True, column_config=config)
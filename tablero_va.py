@@ -0,0 +1,1171 @@
+"""Tablero de seguimiento de carpetas VA: una sola página para el proyecto VA y las convocatorias DIAN.
+
+app.py y DIAN_VA/app.py solo llaman a `correr` con su `Proyecto`. Lo que cambia
+entre ellos llega con él:
+
+- las hojas: las del proyecto o, si tiene convocatorias, las de la que se elige
+  en la barra lateral (ver proyectos.cargar_convocatoria);
+- la meta (`Proyecto.meta`): de la hoja de metas en su fecha de corte
+  ("hoja_metas") o por días hábiles desde el inicio de la convocatoria
+  ("dias_habiles"); se resuelve una vez por rerun en `Metas`;
+- sujetos, estados que cuentan, umbrales y etiquetas de estado (proyectos.py).
+"""
+from datetime import date, datetime, timedelta
+from functools import partial
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+import plotly.colors
+import streamlit as st
+from pytz import timezone
+
+import busqueda
+import composicion
+import consultas
+import figuras
+import proyectos
+import recursos
+import tablas
+
+
+# ============ CONFIG VISUAL ============
+# plotly.express, graph_objects y la plantilla se cargan con la primera figura (ver figuras.py)
+px = figuras.Perezoso("plotly.express")
+go = figuras.Perezoso("plotly.graph_objects")
+figuras.plantilla("seaborn")
+COLOR_PALETTE = plotly.colors.sequential.Greens
+
+ESTILO = """
+<style>
+    .stApp { background-color: #ffffff; padding: 16px; }
+    h1, h2, h3 { color: #1F9924; text-align: center; }
+    [data-testid="stSidebar"] { background-color: #e8f5e9; }
+    [data-testid="stAppViewContainer"] { animation: fadeIn 0.5s ease-in-out; }
+    @keyframes fadeIn { from {opacity:0;} to {opacity:1;} }
+    .stButton>button {
+        background-color: #ffffff !important;
+        color: #2e7d32 !important;
+        border: 2px solid #2e7d32 !important;
+        border-radius: 999px !important;
+        padding: 10px 24px !important;
+        font-weight: 600 !important;
+        width: 260px !important;
+        box-shadow: 0 4px 10px rgba(46,125,50,0.20) !important;
+        transition: all 0.2s ease-in-out !important;
+    }
+    .stButton>button:hover {
+        background-color: #ffffff !important;
+        color: #2e7d32 !important;
+        transform: translateY(-1px) !important;
+        box-shadow: 0 8px 16px rgba(46,125,50,0.30) !important;
+    }
+</style>
+"""
+
+# ============ CONFIGURACIÓN ============
+
+leer_config = proyectos.leer_config
+version_datos = proyectos.version_datos
+ESTADOS_ORDEN = consultas.ESTADOS_ORDEN
+CATEGORIAS = ["Al día", "Atraso normal", "Atraso medio", "Atraso alto"]
+SECCIONES = ["Inicio", "Resumen", "Analistas", "Supervisores", "Equipos"]
+FILTROS_SIDEBAR = ["sel_prof", "sel_sup", "sel_ana", "sel_estado", "sel_nivel", "sel_categoria"]
+# Ancho habitual (px) de una de las tres columnas de la portada; los logos se
+# preparan a ese tamaño (ver recursos.py)
+ANCHO_COLUMNA = 560
+
+# Segundos entre refrescos de los indicadores en modo kiosco
+try:
+    INTERVALO_KIOSCO = max(int(leer_config("INTERVALO_KIOSCO", "60") or 60), 5)
+except ValueError:
+    INTERVALO_KIOSCO = 60
+
+def hoy_bogota() -> date:
+    return datetime.now(timezone("America/Bogota")).date()
+
+# ============ METAS ============
+
+class Metas(NamedTuple):
+    """Metas de la vista según `Proyecto.meta`, resueltas una vez por rerun."""
+    tipo: str
+    hoy: date
+    corte: date | None                    # Fecha de corte que se muestra
+    dias: int | None                      # Días hábiles considerados ("dias_habiles")
+    por_sujeto: dict[str, int | None]     # Módulo -> meta de cada sujeto (None: la hoja no la trae)
+    tabla: dict[str, int | None]          # Módulo -> meta de cada sujeto en la tabla del módulo
+    metas_dia: pd.DataFrame | None = None  # Filas de la hoja de metas en la fecha de corte ("hoja_metas")
+    inicio: date | None = None            # Inicio de la convocatoria ("dias_habiles")
+
+def resolver_metas(proyecto: proyectos.Proyecto, hojas: dict[str, pd.DataFrame],
+                   convocatoria: proyectos.Convocatoria | None, hoy: date) -> Metas:
+    if proyecto.meta["tipo"] == "hoja_metas":
+        metas_dia = proyectos.metas_dia_va(hojas["metas"], hoy)
+        por_sujeto = {}
+        for modulo in proyecto.sujetos:
+            meta = proyectos.meta_sujeto_va(metas_dia, modulo)
+            por_sujeto[modulo] = None if meta is None else int(meta)
+        return Metas("hoja_metas", hoy, proyectos.fecha_corte_metas(hojas["metas"], hoy), None,
+                     por_sujeto, por_sujeto, metas_dia=metas_dia)
+
+    # Días hábiles hasta ayer: la meta de hoy aún no vence
+    corte = hoy - timedelta(days=1)
+    dias = proyectos.dias_habiles(convocatoria.inicio, corte)
+    por_sujeto = {modulo: diaria * dias for modulo, diaria in proyecto.meta["diaria_sujeto"].items()}
+    # La tabla de Equipos lleva la meta diaria del módulo, no la de cada auditor
+    tabla = {**por_sujeto, "Equipos": proyecto.meta["diaria_modulo"]["Equipos"] * dias}
+    return Metas("dias_habiles", hoy, corte, dias, por_sujeto, tabla, inicio=convocatoria.inicio)
+
+def meta_modulo(proyecto: proyectos.Proyecto, metas: Metas, modulo: str,
+                dfm: pd.DataFrame) -> tuple[int, int | None]:
+    """(meta a la fecha del módulo, sujetos que la comparten si se cuenta por sujeto)."""
+    if metas.tipo == "hoja_metas":
+        rol = proyectos.ROL_POR_MODULO.get(modulo, "")
+        filas = metas.metas_dia[metas.metas_dia["USUARIO"].astype(str).str.strip().str.title() == rol]
+        if "META EQUIPO A LA FECHA" not in filas.columns:
+            return 0, None
+        return filas["META EQUIPO A LA FECHA"].sum(), None
+    return proyectos.meta_acumulada_dian(proyecto, metas.inicio, modulo, dfm, metas.hoy)
+
+def meta_resumen(proyecto: proyectos.Proyecto, metas: Metas, df_in: pd.DataFrame) -> int:
+    """Meta global: la de todos los roles en la hoja, o la acumulada de supervisores."""
+    if metas.tipo == "hoja_metas":
+        return metas.metas_dia["META EQUIPO A LA FECHA"].sum()
+    return meta_modulo(proyecto, metas, "Supervisores", prepara_df_modulo(proyecto, df_in, "Supervisores"))[0]
+
+def texto_corte(metas: Metas, n_sujetos: int | None = None) -> str:
+    partes = []
+    if n_sujetos is not None:
+        partes.append(f"Equipo: **{n_sujetos:,}**".replace(",", "."))
+    if metas.dias is not None:
+        partes.append(f"Días hábiles considerados: **{metas.dias}**")
+    partes.append(f"Fecha de corte: **{metas.corte}**")
+    return " - ".join(partes)
+
+# ============ VISTA ============
+
+class Tablero(NamedTuple):
+    """Lo que comparten las piezas de la página en un rerun."""
+    proyecto: proyectos.Proyecto
+    base: consultas.Base   # Filas sin filtrar, para los conteos fuera del proceso (ver consultas.conteo_externo)
+    metas: Metas
+
+class Vista(NamedTuple):
+    """Las filas que dejan los filtros de la barra lateral y lo que se deriva de ellos."""
+    df: pd.DataFrame
+    filtros: dict                      # Los mismos filtros, para las agregaciones fuera del proceso
+    firma: str | None                  # Firma para la caché de figuras compartida (ver figuras.py)
+    categorias: dict[str, pd.DataFrame]  # Módulo -> categoría de cada sujeto, sin filtrar
+
+def prepara_df_modulo(proyecto: proyectos.Proyecto, df_in: pd.DataFrame, modulo: str) -> pd.DataFrame:
+    dfm = df_in.copy()
+    col = proyectos.sujetos_col(proyecto, modulo)
+    if col not in dfm.columns:
+        dfm[col] = ""
+    return dfm
+
+# ============ GRAFICOS ============
+
+def grafico_avance_total(total: int, avance: int, meta: int):
+    if meta <= 0:
+        porcentaje = 0
+    else:
+        porcentaje = min((avance / meta) * 100, 150)  # Limita al 150% por estética
+
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number",
+        value=porcentaje,
+        number={"suffix": "%"},
+        title={"text": "<b>Avance total</b>"},
+        gauge={
+            "axis": {"range": [0, 100]},
+            "bar": {"color": "#1F9924"},
+            "steps": [
+                {"range": [0, 50], "color": "#e8f5e9"},
+                {"range": [50, 100], "color": "#c8e6c9"}
+            ],
+            "threshold": {
+                "line": {"color": "red", "width": 3},
+                "thickness": 0.75,
+                "value": 100
+            }
+        }
+    ))
+
+    fig.update_layout(
+        height=300,
+        margin=dict(t=40, b=20, l=20, r=20)
+    )
+
+    return fig
+
+def grafico_estado_con_meta(proyecto: proyectos.Proyecto, df_mod: pd.DataFrame, modulo: str, meta_total: int = 0):
+    if "estado_carpeta" not in df_mod.columns:
+        return px.bar(title="<b>Sin datos para mostrar</b>")
+
+    # Recuento por estado estandarizado
+    etiquetas = proyecto.etiquetas_estado
+    conteo = (
+        consultas.conteo_estados(df_mod)
+        .pipe(lambda c: c[c.index.isin(etiquetas.keys())])
+        .rename(index=etiquetas)
+        .reindex(
+            [etiquetas.get(e, e) for e in ["asignada", "devuelta", "calificada", "aprobada", "auditada", "Por asignar"]],
+            fill_value=0
+        )
+        .reset_index()
+    )
+
+    conteo.columns = ["estado_carpeta", "cantidad"]
+    total = conteo["cantidad"].sum()
+
+    if total == 0:
+        return px.bar(title="<b>Sin datos para mostrar</b>")
+
+    # Porcentajes y etiquetas
+    conteo["porcentaje"] = (conteo["cantidad"] / total * 100).round(1)
+    conteo["label"] = conteo["cantidad"].astype(str) + " (" + conteo["porcentaje"].astype(str) + "%)"
+
+    # Gráfico base
+    fig = px.bar(
+        conteo,
+        x="estado_carpeta",
+        y="cantidad",
+        color="estado_carpeta",
+        color_discrete_sequence=COLOR_PALETTE,
+        text="label",
+        title=f"<b>Distribución por estado — {modulo}</b>",
+    )
+
+    # Meta como línea horizontal
+    if meta_total > 0:
+        fig.add_scatter(
+            x=conteo["estado_carpeta"],
+            y=[meta_total] * len(conteo),
+            mode="lines",
+            name="Meta acumulada",
+            line=dict(color="#007BFF", width=2, dash="dash"),
+        )
+
+        fig.add_annotation(
+            text=f"<b>Meta: {meta_total:,.0f}</b>".replace(",", "X").replace(".", ",").replace("X", "."),
+            xref="paper", yref="paper",
+            x=0.98, y=1.05,
+            showarrow=False,
+            font=dict(size=13, color="#007BFF", family="Arial"),
+            align="right",
+        )
+
+    # Layout final
+    fig.update_layout(
+        showlegend=False,
+        xaxis_title="",
+        yaxis_title="Cantidad",
+        font=dict(family="Arial", size=12),
+        plot_bgcolor="white",
+        margin=dict(l=20, r=20, t=80, b=40),
+        title_font=dict(size=18, color="#1F9924", family="Arial"),
+    )
+
+    return fig
+
+def grafico_categorias_barh(tablero: Tablero, df_mod: pd.DataFrame, modulo: str):
+    meta = tablero.metas.por_sujeto[modulo]
+    if meta is None:
+        return px.bar(title=f"<b>Sin metas para {proyectos.ROL_POR_MODULO[modulo]}</b>")
+
+    # === Desarrolladas por sujeto frente a la meta de cada uno ===
+    dev = consultas.desarrolladas_por_sujeto(tablero.proyecto, df_mod, modulo)
+    if dev.empty:
+        return px.bar(title="<b>Sin datos para mostrar</b>")
+
+    dev["meta"] = meta
+    dev["atraso"] = dev["meta"] - dev["desarrolladas"]
+    dev["categoria"] = dev["atraso"].apply(lambda x: proyectos.clasifica_categoria(tablero.proyecto, int(x), modulo))
+
+    # === Conteo por categoría ===
+    cat_count = dev.groupby("categoria").size().reset_index(name="cantidad")
+    cat_count["categoria"] = pd.Categorical(cat_count["categoria"], categories=CATEGORIAS, ordered=True)
+    cat_count = cat_count.sort_values("categoria")
+
+    # === Gráfico ===
+    fig = px.bar(
+        cat_count,
+        x="cantidad",
+        y="categoria",
+        orientation="h",
+        color="categoria",
+        color_discrete_sequence=COLOR_PALETTE,
+        title=f"<b>Cantidad por seguimiento individual — {modulo}</b>",
+        text_auto=True,
+    )
+
+    fig.update_layout(
+        showlegend=False,
+        xaxis_title="Cantidad",
+        yaxis_title="",
+        font=dict(family="Arial", size=12),
+        title_font=dict(size=18, color="#1F9924", family="Arial"),
+        plot_bgcolor="white",
+        margin=dict(l=20, r=20, t=60, b=40),
+    )
+
+    return fig
+
+def tabla_resumen(tablero: Tablero, df_mod: pd.DataFrame, modulo: str, meta_sujeto: int | None,
+                  filtros: dict | None = None) -> composicion.ConAvisos:
+    proyecto = tablero.proyecto
+    col = proyectos.sujetos_col(proyecto, modulo)
+
+    # Validación inicial
+    if df_mod.empty or col not in df_mod.columns:
+        return composicion.ConAvisos(
+            pd.DataFrame(columns=["Categoria", col.capitalize(), "Analizadas", "Meta", "Faltantes"]),
+            [f"No se encontró la columna esperada '{col}' para el módulo '{modulo}'."],
+        )
+
+    # Estados que cuentan para el módulo
+    estados_efectivos = set(proyectos.estados_validos(proyecto, modulo))
+
+    # Agrupación de estados por sujeto
+    pivot = consultas.pivot_estados(df_mod, col, filtros, tablero.base)
+
+    pivot["Analizadas"] = pivot[[e for e in ESTADOS_ORDEN if e in estados_efectivos]].sum(axis=1)
+
+    # La misma meta para todos los sujetos del módulo
+    avisos = []
+    if meta_sujeto is None:
+        avisos.append(f"No hay metas disponibles para '{proyectos.ROL_POR_MODULO[modulo].lower()}' "
+                      f"en la fecha {tablero.metas.corte}.")
+        pivot["Meta"] = 0
+    else:
+        pivot["Meta"] = meta_sujeto
+
+    # Faltantes y clasificación
+    pivot["Faltantes"] = pivot["Meta"] - pivot["Analizadas"]
+    pivot["Categoria"] = pivot["Faltantes"].apply(lambda x: proyectos.clasifica_categoria(proyecto, int(x), modulo))
+
+    # Orden final
+    columnas_estado = ESTADOS_ORDEN
+    out = pivot[[col] + columnas_estado + ["Analizadas", "Meta", "Faltantes", "Categoria"]]
+    out["Categoria"] = pd.Categorical(out["Categoria"], categories=CATEGORIAS, ordered=True)
+
+    out = out.sort_values(["Categoria", col], ascending=[True, True])
+    out = out.rename(columns={col: col.capitalize(), **{e: proyecto.etiquetas_estado.get(e, e) for e in columnas_estado}})
+
+    return composicion.ConAvisos(out, avisos)
+
+def grafico_estado_supervisor(tablero: Tablero, df: pd.DataFrame, filtros: dict | None = None):
+    conteos = consultas.conteos_equipo_externo(tablero.base, filtros, "supervisor")
+    if conteos is not None:
+        df = conteos
+
+    # Supervisor(es) por equipo: un texto por barra, no uno por barra y estado
+    sup_info = (
+        df[["EQUIPO_NUM", "supervisor"]]
+        .drop_duplicates()
+        .groupby("EQUIPO_NUM")["supervisor"]
+        .agg(lambda x: ', '.join(sorted(x.dropna().unique())))
+    )
+
+    # Matriz equipo x estado (sumando si ya vienen conteos del pool)
+    etiquetas = tablero.proyecto.etiquetas_estado
+    estados = [etiquetas[e] for e in ESTADOS_ORDEN]
+    pesos = df["cantidad"] if "cantidad" in df.columns else pd.Series(1, index=df.index)
+    matriz = (
+        pesos.groupby([df["EQUIPO_NUM"], df["estado_carpeta"].map(etiquetas)]).sum()
+        .unstack(fill_value=0)
+        .reindex(index=sup_info.index, columns=estados, fill_value=0)
+        .astype(np.int32)
+    )
+    # Arreglos numéricos de numpy: Plotly los envía como binarios tipados, no como listas JSON
+    equipos = matriz.index.to_numpy(dtype=np.int32)
+
+    # Crear figura
+    fig = go.Figure()
+
+    # Una traza por estado; el supervisor va una sola vez por barra, en la primera
+    for i, estado in enumerate(estados):
+        fig.add_trace(
+            go.Bar(
+                x=equipos,
+                y=matriz[estado].to_numpy(),
+                name=estado,
+                customdata=sup_info.to_numpy() if i == 0 else None,
+                hovertemplate=("<b>Supervisor:</b> %{customdata}<br>" if i == 0 else "")
+                              + "<b>%{fullData.name}:</b> %{y}<extra></extra>",
+            )
+        )
+
+    # Layout
+    fig.update_layout(
+        barmode="stack",
+        hovermode="x unified",
+        title="<b>Estados por EQUIPO — Vista: Supervisor</b>",
+        xaxis=dict(title="Equipo", unifiedhovertitle=dict(text="<b>Equipo %{x}</b>")),
+        yaxis=dict(title="Cantidad", range=[0, matriz.sum(axis=1).max() + 20]),
+        font=dict(family="Arial", size=12),
+        title_font=dict(size=18, color="#1F9924", family="Arial"),
+        plot_bgcolor="white",
+        legend_title_text="Estado",
+        height=500,
+        margin=dict(l=30, r=30, t=60, b=70),
+        bargap=0.2,
+        colorway=COLOR_PALETTE
+    )
+
+    return fig
+
+def grafico_estado_analistas(tablero: Tablero, df: pd.DataFrame, filtros: dict | None = None):
+    # Validación mínima (el aviso lo muestra la página al recoger la pieza)
+    required_cols = {"EQUIPO_NUM", "analista", "estado_carpeta"}
+    if not required_cols.issubset(df.columns):
+        return composicion.ConAvisos(go.Figure(), ["Faltan columnas necesarias para la vista de Analistas."])
+
+    # Conteos por equipo, analista y estado (según MOTOR_DATOS)
+    pivot = consultas.conteo_estado_analistas(tablero.proyecto, df, filtros, tablero.base)
+
+    estado_cols = [col for col in pivot.columns if col not in ["EQUIPO_NUM", "analista", "equipo_rol"]]
+
+    # Barras en posiciones 0..n-1 (x0/dx, sin arreglo de x); el equipo y el
+    # analista van una sola vez por barra en la primera traza
+    posiciones = np.arange(len(pivot), dtype=np.int32)
+    etiquetas = pivot[["equipo_rol", "analista"]].to_numpy()
+
+    # Crear gráfico
+    fig = go.Figure()
+
+    for i, estado in enumerate(estado_cols):
+        fig.add_trace(
+            go.Bar(
+                x0=0,
+                dx=1,
+                y=pivot[estado].to_numpy(dtype=np.int32),
+                name=estado,
+                customdata=etiquetas if i == 0 else None,
+                hovertemplate=("<b>%{customdata[0]}</b><br><b>Analista:</b> %{customdata[1]}<br>" if i == 0 else "")
+                              + "<b>%{fullData.name}:</b> %{y}<extra></extra>",
+            )
+        )
+
+    # Layout
+    fig.update_layout(
+        barmode="stack",
+        hovermode="x unified",
+        title="<b>Estados por EQUIPO — Vista: Analistas</b>",
+        xaxis_title="Equipo",
+        yaxis=dict(title="Cantidad", range=[0, pivot[estado_cols].sum(axis=1).max() + 20]),
+        font=dict(family="Arial", size=12),
+        title_font=dict(size=18, color="#1F9924", family="Arial"),
+        plot_bgcolor="white",
+        legend_title_text="Estado",
+        height=500,
+        margin=dict(l=30, r=30, t=60, b=70),
+        bargap=0.4,
+        colorway=COLOR_PALETTE,
+        xaxis=dict(
+            tickmode="array",
+            tickvals=posiciones,
+            ticktext=pivot["EQUIPO_NUM"].astype(str),
+            # La posición no dice nada: el encabezado del hover va en blanco
+            unifiedhovertitle=dict(text=" "),
+        )
+    )
+
+    return fig
+
+# ---------- Categorías por sujeto (filtro transversal) ----------
+
+def categorias_por_sujeto(tablero: Tablero, df_base: pd.DataFrame, modulo: str,
+                          filtros: dict | None = None) -> pd.DataFrame:
+    """Sujeto, Categoria, EQUIPO y Modulo de cada sujeto del módulo, según la tabla del módulo.
+
+    Si se pasan los `filtros` que produjeron `df_base`, los conteos se
+    resuelven fuera del proceso (ver consultas.conteo_externo).
+    """
+    dfm = prepara_df_modulo(tablero.proyecto, df_base, modulo)
+    col = proyectos.sujetos_col(tablero.proyecto, modulo)
+    tab = tabla_resumen(tablero, dfm, modulo, tablero.metas.por_sujeto[modulo], filtros).valor
+
+    # Equipo de cada sujeto desde df_base (o desde los conteos del pool)
+    conteos = consultas.conteo_externo(tablero.base, filtros, [col, "EQUIPO"])
+    equipo_map = (
+        (conteos if conteos is not None else df_base)[[col, "EQUIPO"]]
+        .drop_duplicates()
+        .rename(columns={col: col.capitalize()})
+    )
+
+    tab = tab.merge(equipo_map, on=col.capitalize(), how="left")
+    tab["Modulo"] = modulo
+
+    return tab[[col.capitalize(), "Categoria", "EQUIPO", "Modulo"]].rename(columns={col.capitalize(): "Sujeto"})
+
+def aplicar_filtro_categoria_transversal(df_in: pd.DataFrame, categoria_sel: str,
+                                         cat_analistas: pd.DataFrame,
+                                         cat_supervisores: pd.DataFrame,
+                                         cat_equipos: pd.DataFrame) -> pd.DataFrame:
+    """Filas cuyo analista, supervisor o auditor (en ese orden) cae en la categoría elegida."""
+    if categoria_sel in (None, "", "Todos"):
+        return df_in
+
+    por_columna = [(col, nombre, cat_df) for col, nombre, cat_df in [("analista", "cat_analista", cat_analistas),
+                                                                     ("supervisor", "cat_supervisor", cat_supervisores),
+                                                                     ("auditor", "cat_auditor", cat_equipos)]
+                   if not cat_df.empty and col in df_in.columns]
+    if not por_columna:
+        return df_in.iloc[0:0].copy()
+
+    if consultas.MOTOR_DATOS == "duckdb":
+        tablas_sql, uniones, categorias = {"carpetas": df_in}, [], []
+        for col, nombre, cat_df in por_columna:
+            tablas_sql[nombre] = cat_df[["Sujeto", "Categoria"]].drop_duplicates("Sujeto")
+            uniones.append(
+                f'LEFT JOIN {nombre} ON trim(CAST(c."{col}" AS VARCHAR)) = trim(CAST({nombre}.Sujeto AS VARCHAR))'
+            )
+            categorias.append((nombre, f"CAST({nombre}.Categoria AS VARCHAR)"))
+
+        global_sql = f"coalesce({', '.join(expr for _, expr in categorias)})"
+        sql = (
+            f"SELECT c.*, {', '.join(f'{expr} AS {nombre}' for nombre, expr in categorias)}, "
+            f"{global_sql} AS categoria_global "
+            f"FROM carpetas c {' '.join(uniones)} WHERE {global_sql} = ?"
+        )
+        return consultas.consulta_duckdb(sql, [categoria_sel], **tablas_sql)
+
+    # Un sujeto puede repetirse por EQUIPO: se une una sola vez para no duplicar carpetas
+    out = df_in.copy()
+    categoria_global = None
+    for col, nombre, cat_df in por_columna:
+        out[col] = out[col].astype(str).str.strip()
+        cat = (
+            cat_df[["Sujeto", "Categoria"]]
+            .assign(Sujeto=cat_df["Sujeto"].astype(str).str.strip())
+            .drop_duplicates("Sujeto")
+            .rename(columns={"Sujeto": col, "Categoria": nombre})
+        )
+        out = out.merge(cat, on=col, how="left")
+        categoria_global = out[nombre] if categoria_global is None else categoria_global.combine_first(out[nombre])
+
+    out["categoria_global"] = categoria_global
+    return out[out["categoria_global"] == categoria_sel].copy()
+
+# ============ PIEZAS DE EQUIPOS ============
+# Se construyen en el pool de composicion.py (devuelven figuras, no dibujan)
+
+def grafico_auditores(dfm: pd.DataFrame):
+    # Torta completa por auditor (sin vacíos ni ceros); None si no hay qué graficar
+    aud_count = (
+        dfm[dfm["auditor"].str.strip() != ""]
+        .groupby("auditor")
+        .size()
+        .reset_index(name="cantidad")
+    )
+    aud_count = aud_count[aud_count["cantidad"] > 0]
+    if aud_count.empty:
+        return None
+    aud_count, plegadas = figuras.plegar(aud_count, "auditor")
+
+    fig_aud = px.pie(
+        aud_count,
+        names="auditor",
+        values="cantidad",
+        hole=0.45,
+        color_discrete_sequence=COLOR_PALETTE,
+        title="<b>Distribución por Auditor</b>",
+    )
+    fig_aud.update_traces(textinfo="label+percent", textfont_size=12)
+    fig_aud.update_layout(
+        margin=dict(l=20, r=20, t=60, b=0),
+        height=420,
+        showlegend=False,
+        meta={"plegadas": plegadas},
+    )
+    return fig_aud
+
+def base_equipos(dfm: pd.DataFrame) -> pd.DataFrame:
+    # Configuración general base (solo si alguna figura no está en caché)
+    tmp_base = dfm.copy()
+    tmp_base["estado_carpeta"] = tmp_base["estado_carpeta"].str.lower().fillna("")
+    tmp_base = tmp_base[~tmp_base["estado_carpeta"].isin(["", "por asignar"])]
+
+    tmp_base["EQUIPO_NUM"] = pd.to_numeric(tmp_base["EQUIPO"], errors="coerce")
+    tmp_base = tmp_base.dropna(subset=["EQUIPO_NUM"])
+    tmp_base["EQUIPO_NUM"] = tmp_base["EQUIPO_NUM"].astype(int)
+    return tmp_base
+
+def barh_categorias_por_rol(cat_df: pd.DataFrame, rol_titulo: str):
+    # Barras horizontales por Categoría (segmentadas por rol)
+    if cat_df.empty:
+        return px.bar(title=f"<b>Sin datos de {rol_titulo}</b>")
+    cnt = (cat_df.groupby("Categoria").size().reset_index(name="cantidad"))
+    cnt["Categoria"] = pd.Categorical(cnt["Categoria"], categories=CATEGORIAS, ordered=True)
+    cnt = cnt.sort_values("Categoria")
+    fig = px.bar(
+        cnt, x="cantidad", y="Categoria", orientation="h",
+        color="Categoria", color_discrete_sequence=COLOR_PALETTE,
+        title=f"<b>Categoría — {rol_titulo}</b>", text_auto=True
+    )
+    fig.update_layout(
+        showlegend=False,
+        xaxis_title="Cantidad",
+        yaxis_title="",
+        font=dict(family="Arial", size=12),
+        title_font=dict(size=18, color="#1F9924", family="Arial"),
+        plot_bgcolor="white",
+        margin=dict(l=20, r=20, t=60, b=40),
+    )
+    return fig
+
+# ============ RESUMEN ============
+
+def kpis_resumen(proyecto: proyectos.Proyecto, metas: Metas, df_in: pd.DataFrame) -> dict:
+    """Indicadores del resumen: métricas clave, meta global a la fecha de corte y avance."""
+    estados_resumen = consultas.conteo_estados(df_in)
+    return {
+        "corte": texto_corte(metas),
+        "total": len(df_in),
+        "auditadas": int(estados_resumen.get("auditada", 0)),
+        "equipo_va": df_in["analista"].nunique() + df_in["supervisor"].nunique(),
+        "por_asignar": int(estados_resumen.get("", 0)),
+        "meta_total": meta_resumen(proyecto, metas, df_in),
+    }
+
+def mostrar_kpis(k: dict, firma: str | None):
+    st.info(k["corte"])
+
+    # Métricas clave
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("📂 Total carpetas", f"{k['total']:,}".replace(",", "."))
+    col2.metric("✔️ Auditadas", f"{k['auditadas']:,}".replace(",", "."))
+    col3.metric("👨‍👧‍👧 Equipo VA", f"{k['equipo_va']:,}".replace(",", "."))
+    col4.metric("📌 Por asignar", f"{k['por_asignar']:,}".replace(",", "."))
+
+    # =======================
+    # 📊 Indicador de avance
+    # =======================
+    fig_gauge = figuras.figura("Resumen/avance_total", firma,
+                               lambda: grafico_avance_total(k["total"], k["auditadas"], k["meta_total"]))
+    st.plotly_chart(fig_gauge, use_container_width=True)
+
+# ---- Modo kiosco ----
+# Todas las pantallas del proceso comparten una lectura de las hojas por
+# intervalo y un cálculo de indicadores por versión de datos. Cada pantalla
+# refresca solo su fragmento: sin rerun del script ni limpieza de cachés.
+
+def leer_hojas(proyecto: proyectos.Proyecto, convocatoria: proyectos.Convocatoria | None) -> dict[str, pd.DataFrame]:
+    """Hojas del proyecto, o las de la convocatoria si las tiene (en su partición de caché)."""
+    if convocatoria is not None:
+        return proyectos.cargar_convocatoria(proyecto, convocatoria.clave)
+    return {hoja: proyectos.cargar_fuente(fuente) for hoja, fuente in proyecto.fuentes.items()}
+
+def version_hojas(convocatoria: proyectos.Convocatoria | None, hojas: dict[str, pd.DataFrame]) -> str:
+    return "/".join(([convocatoria.clave] if convocatoria else []) + [version_datos(h) for h in hojas.values()])
+
+def convocatoria_de(proyecto: proyectos.Proyecto, clave: str) -> proyectos.Convocatoria | None:
+    return proyecto.convocatorias[clave] if clave else None
+
+@st.cache_resource(ttl=INTERVALO_KIOSCO, show_spinner=False)
+def fuentes_kiosco(proyecto: str, convocatoria: str) -> dict[str, pd.DataFrame]:
+    return leer_hojas(proyectos.PROYECTOS[proyecto], convocatoria_de(proyectos.PROYECTOS[proyecto], convocatoria))
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def kpis_kiosco(proyecto: str, convocatoria: str, version: str, hoy: date, _hojas: dict[str, pd.DataFrame]) -> dict:
+    p = proyectos.PROYECTOS[proyecto]
+    metas = resolver_metas(p, _hojas, convocatoria_de(p, convocatoria), hoy)
+    return kpis_resumen(p, metas, _hojas["carpetas"])
+
+@st.fragment(run_every=INTERVALO_KIOSCO)
+def kiosco_resumen(proyecto: str, convocatoria: str):
+    hojas = fuentes_kiosco(proyecto, convocatoria)
+    version = version_hojas(convocatoria_de(proyectos.PROYECTOS[proyecto], convocatoria), hojas)
+    hoy = hoy_bogota()
+    # Un fragmento vuelve a emitir todo lo suyo en cada corrida (lo que no emite
+    # se borra). Con la misma versión se emiten los mismos elementos desde la
+    # instantánea de la sesión: Streamlit manda el indicador como referencia a
+    # lo que el navegador ya tiene y solo viajan datos nuevos cuando la versión cambia.
+    previo = st.session_state.get("kiosco")
+    if previo is None or previo[0] != (version, hoy):
+        k = kpis_kiosco(proyecto, convocatoria, version, hoy, hojas)
+        st.session_state["kiosco"] = previo = ((version, hoy), k, figuras.vista(version, {}, hoy))
+    _, k, firma = previo
+    mostrar_kpis(k, firma)
+
+def pagina_resumen(tablero: Tablero, vista: Vista, kiosco: bool, convocatoria: str):
+    st.markdown("<h1 style='color:#1F9924;'>Resumen general</h1>", unsafe_allow_html=True)
+
+    if kiosco:
+        # Vista global: los filtros de la barra lateral no aplican en kiosco
+        kiosco_resumen(tablero.proyecto.clave, convocatoria)
+        k = st.session_state["kiosco"][1]
+        df_resumen = fuentes_kiosco(tablero.proyecto.clave, convocatoria)["carpetas"]
+        vista_resumen = st.session_state["kiosco"][2]
+    else:
+        k = kpis_resumen(tablero.proyecto, tablero.metas, vista.df)
+        mostrar_kpis(k, vista.firma)
+        df_resumen, vista_resumen = vista.df, vista.firma
+
+    # ================================
+    # 📊 Gráfico por estado + meta
+    # ================================
+    fig_estado = figuras.figura("Resumen/estado_con_meta", vista_resumen,
+                                lambda: grafico_estado_con_meta(tablero.proyecto, df_resumen, "Supervisores", k["meta_total"]))
+    st.plotly_chart(fig_estado, use_container_width=True)
+
+# ============ VISTA MÓDULOS ============
+
+def custom_metric(label: str, value: str, color="#2e7d32"):
+    st.markdown(
+        f"""
+        <div style="
+            background-color: #ffffff;
+            border: 2px solid {color};
+            border-radius: 12px;
+            padding: 10px 8px;
+            text-align: center;
+            box-shadow: 0 4px 10px rgba(46,125,50,0.15);
+            transition: all 0.2s ease-in-out;
+            ">
+            <div style="font-size:13px; color:#666; font-weight:500;">{label}</div>
+            <div style="font-size:15px; font-weight:700; color:#1a1a1a; margin-top:2px;">{value}</div>
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+
+def modulo_vista(tablero: Tablero, vista: Vista, nombre_modulo: str):
+    st.markdown(f"<h1 style='color:#1F9924;'>{nombre_modulo}</h1>", unsafe_allow_html=True)
+    proyecto, metas = tablero.proyecto, tablero.metas
+    df_filtrado, filtros_vista, vista_figuras = vista.df, vista.filtros, vista.firma
+    dfm = prepara_df_modulo(proyecto, df_filtrado, nombre_modulo)
+
+    # === Meta del módulo a la fecha de corte ===
+    meta_total, n_sujetos = meta_modulo(proyecto, metas, nombre_modulo, dfm)
+    st.info(texto_corte(metas, n_sujetos))
+
+    # === Carpeta desarrolladas válidas ===
+    validos = proyectos.estados_validos(proyecto, nombre_modulo)
+    desarrolladas_total = int(consultas.conteo_estados(dfm).reindex(validos, fill_value=0).sum())
+    diferencia_total = desarrolladas_total - meta_total
+
+    # === Piezas de la página: se construyen a la vez y se emiten abajo en orden ===
+    pagina = composicion.Composicion(nombre_modulo)
+    if nombre_modulo != "Equipos":
+        pagina.agregar("estado_con_meta", partial(
+            figuras.figura, f"{nombre_modulo}/estado_con_meta", vista_figuras,
+            lambda: grafico_estado_con_meta(proyecto, dfm, nombre_modulo, meta_total)))
+        pagina.agregar("categorias", partial(
+            figuras.figura, f"{nombre_modulo}/categorias", vista_figuras,
+            lambda: grafico_categorias_barh(tablero, dfm, nombre_modulo)))
+    else:
+        if "auditor" in dfm.columns:
+            pagina.agregar("auditores", partial(
+                figuras.figura, "Equipos/auditores", vista_figuras, lambda: grafico_auditores(dfm)))
+        if {"EQUIPO", "estado_carpeta"}.issubset(dfm.columns):
+            pagina.agregar("estado_supervisor", partial(
+                figuras.figura, "Equipos/estado_supervisor", vista_figuras,
+                lambda: grafico_estado_supervisor(tablero, base_equipos(dfm), filtros_vista)))
+            pagina.agregar("estado_analistas", partial(
+                figuras.figura, "Equipos/estado_analistas", vista_figuras,
+                lambda: grafico_estado_analistas(tablero, base_equipos(dfm), filtros_vista)))
+
+        # Categorías ya calculadas por sujeto, limitadas a los sujetos presentes
+        # en dfm filtrado (para contexto de vista)
+        sup_presentes = dfm["supervisor"].unique().tolist() if "supervisor" in dfm.columns else []
+        ana_presentes = dfm["analista"].unique().tolist() if "analista" in dfm.columns else []
+
+        cat_supervisores_df, cat_analistas_df = vista.categorias["Supervisores"], vista.categorias["Analistas"]
+        sup_cat_local = cat_supervisores_df[cat_supervisores_df["Sujeto"].isin(sup_presentes)]
+        ana_cat_local = cat_analistas_df[cat_analistas_df["Sujeto"].isin(ana_presentes)]
+
+        pagina.agregar("categorias_supervisores", partial(
+            figuras.figura, "Equipos/categorias_supervisores", vista_figuras,
+            lambda: barh_categorias_por_rol(sup_cat_local, "Supervisores")))
+        pagina.agregar("categorias_analistas", partial(
+            figuras.figura, "Equipos/categorias_analistas", vista_figuras,
+            lambda: barh_categorias_por_rol(ana_cat_local, "Analistas")))
+    pagina.agregar("tabla_resumen", lambda: tabla_resumen(
+        tablero, dfm, nombre_modulo, metas.tabla[nombre_modulo], filtros_vista))
+
+    # === Mostrar métricas ===
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("📂 Total carpetas", f"{len(dfm):,}".replace(",", "."))
+    c2.metric("✔️ Desarrolladas", f"{desarrolladas_total:,}".replace(",", "."))
+    c3.metric("🎯 Meta a la fecha", f"{meta_total:,}".replace(",", "."))
+    c4.metric("⚠️ Diferencia", f"{diferencia_total:,}".replace(",", "."))
+
+    # ===================== CONTEXTO FILTRADO =====================
+    analistas_filtrados = sorted(df_filtrado["analista"].dropna().unique()) if "analista" in df_filtrado.columns else []
+    supervisores_filtrados = sorted(df_filtrado["supervisor"].dropna().unique()) if "supervisor" in df_filtrado.columns else []
+    auditores_filtrados = sorted(df_filtrado["auditor"].dropna().unique()) if "auditor" in df_filtrado.columns else []
+    equipos_filtrados = sorted(df_filtrado["EQUIPO"].dropna().unique()) if "EQUIPO" in df_filtrado.columns else []
+
+    analista_label_1, analista_label_2 = ("No disponible", "") if not analistas_filtrados else (
+        (analistas_filtrados[0], "") if len(analistas_filtrados) == 1 else
+        (analistas_filtrados[0], analistas_filtrados[1]) if len(analistas_filtrados) == 2 else
+        ("Varios", "Varios")
+    )
+
+    supervisor_label = (
+        "No disponible" if not supervisores_filtrados else
+        supervisores_filtrados[0] if len(supervisores_filtrados) == 1 else
+        "Varios"
+    )
+
+    auditor_label = (
+        "No disponible" if not auditores_filtrados else
+        auditores_filtrados[0] if len(auditores_filtrados) == 1 else
+        "Varios"
+    )
+
+    equipo_label = (
+        "No disponible" if not equipos_filtrados else
+        equipos_filtrados[0] if len(equipos_filtrados) == 1 else
+        "Varios"
+    )
+
+    # ==================== GRAFICOS MODULARES ====================
+    if nombre_modulo != "Equipos":
+        col_fig1, col_fig2 = st.columns(2)
+        with col_fig1:
+            st.plotly_chart(pagina["estado_con_meta"], use_container_width=True)
+        with col_fig2:
+            st.plotly_chart(pagina["categorias"], use_container_width=True)
+
+        with st.container():
+            if nombre_modulo == 'Analistas':
+                cx1, cx2, cx3 = st.columns(3)
+                with cx1: custom_metric("💯 Equipo", equipo_label)
+                with cx2: custom_metric("🕵️‍♀️ Supervisor", supervisor_label)
+                with cx3: custom_metric("👩‍💼 Profesional", auditor_label)
+            elif nombre_modulo == 'Supervisores':
+                cx1, cx2, cx3, cx4 = st.columns(4)
+                with cx1: custom_metric("💯 Equipo", equipo_label)
+                with cx2: custom_metric("👨‍💻 Analista1", analista_label_1)
+                with cx3: custom_metric("👨‍💻 Analista2", analista_label_2)
+                with cx4: custom_metric("👩‍💼 Profesional", auditor_label)
+
+        tabla = pagina["tabla_resumen"]
+        st.markdown(f"<h3 style='color:#1F9924; font-weight:600; margin-top: 1em;'>Resumen {nombre_modulo}</h3>", unsafe_allow_html=True)
+        tablas.tabla_paginada(tabla, f"tabla_{nombre_modulo}", firma=vista_figuras)
+        pagina.registrar()
+        return
+
+    # ==================== MÓDULO EQUIPOS ====================
+    # a) Torta completa por auditor (sin vacíos ni ceros)
+    if "auditor" in dfm.columns:
+        fig_aud = pagina["auditores"]
+        if fig_aud is not None:
+            st.plotly_chart(fig_aud, use_container_width=True)
+            figuras.detalle_otros(fig_aud, "otros_auditores", lambda: figuras.resto(
+                dfm[dfm["auditor"].str.strip() != ""].groupby("auditor").size().reset_index(name="cantidad")
+            ))
+        else:
+            st.warning("No hay datos válidos de auditor para graficar.")
+    else:
+        st.warning("No existe columna 'auditor' en los datos.")
+
+    with st.container():
+        cx1, cx2, cx3, cx4 = st.columns(4)
+        with cx1: custom_metric("💯 Equipo", equipo_label)
+        with cx2: custom_metric("👨‍💻 Analista1", analista_label_1)
+        with cx3: custom_metric("👨‍💻 Analista2", analista_label_2)
+        with cx4: custom_metric("🕵️‍♀️ Supervisor", supervisor_label)
+
+    # b) Barras por estado para cada EQUIPO
+    if {"EQUIPO", "estado_carpeta"}.issubset(dfm.columns):
+        st.subheader("📊 Estados por EQUIPO")
+
+        tab_sup, tab_ana = st.tabs(["🕵️ Supervisor", "👨‍💻 Analistas"])
+
+        # =======================================================
+        # 🕵️ VISTA SUPERVISOR
+        # =======================================================
+        with tab_sup:
+            st.plotly_chart(pagina["estado_supervisor"], use_container_width=True)
+
+        # =======================================================
+        # 👨‍💻 VISTA ANALISTAS
+        # =======================================================
+        with tab_ana:
+            st.plotly_chart(pagina["estado_analistas"], use_container_width=True)
+
+    else:
+        st.warning("No hay datos válidos de EQUIPO/estado para graficar.")
+
+    # c) Barras horizontales por Categoría (segmentadas por rol)
+    colh1, colh2 = st.columns(2)
+    with colh1:
+        st.plotly_chart(pagina["categorias_supervisores"], use_container_width=True)
+    with colh2:
+        st.plotly_chart(pagina["categorias_analistas"], use_container_width=True)
+
+    # Tabla resumen a nivel de "Equipos": usamos auditor como sujeto base
+    ttabla = pagina["tabla_resumen"]
+    st.markdown(f"<h3 style='color:#1F9924; font-weight:600; margin-top: 1em;'>Resumen {nombre_modulo}</h3>", unsafe_allow_html=True)
+    tablas.tabla_paginada(ttabla, f"tabla_{nombre_modulo}", firma=vista_figuras)
+    pagina.registrar()
+
+# ============ PÁGINA ============
+
+def elegir_convocatoria(proyecto: proyectos.Proyecto) -> proyectos.Convocatoria | None:
+    """La convocatoria de la barra lateral (o de ?convocatoria=), si el proyecto las tiene.
+
+    Cada convocatoria se carga al abrirla, en su propia partición de caché; las
+    que nadie consulta se descartan (ver proyectos.Particiones).
+    """
+    convocatorias = proyecto.convocatorias
+    if not convocatorias:
+        return None
+
+    def cambiar_convocatoria():
+        st.query_params["convocatoria"] = st.session_state.sel_convocatoria
+        # Los sujetos de otra convocatoria no aplican
+        for k in FILTROS_SIDEBAR:
+            st.session_state[k] = "Todos"
+
+    if st.session_state.get("sel_convocatoria") not in convocatorias:
+        inicial = st.query_params.get("convocatoria", "")
+        st.session_state.sel_convocatoria = inicial if inicial in convocatorias else next(iter(convocatorias))
+
+    st.sidebar.selectbox("📁 Convocatoria", list(convocatorias), format_func=lambda c: convocatorias[c].titulo,
+                         key="sel_convocatoria", on_change=cambiar_convocatoria)
+    return convocatorias[st.session_state.sel_convocatoria]
+
+def navegacion(kiosco: bool) -> str:
+    pagina_param = "Resumen" if kiosco else st.query_params.get("pagina", "Inicio")
+    pagina_actual = pagina_param if pagina_param in SECCIONES else "Inicio"
+    st.session_state.pagina = pagina_actual if kiosco else st.session_state.get("pagina", pagina_actual)
+
+    seleccion = st.sidebar.radio(
+        "Ir a la sección:",
+        SECCIONES,
+        index=SECCIONES.index(st.session_state.pagina),
+        key="nav_radio"
+    )
+
+    if seleccion != st.session_state.pagina:
+        st.session_state.pagina = seleccion
+        st.query_params["pagina"] = seleccion
+        st.rerun()
+    return st.session_state.pagina
+
+def portada(titulo: str):
+    c1, c2, c3 = st.columns([1, 1, 1])
+
+    with c1:
+        recursos.imagen("assets/Logp GP FUAA.png", ANCHO_COLUMNA, ajustar=True)
+    with c2:
+        st.empty()
+    with c3:
+        recursos.imagen("assets/Andina.png", 200)
+
+    st.markdown(
+        "<h1 style='text-align:center; font-weight:700; color:#1F9924'>"
+        f"Seguimiento de Metas {titulo}"
+        "</h1>", unsafe_allow_html=True
+    )
+
+    st.markdown("---")
+
+    col_left, col_center, col_right = st.columns([1, 1, 1])
+
+    with col_left:
+        st.write("")  # Espacio
+        for pagina in SECCIONES[1:]:
+            if st.button(pagina, key=f"btn_home_{pagina.lower()}"):
+                st.session_state.pagina = pagina
+                st.query_params["pagina"] = pagina
+                st.rerun()
+
+    with col_center:
+        recursos.imagen("assets/Logo Tablero.jpg", ANCHO_COLUMNA, ajustar=True)
+
+    with col_right:
+        st.empty()
+
+def filtros_sidebar(tablero: Tablero, convocatoria: proyectos.Convocatoria | None,
+                    df: pd.DataFrame, deps_datos: list) -> dict:
+    """Dibuja los filtros persistentes de la barra lateral y devuelve la cascada."""
+    clave = tablero.proyecto.clave
+    with st.sidebar:
+        st.header("🔎 Filtros")
+
+        # 🔄 Botón para recargar datos desde Google Sheets (limpia la caché)
+        if st.button("🔄 Recargar datos", use_container_width=True):
+            st.cache_data.clear()
+            if convocatoria is not None:
+                proyectos.descartar_convocatoria(tablero.proyecto, convocatoria.clave)
+            st.rerun()
+
+        # Inicializar estados si no existen
+        for k in FILTROS_SIDEBAR:
+            if k not in st.session_state:
+                st.session_state[k] = "Todos"
+
+        # 🧹 Botón para limpiar filtros sin cambiar de página
+        if st.button("🧹 Borrar filtros", use_container_width=True):
+            for k in FILTROS_SIDEBAR:
+                st.session_state[k] = "Todos"
+            st.session_state["sel_ana_buscar"] = ""
+            st.rerun()
+
+        # Filtros dependientes (cascada)
+        filtros_cascada = {
+            "auditor": st.session_state.sel_prof,
+            "supervisor": st.session_state.sel_sup,
+            "analista": st.session_state.sel_ana,
+        }
+
+        def opciones_cascada() -> dict:
+            df_temp = consultas.filtrar_carpetas(df, filtros_cascada)
+
+            # 🔄 Categoría de desempeño individual, con los filtros previos
+            categorias_disponibles = pd.concat([
+                categorias_por_sujeto(tablero, df_temp, modulo, filtros_cascada)["Categoria"]
+                for modulo in ["Analistas", "Supervisores", "Equipos"]
+            ]).dropna().unique().tolist()
+
+            # Opciones para selectboxes según datos filtrados
+            return {
+                "prof": ["Todos"] + sorted(df_temp["auditor"].dropna().unique()),
+                "sup": ["Todos"] + sorted(df_temp["supervisor"].dropna().unique()),
+                "ana": ["Todos"] + sorted(df_temp["analista"].dropna().unique()),
+                "estado": ["Todos"] + sorted(set(df["estado_carpeta"].str.lower().dropna().unique()) | {""}),
+                "nivel": ["Todos"] + sorted(df_temp["nivel"].dropna().unique()) if "nivel" in df_temp.columns else ["Todos"],
+                "categoria": ["Todos"] + [cat for cat in CATEGORIAS if cat in categorias_disponibles],
+            }
+
+        # Solo se recalculan si cambian los datos o la cascada (no al cambiar estado, nivel o página)
+        opciones = composicion.memo(f"{clave}/opciones_cascada", deps_datos + [filtros_cascada], opciones_cascada)
+        # Los analistas pueden ser miles: se buscan en un índice por versión de datos (la cascada
+        # solo limita las coincidencias) y el navegador recibe unas pocas opciones
+        indice_ana = composicion.memo(f"{clave}/indice_analistas", deps_datos,
+                                      lambda: busqueda.Indice(df["analista"].dropna().unique()))
+        opciones_prof, opciones_sup, opciones_ana = opciones["prof"], opciones["sup"], opciones["ana"]
+        opciones_estado, opciones_nivel, opciones_categoria = opciones["estado"], opciones["nivel"], opciones["categoria"]
+
+        # Mostrar filtros
+        st.selectbox("👩‍💼 Profesional", opciones_prof,
+                     index=opciones_prof.index(st.session_state.sel_prof) if st.session_state.sel_prof in opciones_prof else 0,
+                     key="sel_prof")
+        st.selectbox("🕵️‍♀️ Supervisor", opciones_sup,
+                     index=opciones_sup.index(st.session_state.sel_sup) if st.session_state.sel_sup in opciones_sup else 0,
+                     key="sel_sup")
+        busqueda.selector("👨‍💻 Analista", opciones_ana, indice_ana, key="sel_ana")
+        st.selectbox("📤 Estado", opciones_estado,
+                     index=opciones_estado.index(st.session_state.sel_estado) if st.session_state.sel_estado in opciones_estado else 0,
+                     key="sel_estado")
+        st.selectbox("🔹 Nivel", opciones_nivel,
+                     index=opciones_nivel.index(st.session_state.sel_nivel) if st.session_state.sel_nivel in opciones_nivel else 0,
+                     key="sel_nivel")
+
+        st.selectbox("🏷️ Categoría", opciones_categoria,
+                     index=opciones_categoria.index(st.session_state.sel_categoria) if st.session_state.sel_categoria in opciones_categoria else 0,
+                     key="sel_categoria")
+    return filtros_cascada
+
+def aplicar_filtros(tablero: Tablero, df: pd.DataFrame, filtros_cascada: dict, deps_datos: list,
+                    version: str) -> Vista:
+    # ========= Categorías por sujeto (para el filtro transversal) =========
+    # Dependen solo de los datos y la fecha: una vez por sesión y versión
+    categorias = composicion.memo(f"{tablero.proyecto.clave}/categorias_globales", deps_datos, lambda: {
+        modulo: categorias_por_sujeto(tablero, df, modulo, {}) for modulo in ["Analistas", "Supervisores", "Equipos"]
+    })
+
+    filtros_vista = {
+        **filtros_cascada,
+        "estado_carpeta": st.session_state.sel_estado,
+        "nivel": st.session_state.sel_nivel,
+    }
+    df_filtrado = consultas.filtrar_carpetas(df, filtros_vista)
+
+    # ➕ Filtro por categoría (transversal)
+    df_filtrado = aplicar_filtro_categoria_transversal(
+        df_filtrado,
+        st.session_state.sel_categoria,
+        categorias["Analistas"],
+        categorias["Supervisores"],
+        categorias["Equipos"],
+    )
+
+    # Misma selección expresada como filtros, para las agregaciones fuera del proceso
+    if st.session_state.sel_categoria not in (None, "", "Todos"):
+        filtros_vista["categoria"] = (st.session_state.sel_categoria, {
+            col: dict(zip(cat_df["Sujeto"].astype(str).str.strip(), cat_df["Categoria"].astype(str)))
+            for col, cat_df in [("analista", categorias["Analistas"]),
+                                ("supervisor", categorias["Supervisores"]),
+                                ("auditor", categorias["Equipos"])]
+            if not cat_df.empty
+        })
+
+    # Firma de la vista para la caché de figuras compartida (ver figuras.py)
+    firma = figuras.vista(version, filtros_vista, tablero.metas.hoy)
+    return Vista(df_filtrado, filtros_vista, firma, categorias)
+
+def correr(proyecto: proyectos.Proyecto):
+    """Dibuja el tablero del proyecto: una ejecución del script de Streamlit."""
+    # Modo kiosco (?pagina=Resumen&kiosk=1): pantallas fijas, solo el resumen y sin barra lateral
+    kiosco = st.query_params.get("kiosk") == "1"
+
+    st.set_page_config(
+        page_title="Dashboard VA",
+        page_icon="🌱",
+        layout="wide",
+        initial_sidebar_state="collapsed" if kiosco else "expanded",
+    )
+    st.markdown(ESTILO, unsafe_allow_html=True)
+    if kiosco:
+        st.markdown("<style>[data-testid='stSidebar'], [data-testid='stSidebarCollapsedControl'] { display: none; }</style>",
+                    unsafe_allow_html=True)
+
+    # MEDIR_FIGURAS=1: registra en el log el tamaño serializado de cada figura enviada
+    if leer_config("MEDIR_FIGURAS", "0") == "1":
+        figuras.registrar_medidor(figuras.log_tamano)
+
+    # Motor de filtros y agregaciones (MOTOR_DATOS) y procesos de agregación: ver consultas.py
+    if consultas.MOTOR_DATOS != consultas.MOTOR_PEDIDO:
+        st.warning(f"MOTOR_DATOS={consultas.MOTOR_PEDIDO} no está disponible (¿paquete sin instalar?). Se usa pandas.")
+
+    convocatoria = elegir_convocatoria(proyecto)
+    fuentes = (convocatoria or proyecto).fuentes
+
+    pagina = navegacion(kiosco)
+    if pagina == "Inicio":
+        portada(proyecto.portada or (convocatoria or proyecto).titulo)
+
+    # ============ CARGA DE DATOS ============
+    # La navegación y la portada ya están en pantalla; los filtros y la página
+    # esperan sus hojas con un marcador en su lugar. La barra de filtros usa
+    # todas las hojas: Inicio no espera otras.
+    with st.sidebar:
+        marcadores = [composicion.marcador("Cargando filtros…")]
+    if pagina != "Inicio":
+        marcadores.append(composicion.marcador(f"Cargando {pagina}…"))
+
+    if convocatoria is not None:
+        hojas = proyectos.cargar_convocatoria(proyecto, convocatoria.clave)
+    else:
+        hojas = composicion.cargar_datos({hoja: partial(proyectos.cargar_fuente, fuente)
+                                          for hoja, fuente in fuentes.items()})
+    # Copia superficial: cada rerun puede añadir columnas sin tocar la instancia compartida
+    hojas = {hoja: datos.copy(deep=False) for hoja, datos in hojas.items()}
+    df = hojas["carpetas"]
+
+    hoy = hoy_bogota()
+    version = version_hojas(convocatoria, hojas)
+    tablero = Tablero(proyecto, consultas.Base(fuentes["carpetas"], df),
+                      resolver_metas(proyecto, hojas, convocatoria, hoy))
+
+    # Datos de los que depende todo lo que se calcula antes de la página (ver composicion.memo)
+    deps_datos = [version, hoy]
+    filtros_cascada = filtros_sidebar(tablero, convocatoria, df, deps_datos)
+    vista = aplicar_filtros(tablero, df, filtros_cascada, deps_datos, version)
+
+    for lugar in marcadores:
+        lugar.empty()
+
+    # ============ ENRUTAMIENTO ============
+    if pagina == "Resumen":
+        pagina_resumen(tablero, vista, kiosco, convocatoria.clave if convocatoria else "")
+    elif pagina in proyecto.sujetos:
+        modulo_vista(tablero, vista, pagina)
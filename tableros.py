@@ -0,0 +1,18 @@
+"""Un solo proceso de Streamlit para todos los proyectos de proyectos.py.
+
+    streamlit run tableros.py
+
+Cada proyecto es una página (/va, /dian, /inpec) con su propio tablero, más el
+comparativo entre proyectos (/comparativo); las descargas, el almacén, el
+servicio de datos y las cachés de carga se comparten.
+Cada tablero se puede seguir ejecutando por separado como hasta ahora.
+"""
+import streamlit as st
+
+import proyectos
+
+paginas = [
+    st.Page(p.script, title=p.titulo, url_path=p.clave, default=(clave == "va"))
+    for clave, p in proyectos.PROYECTOS.items()
+] + [st.Page("comparativo.py", title="Comparativo", url_path="comparativo")]
+st.navigation(paginas, position="top").run()
@@ -0,0 +1,92 @@
+"""Conteos fuera del proceso: `contar`, la memoria compartida y el pool dan lo
+mismo que consultas.conteo_estados sobre las filas filtradas en local.
+"""
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+import agregaciones
+import almacen
+import consultas
+
+
+@pytest.fixture
+def carpetas() -> pd.DataFrame:
+    # Como quedan tras normalizar la hoja: estados sin espacios, con vacíos y nulos
+    return pd.DataFrame({
+        "analista": ["ana", "ana", "beto", "beto", "carla", "carla", "dora", "dora", "ana", "beto"],
+        "supervisor": ["s1", "s1", "s1", "s2", "s2", "s2", "s2", "s1", "s1", "s2"],
+        "EQUIPO": ["1", "1", "1", "2", "2", "2", "2", "3", "1", "2"],
+        "estado_carpeta": ["Auditada", "aprobada", "calificada", "", None, "devuelta",
+                           "ASIGNADA", "auditada", "aprobada", "auditada"],
+        "observacion": ["a", "b", "c", "d", "e", "f", "g", "h", "i", "j"],
+    })
+
+
+def esperado(df: pd.DataFrame, filtros: dict) -> dict:
+    return consultas.conteo_estados(consultas.filtrar_carpetas(df, filtros)).to_dict()
+
+
+def obtenido(conteos: pd.DataFrame) -> dict:
+    return dict(zip(conteos["estado_carpeta"], conteos["cantidad"]))
+
+
+FILTROS = [
+    {},
+    {"supervisor": "s2"},
+    {"estado_carpeta": "AUDITADA"},
+    {"supervisor": "s1", "analista": "ana", "EQUIPO": "Todos"},
+    {"analista": "nadie"},
+]
+
+
+@pytest.mark.parametrize("filtros", FILTROS)
+def test_contar_filas(carpetas, filtros):
+    tabla = pa.Table.from_pandas(carpetas, preserve_index=False)
+    res = agregaciones.contar(tabla, filtros, ["estado_carpeta"]).to_pandas()
+    assert obtenido(res) == esperado(carpetas, filtros)
+
+
+@pytest.mark.parametrize("filtros", FILTROS)
+def test_contar_conteos_precalculados(carpetas, filtros):
+    tabla = pa.Table.from_pandas(almacen.conteos_carpetas(carpetas), preserve_index=False)
+    res = agregaciones.contar(tabla, filtros, ["estado_carpeta"]).to_pandas()
+    assert obtenido(res) == esperado(carpetas, filtros)
+
+
+def test_contar_columna_ausente_no_se_ignora(carpetas):
+    tabla = pa.Table.from_pandas(almacen.conteos_carpetas(carpetas), preserve_index=False)
+    with pytest.raises(agregaciones.ColumnasAusentes):
+        agregaciones.contar(tabla, {"observacion": "a"}, ["estado_carpeta"])
+    with pytest.raises(agregaciones.ColumnasAusentes):
+        agregaciones.contar(tabla, {}, ["observacion"])
+    # "Todos" no filtra, así que no hace falta la columna
+    agregaciones.contar(tabla, {"observacion": "Todos"}, ["estado_carpeta"])
+
+
+def test_publicar_y_pool(carpetas):
+    ref = agregaciones.publicar("prueba_pool", "v1", carpetas)
+    assert agregaciones.publicar("prueba_pool", "v1", carpetas) == ref  # Una vez por versión
+    for filtros in FILTROS:
+        res = agregaciones.conteo(ref, filtros, ["estado_carpeta"], procesos=1)
+        assert obtenido(res) == esperado(carpetas, filtros)
+    with pytest.raises(agregaciones.ColumnasAusentes):
+        agregaciones.conteo(ref, {"inexistente": "x"}, ["estado_carpeta"], procesos=1)
+
+
+def test_conteo_externo_sin_columna_calcula_en_local(carpetas, tmp_path, monkeypatch):
+    # Conteos precalculados del almacén: no traen `observacion`
+    version = "v1"
+    ruta = almacen.ruta(str(tmp_path), "carpetas.conteos", version)
+    tabla = pa.Table.from_pandas(almacen.conteos_carpetas(carpetas), preserve_index=False)
+    with pa.ipc.new_file(ruta, tabla.schema) as writer:
+        writer.write_table(tabla)
+    monkeypatch.setattr(consultas, "PROCESOS_AGREGACION", 1)
+    monkeypatch.setattr(consultas, "dataset_compartido",
+                        lambda fuente, v, _df: agregaciones.referencia_archivo(ruta, v))
+    carpetas.attrs["version"] = version
+    base = consultas.Base("carpetas", carpetas)
+
+    assert consultas.conteo_externo(base, {"observacion": "a"}, ["estado_carpeta"]) is None
+    res = consultas.conteo_externo(base, {"supervisor": "s2", "sin_columna": "x"}, ["estado_carpeta"])
+    assert obtenido(res) == esperado(carpetas, {"supervisor": "s2"})
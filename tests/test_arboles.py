@@ -0,0 +1,120 @@
+"""Árbol de conteos: podar, sumar un nivel, las facetas de los filtros en cascada y la matriz
+OPEC × nivel × estado dan lo mismo que filtrar y agrupar las filas del módulo.
+"""
+import pandas as pd
+import pytest
+
+import arboles
+
+NIVELES = ["nro_opec", "nivel", "estado_carpeta"]
+
+
+@pytest.fixture
+def carpetas() -> pd.DataFrame:
+    return pd.DataFrame({
+        "nro_opec": ["1", "1", "1", "2", "2", "3", "3", "3", "1", "2"],
+        "nivel": ["asesor", "asesor", "técnico", "técnico", "técnico", "asesor", None, "asesor", "técnico", "asesor"],
+        "estado_carpeta": ["auditada", "asignada", "auditada", "", "auditada", "devuelta", "auditada", "auditada",
+                           "auditada", None],
+    })
+
+
+@pytest.fixture
+def arbol(carpetas) -> pd.Series:
+    return arboles.construir_arbol(carpetas, NIVELES)
+
+
+def filtrar(df: pd.DataFrame, filtros: dict) -> pd.DataFrame:
+    for col, val in filtros.items():
+        if val != "Todos":
+            df = df[df[col] == val]
+    return df
+
+
+def test_construir_arbol_conserva_todas_las_filas(carpetas, arbol):
+    assert arbol.sum() == len(carpetas)
+    assert list(arbol.index.names) == NIVELES
+
+
+@pytest.mark.parametrize("filtros", [
+    {},
+    {"nro_opec": "1"},
+    {"nro_opec": "Todos", "nivel": "asesor"},
+    {"nivel": "técnico", "estado_carpeta": "auditada"},
+    {"nro_opec": "9"},
+])
+def test_podar_y_nivel_como_sobre_las_filas(carpetas, arbol, filtros):
+    podado = arboles.podar_arbol(arbol, filtros)
+    assert podado.sum() == len(filtrar(carpetas, filtros))
+    esperado = filtrar(carpetas, filtros)["nro_opec"].value_counts()
+    conteo = arboles.nivel_arbol(podado, "nro_opec")
+    assert list(conteo.columns) == ["nro_opec", "cantidad"]
+    assert dict(zip(conteo["nro_opec"], conteo["cantidad"])) == esperado.to_dict()
+    assert conteo["cantidad"].is_monotonic_decreasing
+
+
+def test_podar_ignora_columnas_ajenas_y_sigue_el_camino(arbol):
+    assert arboles.podar_arbol(arbol, {"otra": "x"}).equals(arbol)
+    podado = arboles.podar_arbol(arbol, {"estado_carpeta": "auditada"}, ["nro_opec", "nivel"], ["1"])
+    assert podado.sum() == 3
+    podado = arboles.podar_arbol(arbol, {}, ["nro_opec", "nivel"], ["1", "asesor"])
+    assert podado.sum() == 2
+
+
+def test_facetas_cuentan_con_los_demas_filtros(carpetas, arbol):
+    filtros = {"nro_opec": "1", "nivel": "asesor", "estado_carpeta": "Todos"}
+    conteos = arboles.facetas(arbol, filtros)
+    for col in filtros:
+        demas = {otra: val for otra, val in filtros.items() if otra != col}
+        esperado = filtrar(carpetas, demas)[col].value_counts()
+        assert conteos[col].to_dict() == esperado.to_dict()
+    # Sin opciones vacías
+    assert (conteos["nro_opec"] > 0).all()
+    assert set(conteos["nivel"].index) == {"asesor", "técnico"}  # Los nulos no son una opción
+
+
+# ============ MATRIZ ============
+
+COLUMNAS = ("nro_opec", "nivel", "estado_carpeta")
+
+
+@pytest.fixture
+def matriz(arbol) -> pd.DataFrame:
+    return arboles.construir_matriz(arbol, "estado_carpeta")
+
+
+def test_construir_matriz_estados_de_mas_a_menos(carpetas, matriz):
+    assert int(matriz.to_numpy().sum()) == len(carpetas)
+    assert matriz.columns[0] == "auditada"
+    assert matriz.sum().is_monotonic_decreasing
+    # El estado nulo cuenta como por asignar
+    assert matriz.columns.tolist() == ["auditada", "", "asignada", "devuelta"]
+    assert int(matriz[""].sum()) == 2
+
+
+@pytest.mark.parametrize("filtros", [
+    {},
+    {"nro_opec": "1"},
+    {"nivel": "asesor"},
+    {"estado_carpeta": "auditada"},
+    {"nro_opec": "3", "estado_carpeta": "devuelta"},
+])
+def test_cortar_matriz_como_sobre_las_filas(carpetas, matriz, filtros):
+    cortada = arboles.cortar_matriz(matriz, filtros, COLUMNAS)
+    filas = filtrar(carpetas, filtros)
+    esperado = filas.groupby(["nro_opec", "nivel"], dropna=False).size()
+    obtenido = cortada.set_index(["nro_opec", "nivel"])["total"]
+    assert obtenido.sort_index().to_dict() == esperado.sort_index().to_dict()
+    auditadas = filas[filas["estado_carpeta"] == "auditada"].groupby(["nro_opec", "nivel"], dropna=False).size()
+    pendientes = esperado.sub(auditadas, fill_value=0)
+    assert cortada.set_index(["nro_opec", "nivel"])["pendientes"].sort_index().to_dict() == pendientes.sort_index().to_dict()
+    assert cortada["pendientes"].is_monotonic_decreasing
+
+
+def test_cortar_matriz_solo_estados_con_carpetas(matriz):
+    cortada = arboles.cortar_matriz(matriz, {"estado_carpeta": "devuelta"}, COLUMNAS)
+    assert list(cortada.columns) == ["nro_opec", "nivel", "devuelta", "total", "pendientes"]
+    assert cortada.to_dict("records") == [
+        {"nro_opec": "3", "nivel": "asesor", "devuelta": 1, "total": 1, "pendientes": 1},
+    ]
+    assert arboles.cortar_matriz(matriz, {"nro_opec": "9"}, COLUMNAS).empty
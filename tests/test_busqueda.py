@@ -0,0 +1,51 @@
+"""Índice de búsqueda por prefijo: sin tildes ni mayúsculas, por cualquier palabra y con límite."""
+import pytest
+
+import busqueda
+
+
+@pytest.fixture
+def indice() -> busqueda.Indice:
+    return busqueda.Indice([
+        "Técnico Operativo", "TECNICO administrativo", "Profesional Universitario",
+        "Auxiliar Técnico", "Profesional Especializado", "Técnico Operativo", 101, 1020,
+    ])
+
+
+def test_normalizar():
+    assert busqueda.normalizar(" Técnico ") == "tecnico"
+    assert busqueda.normalizar("ÑANDÚ") == "nandu"
+    assert busqueda.normalizar(1020) == "1020"
+
+
+def test_valores_unicos_en_orden_normalizado(indice):
+    assert len(indice) == 7
+    assert indice.valores[:3] == [101, 1020, "Auxiliar Técnico"]
+
+
+def test_sin_tildes_ni_mayusculas(indice):
+    esperado = ["Auxiliar Técnico", "TECNICO administrativo", "Técnico Operativo"]
+    assert indice.buscar("tecnico") == esperado
+    assert indice.buscar("TÉCN") == esperado
+
+
+def test_prefijo_de_cualquier_palabra(indice):
+    assert indice.buscar("opera") == ["Técnico Operativo"]
+    assert indice.buscar("prof") == ["Profesional Especializado", "Profesional Universitario"]
+    assert indice.buscar("nico") == []  # Solo prefijos, no subcadenas
+    assert indice.buscar("102") == [1020]
+
+
+def test_limite(indice):
+    # Las primeras en orden de la palabra que coincide ("técnico" va antes que "técnico administrativo")
+    assert indice.buscar("tec", limite=1) == ["Auxiliar Técnico"]
+    assert len(indice.buscar("", limite=2)) == 2
+    assert indice.buscar("", limite=2) == [101, 1020]
+    # Un valor que coincide por varias palabras cuenta una vez
+    assert indice.buscar("t", limite=2) == ["Auxiliar Técnico", "TECNICO administrativo"]
+
+
+def test_admitidos(indice):
+    admitidos = {"Auxiliar Técnico", "Profesional Universitario"}
+    assert indice.buscar("tec", admitidos=admitidos) == ["Auxiliar Técnico"]
+    assert indice.buscar("", admitidos=admitidos) == ["Auxiliar Técnico", "Profesional Universitario"]
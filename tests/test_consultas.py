@@ -0,0 +1,129 @@
+"""Paridad de motores: pandas, DuckDB y Polars devuelven las mismas tablas.
+
+Cada consulta se corre con pandas (la referencia) y con cada motor opcional
+instalado sobre tablas pequeñas con estados en mayúsculas, con espacios,
+vacíos y nulos, sujetos nulos y tablas vacías.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+import consultas
+import proyectos
+
+MOTORES_OPCIONALES = [m for m in consultas.MOTORES if m != "pandas"]
+
+
+@pytest.fixture(params=MOTORES_OPCIONALES)
+def motor(request):
+    pytest.importorskip(request.param)
+    yield request.param
+    consultas.usar_motor("pandas")
+
+
+def con_motor(motor: str, consulta, *args):
+    consultas.usar_motor(motor)
+    try:
+        return consulta(*args)
+    finally:
+        consultas.usar_motor("pandas")
+
+
+def paridad(motor: str, consulta, *args):
+    """(resultado con pandas, resultado con `motor`) de la misma consulta."""
+    return con_motor("pandas", consulta, *args), con_motor(motor, consulta, *args)
+
+
+@pytest.fixture
+def carpetas() -> pd.DataFrame:
+    return pd.DataFrame({
+        "analista": ["ana", "ana", "beto", "beto", "carla", "carla", None, "dora", "ana", "beto"],
+        "supervisor": ["s1", "s1", "s1", "s2", "s2", "s2", "s2", None, "s1", "s2"],
+        "auditor": ["x", "x", "y", "y", "y", "x", "x", "y", "x", None],
+        "EQUIPO": ["1", "1", "1", "2", "2", "2", "2", "3", "1", "2"],
+        "EQUIPO_NUM": [1, 1, 1, 2, 2, 2, 2, 3, 1, 2],
+        "estado_carpeta": ["Auditada", " aprobada ", "calificada", "", None, "devuelta",
+                           "ASIGNADA", "auditada", "aprobada", "otro"],
+    })
+
+
+@pytest.fixture
+def vacias(carpetas) -> pd.DataFrame:
+    return carpetas.iloc[0:0]
+
+
+@pytest.fixture
+def sin_estado(carpetas) -> pd.DataFrame:
+    return carpetas.assign(estado_carpeta=[None, "", "  ", None, "", None, "", None, "", None])
+
+
+def test_usar_motor_sin_paquete_queda_pandas():
+    assert consultas.usar_motor("inexistente") == "pandas"
+
+
+@pytest.mark.parametrize("filtros", [
+    {},
+    {"supervisor": "s2"},
+    {"estado_carpeta": "AUDITADA"},
+    {"supervisor": "s1", "estado_carpeta": "aprobada", "analista": "Todos"},
+])
+def test_filtrar_carpetas(motor, carpetas, filtros):
+    esperado, obtenido = paridad(motor, consultas.filtrar_carpetas, carpetas, filtros)
+    pd.testing.assert_frame_equal(obtenido.reset_index(drop=True), esperado.reset_index(drop=True))
+
+
+@pytest.mark.parametrize("tabla", ["carpetas", "vacias", "sin_estado"])
+def test_conteo_estados(motor, tabla, request):
+    df = request.getfixturevalue(tabla)
+    esperado, obtenido = paridad(motor, consultas.conteo_estados, df)
+    pd.testing.assert_series_equal(obtenido, esperado, check_index_type=False)
+
+
+def test_conteo_estados_sin_columna(motor, carpetas):
+    esperado, obtenido = paridad(motor, consultas.conteo_estados, carpetas.drop(columns="estado_carpeta"))
+    pd.testing.assert_series_equal(obtenido, esperado)
+
+
+@pytest.mark.parametrize("tabla", ["carpetas", "vacias", "sin_estado"])
+@pytest.mark.parametrize("col", ["analista", "supervisor"])
+def test_pivot_estados(motor, tabla, col, request):
+    df = request.getfixturevalue(tabla)
+    esperado, obtenido = paridad(motor, consultas.pivot_estados, df, col)
+    assert list(esperado.columns) == [col] + consultas.ESTADOS_ORDEN
+    pd.testing.assert_frame_equal(obtenido, esperado, check_index_type=False, check_column_type=False)
+
+
+@pytest.mark.parametrize("clave", ["va", "dian"])
+@pytest.mark.parametrize("tabla", ["carpetas", "vacias", "sin_estado"])
+def test_conteo_estado_analistas(motor, clave, tabla, request):
+    df = request.getfixturevalue(tabla)
+    proyecto = proyectos.PROYECTOS[clave]
+    esperado, obtenido = paridad(motor, consultas.conteo_estado_analistas, proyecto, df)
+    pd.testing.assert_frame_equal(obtenido, esperado, check_index_type=False, check_column_type=False)
+
+
+@pytest.mark.parametrize("modulo", ["Analistas", "Supervisores", "Equipos"])
+@pytest.mark.parametrize("tabla", ["carpetas", "vacias", "sin_estado"])
+def test_desarrolladas_por_sujeto(motor, modulo, tabla, request):
+    df = request.getfixturevalue(tabla)
+    esperado, obtenido = paridad(motor, consultas.desarrolladas_por_sujeto, proyectos.PROYECTOS["va"], df, modulo)
+    pd.testing.assert_frame_equal(obtenido, esperado, check_index_type=False)
+
+
+@pytest.mark.parametrize("columna", ["estado_carpeta", "supervisor", "EQUIPO_NUM"])
+def test_contar_valores(motor, carpetas, columna):
+    esperado, obtenido = paridad(motor, consultas.contar_valores, carpetas, columna)
+    pd.testing.assert_frame_equal(obtenido, esperado)
+
+
+def test_contar_valores_vacia(motor, vacias):
+    esperado, obtenido = paridad(motor, consultas.contar_valores, vacias, "supervisor")
+    assert obtenido.empty and esperado.empty
+    assert list(obtenido.columns) == list(esperado.columns) == ["supervisor", "cantidad"]
+
+
+def test_contar_valores_empates_en_orden_de_aparicion(motor):
+    df = pd.DataFrame({"nivel": ["c", "b", "a", "b", "c", "a", np.nan]})
+    esperado, obtenido = paridad(motor, consultas.contar_valores, df, "nivel")
+    assert esperado["nivel"].tolist() == ["c", "b", "a"]
+    pd.testing.assert_frame_equal(obtenido, esperado)
@@ -0,0 +1,92 @@
+"""Caché de figuras: topes de entradas y de bytes con descarte LRU, firmas de vista
+y ejes plegados en top-N más "Otros".
+"""
+from datetime import date
+
+import pandas as pd
+
+import figuras
+
+
+def test_tope_de_entradas_descarta_la_menos_usada():
+    cache = figuras.CacheFiguras(maximo=2, max_bytes=1000)
+    cache.guardar(("a", "v"), "{}")
+    cache.guardar(("b", "v"), "{}")
+    assert cache.obtener(("a", "v")) == "{}"  # `a` pasa a ser la más reciente
+    cache.guardar(("c", "v"), "{}")
+    assert cache.obtener(("b", "v")) is None
+    assert cache.obtener(("a", "v")) == "{}"
+    assert cache.obtener(("c", "v")) == "{}"
+
+
+def test_tope_de_bytes():
+    cache = figuras.CacheFiguras(maximo=10, max_bytes=10)
+    cache.guardar(("a", "v"), "x" * 4)
+    cache.guardar(("b", "v"), "x" * 4)
+    cache.guardar(("c", "v"), "x" * 4)
+    assert cache.obtener(("a", "v")) is None
+    assert cache.obtener(("b", "v")) is not None
+    assert cache._bytes == 8
+    # Una figura mayor que todo el tope no se queda ni desplaza para siempre a las demás
+    cache.guardar(("d", "v"), "x" * 11)
+    assert cache.obtener(("d", "v")) is None
+    assert cache._bytes == 0
+
+
+def test_reemplazo_descuenta_los_bytes_anteriores():
+    cache = figuras.CacheFiguras(maximo=10, max_bytes=10)
+    cache.guardar(("a", "v"), "x" * 6)
+    cache.guardar(("a", "v"), "x" * 3)
+    cache.guardar(("b", "v"), "x" * 7)
+    assert cache.obtener(("a", "v")) == "xxx"
+    assert cache._bytes == 10
+
+
+def test_limpiar():
+    cache = figuras.CacheFiguras()
+    cache.guardar(("a", "v"), "{}")
+    cache.limpiar()
+    assert cache.obtener(("a", "v")) is None
+    assert cache._bytes == 0
+
+
+def test_vista_ignora_filtros_sin_efecto():
+    corte = date(2025, 9, 10)
+    base = figuras.vista("v1", {}, corte)
+    assert figuras.vista("v1", {"analista": "Todos", "EQUIPO": None}, corte) == base
+    assert figuras.vista("v1", {"estado_carpeta": ""}, corte) != base  # "" es el estado por asignar
+    assert figuras.vista("v2", {}, corte) != base
+    assert figuras.vista("v1", {}, date(2025, 9, 11)) != base
+    assert figuras.vista("", {}, corte) is None
+
+
+def conteo_de(valores: dict) -> pd.DataFrame:
+    return pd.DataFrame({"analista": list(valores), "cantidad": list(valores.values())})
+
+
+def test_plegar_agrupa_la_cola_en_otros():
+    conteo = conteo_de({"a": 1, "b": 5, "c": 3, "d": 5, "e": 2})
+    plegado, k = figuras.plegar(conteo, "analista", n=2)
+    assert k == 3
+    # Empates en el orden original; "Otros" suma las restantes
+    assert plegado["analista"].tolist() == ["b", "d", "Otros (3)"]
+    assert plegado["cantidad"].tolist() == [5, 5, 6]
+    assert plegado["cantidad"].sum() == conteo["cantidad"].sum()
+    assert figuras.resto(conteo, n=2)["analista"].tolist() == ["c", "e", "a"]
+
+
+def test_plegar_no_agrupa_una_sola_categoria():
+    # Con n + 1 categorías "Otros (1)" no ahorra nada: se dibujan todas
+    conteo = conteo_de({"a": 1, "b": 5, "c": 3})
+    plegado, k = figuras.plegar(conteo, "analista", n=2)
+    assert k == 0
+    assert plegado["analista"].tolist() == ["b", "c", "a"]
+    plegado, k = figuras.plegar(conteo.iloc[0:0], "analista", n=2)
+    assert k == 0 and plegado.empty
+
+
+def test_plegar_otra_columna_de_valores():
+    conteo = pd.DataFrame({"OPEC": ["1", "2", "3", "4"], "Total": [4, 3, 2, 1]})
+    plegado, k = figuras.plegar(conteo, "OPEC", n=1, valores="Total")
+    assert k == 3
+    assert plegado.to_dict("list") == {"OPEC": ["1", "Otros (3)"], "Total": [4, 6]}
@@ -0,0 +1,87 @@
+"""Particiones de convocatorias: carga perezosa, LRU, recarga por TTL y
+descarte por inactividad, con el reloj controlado por el test.
+"""
+import pandas as pd
+import pytest
+
+import proyectos
+
+
+class Reloj:
+    def __init__(self):
+        self.ahora = 1000.0
+
+    def __call__(self) -> float:
+        return self.ahora
+
+
+@pytest.fixture
+def reloj(monkeypatch) -> Reloj:
+    reloj = Reloj()
+    monkeypatch.setattr(proyectos.time, "time", reloj)
+    return reloj
+
+
+class Cargador:
+    """Cuenta las cargas de cada partición."""
+
+    def __init__(self):
+        self.cargas: list[str] = []
+
+    def __call__(self, clave: str):
+        def cargar():
+            self.cargas.append(clave)
+            return {"carpetas": pd.DataFrame({"convocatoria": [clave]})}
+        return cargar
+
+
+def test_carga_una_vez_y_solo_la_pedida(reloj):
+    particiones, cargar = proyectos.Particiones(maximo=3, ttl=600, inactividad=1800), Cargador()
+    hojas = particiones.obtener("dian/2667", cargar("dian/2667"))
+    assert particiones.obtener("dian/2667", cargar("dian/2667")) is hojas
+    assert cargar.cargas == ["dian/2667"]
+    assert particiones.claves() == ["dian/2667"]
+
+
+def test_lru_descarta_la_usada_hace_mas_tiempo(reloj):
+    particiones, cargar = proyectos.Particiones(maximo=2, ttl=600, inactividad=1800), Cargador()
+    for clave in ["a", "b", "a", "c"]:
+        reloj.ahora += 1
+        particiones.obtener(clave, cargar(clave))
+    assert particiones.claves() == ["a", "c"]
+    particiones.obtener("b", cargar("b"))
+    assert cargar.cargas == ["a", "b", "c", "b"]
+
+
+def test_ttl_recarga_sin_perder_la_posicion(reloj):
+    particiones, cargar = proyectos.Particiones(maximo=3, ttl=600, inactividad=1800), Cargador()
+    particiones.obtener("a", cargar("a"))
+    reloj.ahora += 600
+    particiones.obtener("a", cargar("a"))
+    assert cargar.cargas == ["a"]
+    # El uso no renueva el TTL: cuenta desde la carga
+    reloj.ahora += 1
+    particiones.obtener("a", cargar("a"))
+    assert cargar.cargas == ["a", "a"]
+
+
+def test_inactividad_descarta_en_el_siguiente_acceso(reloj):
+    particiones, cargar = proyectos.Particiones(maximo=3, ttl=10_000, inactividad=1800), Cargador()
+    particiones.obtener("a", cargar("a"))
+    reloj.ahora += 1000
+    particiones.obtener("b", cargar("b"))
+    reloj.ahora += 1000
+    particiones.obtener("b", cargar("b"))
+    assert particiones.claves() == ["b"]
+    particiones.obtener("a", cargar("a"))
+    assert cargar.cargas == ["a", "b", "a"]
+
+
+def test_descartar(reloj):
+    particiones, cargar = proyectos.Particiones(), Cargador()
+    particiones.obtener("a", cargar("a"))
+    particiones.descartar("a")
+    particiones.descartar("inexistente")
+    assert particiones.claves() == []
+    particiones.obtener("a", cargar("a"))
+    assert cargar.cargas == ["a", "a"]
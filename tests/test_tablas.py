@@ -0,0 +1,58 @@
+"""Búsqueda y orden de las tablas paginadas: posiciones de las filas a mostrar."""
+import numpy as np
+import pandas as pd
+import pytest
+
+import tablas
+
+
+@pytest.fixture
+def carpetas() -> pd.DataFrame:
+    # Índice no consecutivo, como queda tras filtrar
+    return pd.DataFrame({
+        "analista": ["Ana", "beto", "Carla", "ana maría", None],
+        "cantidad": [3, 1, None, 3, 2],
+        "estado_carpeta": ["auditada", "ASIGNADA", "devuelta", "", "auditada"],
+    }, index=[10, 4, 7, 2, 9])
+
+
+def filas(df: pd.DataFrame, buscar: str = "", columna: str = tablas.SIN_ORDEN, descendente: bool = False) -> list:
+    posiciones = tablas._posiciones(df, lambda: tablas._texto(df), buscar, columna, descendente)
+    assert isinstance(posiciones, np.ndarray)
+    return df.index[posiciones].tolist()
+
+
+def test_sin_busqueda_ni_orden_conserva_el_orden(carpetas):
+    assert filas(carpetas) == [10, 4, 7, 2, 9]
+
+
+def test_busqueda_en_cualquier_columna_sin_mayusculas(carpetas):
+    assert filas(carpetas, "ANA") == [10, 2]
+    assert filas(carpetas, "asignada") == [4]
+    assert filas(carpetas, "nadie") == []
+
+
+def test_busqueda_literal(carpetas):
+    # No es una expresión regular
+    assert filas(carpetas, "a.a") == []
+
+
+def test_el_texto_solo_se_arma_si_hay_busqueda(carpetas):
+    def texto():
+        raise AssertionError("no se debía construir el texto de búsqueda")
+    assert tablas._posiciones(carpetas, texto, "", "cantidad", False).tolist() == [1, 4, 0, 3, 2]
+
+
+def test_orden_estable_con_nulos_al_final(carpetas):
+    assert filas(carpetas, columna="cantidad") == [4, 9, 10, 2, 7]
+    assert filas(carpetas, columna="cantidad", descendente=True) == [10, 2, 9, 4, 7]
+
+
+def test_busqueda_encuentra_filas_con_nulos(carpetas):
+    assert filas(carpetas, "auditada") == [10, 9]
+
+
+def test_orden_sobre_el_resultado_de_la_busqueda(carpetas):
+    assert filas(carpetas, "auditada", "analista") == [10, 9]
+    # Orden de texto tal cual: las mayúsculas van antes
+    assert filas(carpetas, "a", "analista", descendente=True) == [4, 2, 7, 10, 9]
@@ -0,0 +1,82 @@
+"""Metas del tablero VA según Proyecto.meta (hoja de metas o días hábiles) y la tabla
+por sujeto con los estados que cuentan para cada módulo.
+"""
+from datetime import date
+
+import pandas as pd
+import pytest
+
+import proyectos
+import tablero_va
+
+VA = proyectos.PROYECTOS["va"]
+DIAN = proyectos.PROYECTOS["dian"]
+CONVOCATORIA = DIAN.convocatorias["2667"]  # Inicia el martes 16/09/2025
+
+
+@pytest.fixture
+def carpetas() -> pd.DataFrame:
+    return pd.DataFrame({
+        "analista": ["Ana", "Ana", "Beto", "Beto", "Beto"],
+        "supervisor": ["Sup 1", "Sup 1", "Sup 1", "Sup 2", "Sup 2"],
+        "auditor": ["Aud", "Aud", "Aud", "Aud", "Aud"],
+        "estado_carpeta": ["auditada", "calificada", "aprobada", "asignada", ""],
+    })
+
+
+@pytest.fixture
+def hoja_metas() -> pd.DataFrame:
+    filas = []
+    for fecha, meta in [("2025-09-19", 10), ("2025-09-22", 20), ("2025-09-30", 90)]:
+        filas += [
+            {"FECHA": fecha, "USUARIO": "Análisis", "META DIARIA A LA FECHA": meta, "META EQUIPO A LA FECHA": meta * 10},
+            {"FECHA": fecha, "USUARIO": "Supervisión", "META DIARIA A LA FECHA": meta * 2, "META EQUIPO A LA FECHA": meta * 5},
+        ]
+    return pd.DataFrame(filas)
+
+
+def test_dias_habiles_hasta_ayer(carpetas):
+    metas = tablero_va.resolver_metas(DIAN, {"carpetas": carpetas}, CONVOCATORIA, date(2025, 9, 23))
+    assert metas.corte == date(2025, 9, 22)
+    assert metas.dias == 5
+    assert metas.por_sujeto == {"Analistas": 85, "Supervisores": 170, "Equipos": 85}
+    # La tabla de Equipos usa la meta diaria del módulo
+    assert metas.tabla["Equipos"] == 170
+    assert tablero_va.meta_modulo(DIAN, metas, "Analistas", carpetas) == (170, 2)
+    assert tablero_va.meta_resumen(DIAN, metas, carpetas) == 340
+    assert tablero_va.texto_corte(metas, 2) == ("Equipo: **2** - Días hábiles considerados: **5** - "
+                                                "Fecha de corte: **2025-09-22**")
+
+
+def test_hoja_de_metas_en_su_fecha_de_corte(carpetas, hoja_metas):
+    # Sin fila de hoy se usa la última fecha anterior
+    metas = tablero_va.resolver_metas(VA, {"carpetas": carpetas, "metas": hoja_metas}, None, date(2025, 9, 25))
+    assert metas.corte == date(2025, 9, 22)
+    assert metas.dias is None
+    assert metas.por_sujeto == {"Analistas": 20, "Supervisores": 40, "Equipos": None}
+    assert metas.tabla == metas.por_sujeto
+    assert tablero_va.meta_modulo(VA, metas, "Supervisores", carpetas) == (100, None)
+    assert tablero_va.meta_resumen(VA, metas, carpetas) == 300
+    assert tablero_va.texto_corte(metas) == "Fecha de corte: **2025-09-22**"
+
+
+def test_tabla_cuenta_los_estados_validos_del_modulo(carpetas, hoja_metas):
+    metas = tablero_va.resolver_metas(VA, {"carpetas": carpetas, "metas": hoja_metas}, None, date(2025, 9, 25))
+    tablero = tablero_va.Tablero(VA, None, metas)
+
+    tabla = tablero_va.tabla_resumen(tablero, carpetas, "Supervisores", 3)
+    assert tabla.avisos == []
+    filas = tabla.valor.set_index("Supervisor")
+    # Supervisores: auditada y aprobada
+    assert filas["Analizadas"].to_dict() == {"Sup 1": 2, "Sup 2": 0}
+    assert filas["Faltantes"].to_dict() == {"Sup 1": 1, "Sup 2": 3}
+
+    tabla = tablero_va.tabla_resumen(tablero, carpetas, "Analistas", 3)
+    assert tabla.valor.set_index("Analista")["Analizadas"].to_dict() == {"Ana": 2, "Beto": 1}
+
+
+def test_tabla_sin_meta_avisa(carpetas, hoja_metas):
+    metas = tablero_va.resolver_metas(VA, {"carpetas": carpetas, "metas": hoja_metas}, None, date(2025, 9, 25))
+    tabla = tablero_va.tabla_resumen(tablero_va.Tablero(VA, None, metas), carpetas, "Equipos", metas.tabla["Equipos"])
+    assert tabla.avisos == ["No hay metas disponibles para 'auditoria' en la fecha 2025-09-22."]
+    assert (tabla.valor["Meta"] == 0).all()